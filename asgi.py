@@ -0,0 +1,3 @@
+from songs_api.aio.main import create_async_app
+
+app = create_async_app()
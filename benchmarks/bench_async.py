@@ -0,0 +1,120 @@
+"""Load the sync and async apps with many concurrent keep-alive connections.
+
+Each connection sends one request at a time for `--duration` seconds; the
+script reports requests/sec and latency percentiles per URL. Start the apps,
+e.g. against the same MongoDB:
+
+    gunicorn --workers 4 --bind 127.0.0.1:5000 wsgi:app
+    uvicorn --workers 4 --port 5001 asgi:app
+
+then:
+
+    python benchmarks/bench_async.py --concurrency 1000 \\
+        http://127.0.0.1:5000/songs?size=20 http://127.0.0.1:5001/songs?size=20
+
+Raise the open-files limit (`ulimit -n 4096`) before going past ~1000
+connections.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Tuple
+from urllib.parse import urlsplit
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """Read one HTTP/1.1 response and return its status code."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    return status
+
+
+async def connection(
+    host: str,
+    port: int,
+    request: bytes,
+    deadline: float,
+    latencies: List[float],
+) -> int:
+    """Send requests over one connection until the deadline; return errors."""
+    errors = 0
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+    except (ConnectionError, asyncio.IncompleteReadError):
+        errors += 1
+    finally:
+        writer.close()
+    return errors
+
+
+async def load(url: str, concurrency: int, duration: float) -> Tuple[List[float], int]:
+    """Run `concurrency` connections against `url` for `duration` seconds."""
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+    request = (
+        f"GET {target or '/'} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+        "Connection: keep-alive\r\n\r\n"
+    ).encode()
+
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+    errors = await asyncio.gather(
+        *(
+            connection(host, port, request, deadline, latencies)
+            for _ in range(concurrency)
+        ),
+        return_exceptions=True,
+    )
+    failed = sum(e if isinstance(e, int) else 1 for e in errors)
+    return latencies, failed
+
+
+def main() -> None:
+    """Benchmark each URL in turn and print a summary line per URL."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=15.0)
+    args = parser.parse_args()
+
+    for url in args.urls:
+        latencies, errors = asyncio.run(load(url, args.concurrency, args.duration))
+        if not latencies:
+            print(f"{url}: no responses ({errors} errors)")
+            continue
+        latencies.sort()
+        cuts = statistics.quantiles(latencies, n=100)
+        print(
+            f"{url}: {len(latencies) / args.duration:,.0f} req/s  "
+            f"p50 {cuts[49] * 1e3:.1f} ms  p99 {cuts[98] * 1e3:.1f} ms  "
+            f"errors {errors}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Compare JSON encoders on GET /songs and /songs/search payloads.
+
+Times, for pages of 100 and 10k songs:
+
+- legacy: model_dump_json with the former per-row `strftime` serializer
+- model_dump_json: what flask_pydantic renders views with today
+- flask: Flask's default provider on model_dump() dicts
+- pydantic: PydanticJSONProvider, i.e. pydantic-core straight to bytes
+- orjson: OrjsonJSONProvider, when orjson is installed
+
+    python benchmarks/bench_json.py --rows 100 10000
+"""
+
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+from functools import partial
+from typing import Any, Callable, Dict, List
+
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from pydantic import BaseModel, field_serializer
+
+from songs_api.schemas.api.song import (
+    PagedSongsResponse,
+    SongListResponse,
+    SongResponse,
+)
+from songs_api.utils.json_provider import (
+    OrjsonJSONProvider,
+    PydanticJSONProvider,
+    orjson,
+)
+
+
+class LegacySongResponse(SongResponse):
+    @field_serializer("released")
+    def serialize_released(self, dt: date) -> str:
+        """Convert date to string format YYYY-MM-DD."""
+        return dt.strftime("%Y-%m-%d")
+
+
+class LegacyPagedSongsResponse(PagedSongsResponse):
+    items: List[LegacySongResponse]  # type: ignore[assignment]
+
+
+class LegacySongListResponse(SongListResponse):
+    songs: List[LegacySongResponse]  # type: ignore[assignment]
+
+
+def make_songs(rows: int) -> List[Dict[str, Any]]:
+    """Return `rows` synthetic songs as response fields."""
+    released = date(2000, 1, 1)
+    return [
+        {
+            "id": str(ObjectId()),
+            "artist": f"Artist {i % 500}",
+            "title": f"Song {i}",
+            "difficulty": float(i % 20) + 0.5,
+            "level": i % 15 + 1,
+            "released": released + timedelta(days=i % 5000),
+        }
+        for i in range(rows)
+    ]
+
+
+def payloads(rows: int) -> Dict[str, Dict[str, BaseModel]]:
+    """Build the list and search payloads, in current and legacy models."""
+    songs = make_songs(rows)
+    page: Dict[str, Any] = {
+        "total": rows * 10,
+        "page": 1,
+        "size": rows,
+        "next_cursor": "x",
+    }
+    return {
+        "list": {
+            "current": PagedSongsResponse(
+                items=[SongResponse(**song) for song in songs],
+                **page,
+            ),
+            "legacy": LegacyPagedSongsResponse(
+                items=[LegacySongResponse(**song) for song in songs],
+                **page,
+            ),
+        },
+        "search": {
+            "current": SongListResponse(songs=[SongResponse(**s) for s in songs]),
+            "legacy": LegacySongListResponse(
+                songs=[LegacySongResponse(**s) for s in songs],
+            ),
+        },
+    }
+
+
+def dump_model(model: BaseModel) -> bytes:
+    """Render a model the way flask_pydantic does."""
+    return model.model_dump_json().encode()
+
+
+def dump_dict(provider: DefaultJSONProvider, model: BaseModel) -> bytes:
+    """Render a model through a dict and Flask's default provider."""
+    return provider.dumps(model.model_dump()).encode()
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    """Return the median run time of `fn` in milliseconds."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    """Print the median encode time of each encoder and payload."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[100, 10_000],
+        help="Songs per payload (default: 100 10000)",
+    )
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per case")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    flask_json = DefaultJSONProvider(app)
+    pydantic_json = PydanticJSONProvider(app)
+    orjson_json = OrjsonJSONProvider(app) if orjson is not None else None
+
+    for rows in args.rows:
+        for name, models in payloads(rows).items():
+            current, legacy = models["current"], models["legacy"]
+            cases: Dict[str, Callable[[], object]] = {
+                "legacy": partial(dump_model, legacy),
+                "model_dump_json": partial(dump_model, current),
+                "flask": partial(dump_dict, flask_json, legacy),
+                "pydantic": partial(pydantic_json.dumps_bytes, current),
+            }
+            if orjson_json is not None:
+                cases["orjson"] = partial(orjson_json.dumps_bytes, current)
+
+            print(f"{name} payload, {rows} rows")
+            baseline = timed(cases["legacy"], args.repeat)
+            for case, fn in cases.items():
+                median = timed(fn, args.repeat)
+                print(f"  {case:<16} {median:9.3f} ms   x{baseline / median:.2f}")
+
+
+if __name__ == "__main__":
+    main()
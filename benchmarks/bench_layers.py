@@ -0,0 +1,121 @@
+"""Time repository and service calls one by one, without HTTP in the way.
+
+Seeds a dedicated database (or an in-memory one with `--mongomock`), then
+times each read and write of SongRepository, RatingRepository and their
+services with caching disabled, and saves the percentiles as JSON for
+`compare.py`:
+
+    python benchmarks/bench_layers.py --mongomock --rows 20000 --output base.json
+    python benchmarks/bench_layers.py --uri mongodb://localhost/songs_bench
+"""
+
+import argparse
+import random
+from typing import Callable, Dict, List
+
+from harness import (
+    print_table,
+    save_results,
+    seed_songs,
+    summarize,
+    timed,
+    use_mongomock,
+)
+from mongoengine import connect, disconnect
+
+from songs_api.config import Settings, settings
+from songs_api.db.repositories.rating_repository import RatingRepository
+from songs_api.db.repositories.song_repository import SongRepository
+from songs_api.services.rating_service import RatingService
+from songs_api.services.song_service import SongService
+
+
+def cases(
+    song_ids: List[str],
+    size: int,
+    text_search: bool,
+) -> Dict[str, Callable[[], object]]:
+    """Name every timed call; ids are drawn from a seeded RNG."""
+    rng = random.Random(0)  # noqa: S311
+    songs = SongRepository(settings=Settings(PAGE_SIZE_MAX=size))
+    ratings = RatingRepository()
+    song_service = SongService(repo=songs, raw_reads=False)
+    raw_service = SongService(repo=songs, raw_reads=True)
+    rating_service = RatingService(repo=ratings)
+
+    timed_calls: Dict[str, Callable[[], object]] = {
+        "repo.list_songs": lambda: songs.list_songs(page=10, size=size),
+        "repo.list_song_rows": lambda: songs.list_song_rows(page=10, size=size),
+        "repo.count_songs": songs.count_songs,
+        "repo.average_difficulty": lambda: songs.average_difficulty(level=5),
+        "repo.get_song_by_id": lambda: songs.get_song_by_id(rng.choice(song_ids)),
+        "repo.get_rating_stats": lambda: ratings.get_rating_stats(
+            rng.choice(song_ids),
+        ),
+        "repo.add_rating": lambda: ratings.add_rating(rng.choice(song_ids), 3),
+        "service.list_songs": lambda: song_service.list_songs(page=10, size=size),
+        "service.list_songs_raw": lambda: raw_service.list_songs(page=10, size=size),
+        "service.get_stats": lambda: rating_service.get_stats(rng.choice(song_ids)),
+        "service.add_rating": lambda: rating_service.add_rating(
+            rng.choice(song_ids),
+            4,
+        ),
+    }
+    if text_search:
+        timed_calls["repo.search_songs"] = lambda: songs.search_songs("word7")
+        timed_calls["service.search_songs"] = lambda: song_service.search_songs(
+            "word7",
+        )
+    return timed_calls
+
+
+def main() -> None:
+    """Seed the database, time every case and print or save the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--uri",
+        default="mongodb://localhost:27017/songs_bench",
+        help="Database to seed and read; it is dropped (default: songs_bench)",
+    )
+    parser.add_argument(
+        "--mongomock",
+        action="store_true",
+        help="Use an in-memory database instead of --uri (no text search)",
+    )
+    parser.add_argument("--rows", type=int, default=20_000, help="Songs to seed")
+    parser.add_argument("--ratings", type=int, default=5, help="Ratings per song")
+    parser.add_argument("--size", type=int, default=50, help="Page size")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per case")
+    parser.add_argument("--only", nargs="+", help="Run only these cases")
+    parser.add_argument("--output", help="Save results to this JSON file")
+    args = parser.parse_args()
+
+    # Time the reads, not the memoized results
+    settings.CACHE_ENABLED = False
+    if args.mongomock:
+        use_mongomock()
+    connect(host=args.uri)
+    print(f"Seeding {args.rows} songs...")
+    song_ids = [str(i) for i in seed_songs(args.rows, args.ratings)]
+
+    results = {}
+    for name, fn in cases(song_ids, args.size, not args.mongomock).items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = summarize(timed(fn, args.repeat))
+    print_table(results)
+    disconnect()
+
+    if args.output:
+        save_results(
+            args.output,
+            "layers",
+            results,
+            rows=args.rows,
+            size=args.size,
+            mongomock=args.mongomock,
+        )
+
+
+if __name__ == "__main__":
+    main()
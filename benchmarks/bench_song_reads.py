@@ -0,0 +1,151 @@
+"""Compare the MongoEngine and raw pymongo read paths of GET /songs and search.
+
+Seeds a dedicated database with synthetic songs, then times each path end to
+end: repository read, entity mapping, response model and JSON rendering.
+
+    python benchmarks/bench_song_reads.py --uri mongodb://localhost/songs_bench
+"""
+
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+from functools import partial
+from typing import Callable, List
+
+from mongoengine import connect, disconnect
+
+from songs_api.config import Settings, settings
+from songs_api.db.client import get_db
+from songs_api.db.models.song import Song
+from songs_api.db.repositories.song_repository import SongRepository
+from songs_api.schemas.api.song import (
+    PagedSongsResponse,
+    SongListResponse,
+    SongResponse,
+)
+from songs_api.services.song_service import SongService
+
+
+def seed(rows: int) -> None:
+    """Replace the songs collection with `rows` synthetic songs."""
+    Song.drop_collection()
+    released = date(2000, 1, 1)
+    docs = [
+        Song(
+            artist=f"Artist {i % 500}",
+            title=f"Song {i} word{i % 1000}",
+            difficulty=float(i % 20),
+            level=i % 15 + 1,
+            released=released + timedelta(days=i % 5000),
+        )
+        .to_mongo()
+        .to_dict()
+        for i in range(rows)
+    ]
+    get_db()[Song._get_collection_name()].insert_many(docs)
+    Song.ensure_indexes()
+
+
+def render_page(service: SongService, size: int) -> bytes:
+    """Build and serialize a GET /songs response the way the view does."""
+    page = service.list_songs(page=1, size=size)
+    return (
+        PagedSongsResponse(
+            items=[SongResponse.model_construct(**dict(item)) for item in page.items],
+            total=page.total,
+            page=page.page,
+            size=page.size,
+            next_cursor=page.next_cursor,
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+def render_search(service: SongService, message: str) -> bytes:
+    """Build and serialize a GET /songs/search response the way the view does."""
+    items = service.search_songs(message)
+    return (
+        SongListResponse(
+            songs=[SongResponse.model_construct(**dict(item)) for item in items],
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+def timed(fn: Callable[[], bytes], repeat: int) -> List[float]:
+    """Run `fn` `repeat` times after a warm-up call; return milliseconds."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, samples: List[float], baseline: float) -> None:
+    """Print the median and p95 of `samples`, and the speedup over baseline."""
+    median = statistics.median(samples)
+    p95 = statistics.quantiles(samples, n=20)[-1]
+    print(
+        f"  {name:<12} median {median:8.2f} ms   p95 {p95:8.2f} ms   "
+        f"x{baseline / median:.2f}",
+    )
+
+
+def main() -> None:
+    """Seed the database and print timings of both read paths."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--uri",
+        default="mongodb://localhost:27017/songs_bench",
+        help="Database to seed and read; it is dropped (default: songs_bench)",
+    )
+    parser.add_argument("--rows", type=int, default=20_000, help="Songs to seed")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per case")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100],
+        help="Page sizes to time (default: 10 100)",
+    )
+    parser.add_argument(
+        "--no-seed",
+        action="store_true",
+        help="Reuse the songs already in the database",
+    )
+    args = parser.parse_args()
+
+    # Time the reads, not the memoized results
+    settings.CACHE_ENABLED = False
+    repo = SongRepository(settings=Settings(PAGE_SIZE_MAX=max(args.sizes)))
+    connect(host=args.uri)
+    if not args.no_seed:
+        print(f"Seeding {args.rows} songs...")
+        seed(args.rows)
+
+    documents = SongService(repo=repo, raw_reads=False)
+    raw = SongService(repo=repo, raw_reads=True)
+
+    for size in args.sizes:
+        print(f"GET /songs?size={size}")
+        baseline = timed(partial(render_page, documents, size), args.repeat)
+        report("mongoengine", baseline, statistics.median(baseline))
+        samples = timed(partial(render_page, raw, size), args.repeat)
+        report("raw", samples, statistics.median(baseline))
+
+    print("GET /songs/search?message=word7")
+    baseline = timed(lambda: render_search(documents, "word7"), args.repeat)
+    report("mongoengine", baseline, statistics.median(baseline))
+    samples = timed(lambda: render_search(raw, "word7"), args.repeat)
+    report("raw", samples, statistics.median(baseline))
+
+    disconnect()
+
+
+if __name__ == "__main__":
+    main()
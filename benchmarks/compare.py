@@ -0,0 +1,83 @@
+"""Compare two saved benchmark runs and flag regressions.
+
+Reads the JSON written by `replay.py` or `bench_layers.py --output` and
+prints, for every result in both runs, the baseline and candidate values of
+a metric with their change. Exits with status 1 if any result got worse by
+more than `--threshold`, so it can gate CI:
+
+    python benchmarks/compare.py base.json head.json --metric p95_ms --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Metrics where a higher value is better; for every other one, lower is better
+HIGHER_IS_BETTER = frozenset({"rps"})
+
+
+def load(path: str) -> Dict[str, Any]:
+    """Read a saved run."""
+    run: Dict[str, Any] = json.loads(Path(path).read_text())
+    return run
+
+
+def compare(
+    baseline: Dict[str, Any],
+    candidate: Dict[str, Any],
+    metric: str,
+    threshold: float,
+) -> List[Tuple[str, float, float, float, bool]]:
+    """
+    Return (name, baseline, candidate, relative change, regressed) for
+    every result present in both runs with `metric`.
+    """
+    rows = []
+    for name, before in baseline["results"].items():
+        after = candidate["results"].get(name)
+        if after is None or metric not in before or metric not in after:
+            continue
+        old, new = float(before[metric]), float(after[metric])
+        change = (new - old) / old if old else 0.0
+        worse = -change if metric in HIGHER_IS_BETTER else change
+        rows.append((name, old, new, change, worse > threshold))
+    return rows
+
+
+def main() -> None:
+    """Print the comparison; exit 1 on any regression."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", help="JSON of the reference run")
+    parser.add_argument("candidate", help="JSON of the run to check")
+    parser.add_argument(
+        "--metric",
+        default="p95_ms",
+        help="p50_ms, p95_ms, p99_ms, mean_ms, max_ms or rps (default: p95_ms)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative change counted as a regression (default: 0.1 = 10%%)",
+    )
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    print(
+        f"{args.metric}: {baseline['meta'].get('revision') or args.baseline} -> "
+        f"{candidate['meta'].get('revision') or args.candidate}",
+    )
+    rows = compare(baseline, candidate, args.metric, args.threshold)
+    width = max((len(row[0]) for row in rows), default=10)
+    for name, old, new, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<{width}}  {old:10.2f} {new:10.2f} {change:+8.1%}{flag}")
+
+    if any(row[4] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
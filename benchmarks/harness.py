@@ -0,0 +1,182 @@
+"""Helpers shared by the replay and layer benchmarks.
+
+Results are saved as JSON with the same layout for every benchmark, so that
+`compare.py` can diff any two runs:
+
+    {"benchmark": ..., "meta": {...}, "results": {name: {"p50_ms": ..., ...}}}
+"""
+
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from bson import ObjectId
+from mongoengine import connection as mongoengine_connection
+
+from songs_api.db.client import get_collection
+from songs_api.db.models.rating import Rating
+from songs_api.db.models.rating_summary import RatingSummary
+from songs_api.db.models.song import Song
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile `q` (0-100) of already sorted samples."""
+    if not ordered:
+        return math.nan
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(
+    latencies: List[float],
+    seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Latency percentiles in milliseconds, and throughput if `seconds` given."""
+    ordered = sorted(latencies)
+    summary: Dict[str, Any] = {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1e3 if ordered else math.nan,
+        "p50_ms": percentile(ordered, 50) * 1e3,
+        "p95_ms": percentile(ordered, 95) * 1e3,
+        "p99_ms": percentile(ordered, 99) * 1e3,
+        "max_ms": ordered[-1] * 1e3 if ordered else math.nan,
+    }
+    if seconds:
+        summary["rps"] = len(ordered) / seconds
+    return summary
+
+
+def print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    """Print one line per result: count, throughput and percentiles."""
+    width = max((len(name) for name in results), default=10)
+    print(
+        f"{'':<{width}}  {'count':>7} {'req/s':>9} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'p99 ms':>9} {'errors':>7}",
+    )
+    for name, row in results.items():
+        rps = f"{row['rps']:9.1f}" if "rps" in row else f"{'-':>9}"
+        print(
+            f"{name:<{width}}  {row['count']:>7} {rps} {row['p50_ms']:9.2f} "
+            f"{row['p95_ms']:9.2f} {row['p99_ms']:9.2f} {row.get('errors', 0):>7}",
+        )
+
+
+def git_revision() -> str:
+    """Short hash of the checked-out commit, or "" outside a git checkout."""
+    try:
+        return subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def save_results(
+    path: str,
+    benchmark: str,
+    results: Dict[str, Dict[str, Any]],
+    **meta: Any,
+) -> None:
+    """Write results and the context of the run to a JSON file."""
+    document = {
+        "benchmark": benchmark,
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "argv": sys.argv[1:],
+            **meta,
+        },
+        "results": results,
+    }
+    Path(path).write_text(json.dumps(document, indent=2, default=str) + "\n")
+    print(f"Results saved to {path}")
+
+
+def use_mongomock() -> None:
+    """
+    Back every MongoEngine connection registered from now on with an
+    in-memory mongomock client, to run without a mongod (needs
+    `pip install mongomock`; `$text` search is not supported).
+    """
+    import mongomock
+
+    register = mongoengine_connection.register_connection
+
+    def register_mongomock(alias: str, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("mongo_client_class", mongomock.MongoClient)
+        register(alias, *args, **kwargs)
+
+    mongoengine_connection.register_connection = register_mongomock
+
+
+def seed_songs(rows: int, ratings_per_song: int = 0) -> List[ObjectId]:
+    """
+    Replace songs, ratings and summaries with `rows` synthetic songs and
+    `ratings_per_song` ratings each; return the song ids.
+    """
+    for document in (Song, Rating, RatingSummary):
+        document.drop_collection()
+
+    released = date(2000, 1, 1)
+    ids = [ObjectId() for _ in range(rows)]
+    songs = [
+        Song(
+            id=song_id,
+            artist=f"Artist {i % 500}",
+            title=f"Song {i} word{i % 1000}",
+            difficulty=float(i % 20),
+            level=i % 15 + 1,
+            released=released + timedelta(days=i % 5000),
+        )
+        .to_mongo()
+        .to_dict()
+        for i, song_id in enumerate(ids)
+    ]
+    for start in range(0, rows, 10_000):
+        get_collection(Song).insert_many(songs[start : start + 10_000])
+
+    if ratings_per_song:
+        values = [(i % 5) + 1 for i in range(ratings_per_song)]
+        get_collection(Rating).insert_many(
+            [
+                {"song_id": str(song_id), "rating": value}
+                for song_id in ids
+                for value in values
+            ],
+        )
+        get_collection(RatingSummary).insert_many(
+            [
+                {
+                    "song_id": str(song_id),
+                    "count": len(values),
+                    "sum": sum(values),
+                    "min": min(values),
+                    "max": max(values),
+                }
+                for song_id in ids
+            ],
+        )
+    for document in (Song, Rating, RatingSummary):
+        document.ensure_indexes()
+    return ids
+
+
+def timed(fn: Any, repeat: int) -> List[float]:
+    """Run `fn` `repeat` times after a warm-up call; return seconds per call."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
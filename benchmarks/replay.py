@@ -0,0 +1,337 @@
+"""Replay a JSON lines trace of requests against the app and time every route.
+
+Each trace line is a request: {"method": "GET", "path": "/songs?size=20"},
+with an optional JSON "body" and "headers". "{song_id}" anywhere in a path
+or body string is replaced by a random id of an existing song. Requests are
+sent in trace order, looping over the trace, by `--concurrency` threads,
+optionally paced to `--rate` requests/sec (latency then counts from when a
+request was due, so a slow server cannot hide its queueing).
+
+The app runs in this process (default), or behind gunicorn (`--gunicorn N`
+starts N workers on a free port), or anywhere with `--url`:
+
+    python benchmarks/replay.py benchmarks/traces/mixed.jsonl --mongomock \\
+        --seed 10000 --requests 5000 --concurrency 8 --output before.json
+    python benchmarks/replay.py benchmarks/traces/mixed.jsonl --gunicorn 4 \\
+        --duration 30 --rate 500 --output after.json
+    python benchmarks/compare.py before.json after.json
+
+Without `--mongomock` the app uses MONGO_URI; `--seed` drops and refills it.
+"""
+
+import argparse
+import http.client
+import json
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from harness import print_table, save_results, seed_songs, summarize, use_mongomock
+
+from songs_api.config import settings
+from songs_api.db.client import connect_db
+from songs_api.main import create_app
+
+# Sends (method, path, body, headers) and returns the response status
+Send = Callable[[str, str, Optional[bytes], Dict[str, str]], int]
+
+OBJECT_ID = re.compile(r"\b[0-9a-f]{24}\b")
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """Read the requests of a JSON lines trace, skipping blank lines."""
+    with Path(path).open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def route_of(method: str, path: str) -> str:
+    """Group requests by method and path, with ids and query strings removed."""
+    return f"{method} {OBJECT_ID.sub('<id>', path.split('?', 1)[0])}"
+
+
+def fill(value: Any, song_ids: List[str], rng: random.Random) -> Any:
+    """Replace "{song_id}" placeholders in strings nested in `value`."""
+    if isinstance(value, str) and "{song_id}" in value:
+        return value.replace("{song_id}", rng.choice(song_ids) if song_ids else "")
+    if isinstance(value, dict):
+        return {k: fill(v, song_ids, rng) for k, v in value.items()}
+    if isinstance(value, list):
+        return [fill(v, song_ids, rng) for v in value]
+    return value
+
+
+def wsgi_sender(app: Any) -> Callable[[], Send]:
+    """Build per-thread senders calling the Flask app in this process."""
+
+    def make() -> Send:
+        client = app.test_client()
+
+        def send(
+            method: str,
+            path: str,
+            body: Optional[bytes],
+            headers: Dict[str, str],
+        ) -> int:
+            response = client.open(path, method=method, data=body, headers=headers)
+            # Consume streamed bodies, as a real client would
+            response.get_data()
+            return int(response.status_code)
+
+        return send
+
+    return make
+
+
+def http_sender(url: str) -> Callable[[], Send]:
+    """Build per-thread senders with one keep-alive connection each."""
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+
+    def make() -> Send:
+        connection = http.client.HTTPConnection(host, port, timeout=30)
+
+        def send(
+            method: str,
+            path: str,
+            body: Optional[bytes],
+            headers: Dict[str, str],
+        ) -> int:
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                return response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                return 0
+
+        return send
+
+    return make
+
+
+def replay(
+    make_sender: Callable[[], Send],
+    trace: List[Dict[str, Any]],
+    song_ids: List[str],
+    concurrency: int,
+    rate: Optional[float],
+    total: Optional[int],
+    duration: Optional[float],
+) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    """
+    Send the trace until `total` requests or `duration` seconds; return the
+    latencies and error counts per route, and the elapsed seconds.
+    """
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    issued = iter(range(sys.maxsize))
+    started_at = time.perf_counter()
+    deadline = started_at + duration if duration else None
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)  # noqa: S311
+        send = make_sender()
+        while True:
+            with lock:
+                k = next(issued)
+            if total is not None and k >= total:
+                return
+            due = started_at + k / rate if rate else time.perf_counter()
+            if deadline is not None and due >= deadline:
+                return
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            item = fill(trace[k % len(trace)], song_ids, rng)
+            method = item.get("method", "GET").upper()
+            headers = dict(item.get("headers", {}))
+            body = None
+            if "body" in item:
+                body = json.dumps(item["body"]).encode()
+                headers.setdefault("Content-Type", "application/json")
+
+            start = due if rate else time.perf_counter()
+            status = send(method, item["path"], body, headers)
+            elapsed = time.perf_counter() - start
+            route = route_of(method, item["path"])
+            with lock:
+                latencies[route].append(elapsed)
+                if status == 0 or status >= 500:
+                    errors[route] += 1
+
+    threads = [
+        threading.Thread(target=worker, args=(seed,)) for seed in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - started_at
+
+
+def free_port() -> int:
+    """Return a TCP port that is free on localhost right now."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return int(s.getsockname()[1])
+
+
+def start_gunicorn(workers: int) -> Tuple[subprocess.Popen[bytes], str]:
+    """Start gunicorn on wsgi:app with the repo's config; wait until healthy."""
+    port = free_port()
+    process = subprocess.Popen(  # noqa: S603
+        [  # noqa: S607
+            "gunicorn",
+            "--workers",
+            str(workers),
+            "--bind",
+            f"127.0.0.1:{port}",
+            "wsgi:app",
+        ],
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status < 500:
+                return process, url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise SystemExit("gunicorn did not come up")
+
+
+def fetch_song_ids(app: Any, url: str) -> List[str]:
+    """Ids of up to 100 existing songs, read through the API itself."""
+    if app is not None:
+        body = app.test_client().get("/songs?size=100").get_json() or {}
+    else:
+        parts = urlsplit(url)
+        host, port = parts.hostname or "127.0.0.1", parts.port or 80
+        connection = http.client.HTTPConnection(host, port, timeout=30)
+        connection.request("GET", "/songs?size=100")
+        response = connection.getresponse()
+        body = json.loads(response.read()) if response.status == 200 else {}
+    return [item["id"] for item in body.get("items", [])]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse and check the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="JSON lines file of requests")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Replay against a running server")
+    target.add_argument(
+        "--gunicorn",
+        type=int,
+        metavar="WORKERS",
+        help="Start gunicorn with this many workers and replay against it",
+    )
+    parser.add_argument(
+        "--mongomock",
+        action="store_true",
+        help="Run the in-process app on an in-memory database",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Songs to seed first")
+    parser.add_argument(
+        "--ratings",
+        type=int,
+        default=3,
+        help="Ratings per seeded song (default: 3)",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, help="Requests/sec (default: no pacing)")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds")
+    parser.add_argument("--output", help="Save results to this JSON file")
+    args = parser.parse_args()
+    if args.requests is None and args.duration is None:
+        args.requests = 1000
+    if args.mongomock and (args.url or args.gunicorn):
+        parser.error("--mongomock only applies to the in-process app")
+    return args
+
+
+def main() -> None:
+    """Replay the trace, print per-route results and optionally save them."""
+    args = parse_args()
+    app = None
+    if args.mongomock:
+        use_mongomock()
+    if args.url or args.gunicorn:
+        connect_db(config=settings)
+    else:
+        app = create_app(settings)
+
+    song_ids: List[str] = []
+    if args.seed:
+        print(f"Seeding {args.seed} songs...")
+        song_ids = [str(i) for i in seed_songs(args.seed, args.ratings)]
+
+    process = None
+    if args.gunicorn:
+        process, url = start_gunicorn(args.gunicorn)
+        make_sender = http_sender(url)
+    elif args.url:
+        url = args.url
+        make_sender = http_sender(url)
+    else:
+        url = "in-process"
+        make_sender = wsgi_sender(app)
+
+    try:
+        song_ids = song_ids or fetch_song_ids(app, url)
+        if not song_ids:
+            print("No songs found: {song_id} placeholders stay empty (try --seed)")
+        trace = load_trace(args.trace)
+        latencies, errors, elapsed = replay(
+            make_sender,
+            trace,
+            song_ids,
+            args.concurrency,
+            args.rate,
+            args.requests,
+            args.duration,
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    results = {
+        route: {**summarize(samples, elapsed), "errors": errors.get(route, 0)}
+        for route, samples in sorted(latencies.items())
+    }
+    results["all"] = {
+        **summarize([s for samples in latencies.values() for s in samples], elapsed),
+        "errors": sum(errors.values()),
+    }
+    print(f"{url}: {results['all']['count']} requests in {elapsed:.1f} s")
+    print_table(results)
+    if args.output:
+        save_results(
+            args.output,
+            "replay",
+            results,
+            target=url,
+            trace=args.trace,
+            concurrency=args.concurrency,
+            rate=args.rate,
+        )
+
+
+if __name__ == "__main__":
+    main()
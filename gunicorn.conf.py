@@ -0,0 +1,63 @@
+"""Gunicorn settings for `gunicorn wsgi:app`, read from the working directory.
+
+The app is loaded once in the arbiter and forked into the workers. MongoDB
+clients are only opened on first use, and any opened before the fork are
+dropped in each worker (see ConnectionManager). Size the pool so that
+workers * threads stays within what one MongoClient per worker can serve
+(MONGO_MAX_POOL_SIZE); `/health` reports checkout waits and utilization.
+
+Workers write their Prometheus metrics to PROMETHEUS_MULTIPROC_DIR (a fresh
+temporary directory unless set), which /metrics sums over the live workers.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any
+
+# Must be set before prometheus_client is first imported, below
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    tempfile.mkdtemp(prefix="songs-api-metrics-"),
+)
+
+from prometheus_client import multiprocess
+
+from songs_api.db.client import connection_manager, disconnect_db
+
+preload_app = True
+
+logger = logging.getLogger("gunicorn.error")
+
+
+def on_starting(server: Any) -> None:
+    """Drop metrics files left over by a previous run."""
+    path = Path(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+    shutil.rmtree(path, ignore_errors=True)
+    path.mkdir(parents=True)
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    """Drop MongoDB clients inherited from the arbiter."""
+    connection_manager.reset()
+
+
+def worker_exit(server: Any, worker: Any) -> None:
+    """Flush queued ratings and log pool usage before the worker goes away."""
+    from songs_api.services.rating_service import rating_service
+
+    if rating_service.buffer is not None:
+        rating_service.buffer.close()
+    logger.info(
+        "MongoDB pool of worker %s: %s",
+        worker.pid,
+        connection_manager.pool_stats(),
+    )
+    disconnect_db()
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    """Stop counting the gauges of a worker that went away."""
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,486 @@
+"""Script to generate synthetic song catalogs and rating streams at scale."""
+
+import functools
+import json
+import math
+import os
+import random
+import struct
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from bson import ObjectId
+from mongoengine import connect, disconnect
+
+from songs_api.config import Settings
+from songs_api.db.client import get_db
+from songs_api.db.models.rating import Rating
+from songs_api.db.models.song import Song
+from songs_api.db.repositories.rating_repository import RatingRepository
+from songs_api.services.rating_service import all_ratings_changed
+from songs_api.services.song_service import invalidate_catalog
+from songs_api.utils.catalog import content_hash, natural_key
+from songs_api.utils.shared_cache import open_shared_cache
+from songs_api.utils.versions import configure_versions
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+SYLLABLES = (
+    "ka ri to na mi so lu ve da zen mor fel tha quo bri sta an el or ix "
+    "ul ro ma ne sa di go pa le ky ther wyn gal dor rin cas mel"
+).split()
+
+Row = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class DatasetConfig:
+    """Shape of a generated dataset; the same config always yields the same rows."""
+
+    songs: int = 100_000
+    ratings: int = 1_000_000
+    seed: int = 0
+    # Songs per artist follow a Zipf law of this exponent over `artists`
+    artists: int = 10_000
+    artist_skew: float = 1.1
+    # Title words are drawn from `vocabulary` words, Zipf-distributed
+    vocabulary: int = 5_000
+    word_skew: float = 1.0
+    title_words: Tuple[int, int] = (1, 5)
+    # Levels are uniform; difficulty is level * difficulty_per_level plus
+    # Gaussian noise
+    levels: int = 15
+    difficulty_per_level: float = 1.1
+    difficulty_noise: float = 1.5
+    released_from: date = date(1960, 1, 1)
+    released_to: date = date(2024, 12, 31)
+    # 0 spreads releases evenly; higher values favor recent years
+    release_growth: float = 1.0
+    # Ratings per song follow a Zipf law of this exponent
+    rating_skew: float = 1.0
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+
+def zipf_rank(rng: random.Random, n: int, skew: float) -> int:
+    """
+    Draw a 0-based rank out of `n` with P(rank) roughly proportional to
+    1 / (rank + 1) ** skew, in constant time (inverse of the continuous CDF).
+    """
+    if n <= 1:
+        return 0
+    u = rng.random()
+    if skew <= 0:
+        return int(u * n)
+    if abs(skew - 1.0) < 1e-9:
+        x = math.exp(u * math.log(n + 1))
+    else:
+        exponent = 1.0 - skew
+        x = ((n + 1) ** exponent - 1) * u + 1
+        x = x ** (1.0 / exponent)
+    return min(n - 1, int(x) - 1)
+
+
+def song_id(seed: int, index: int) -> ObjectId:
+    """Deterministic id of the song at `index` of the dataset of `seed`."""
+    return ObjectId(struct.pack(">IQ", 1_500_000_000 + seed % 100_000_000, index))
+
+
+@functools.lru_cache(maxsize=4)
+def vocabulary(seed: int, size: int) -> Tuple[str, ...]:
+    """`size` distinct pronounceable words, the most frequent ones first."""
+    rng = random.Random(f"{seed}:words")
+    words: Dict[str, None] = {}
+    while len(words) < size:
+        length = 1 + zipf_rank(rng, 4, 1.0)
+        words["".join(rng.choice(SYLLABLES) for _ in range(length))] = None
+    return tuple(words)
+
+
+@functools.lru_cache(maxsize=4)
+def artist_names(seed: int, count: int, vocabulary_size: int) -> Tuple[str, ...]:
+    """`count` artist names built from the vocabulary."""
+    rng = random.Random(f"{seed}:artists")
+    words = vocabulary(seed, vocabulary_size)
+    patterns: List[Callable[[], str]] = [
+        lambda: f"The {rng.choice(words).title()}s",
+        lambda: f"{rng.choice(words).title()} {rng.choice(words).title()}",
+        lambda: f"DJ {rng.choice(words).title()}",
+        lambda: rng.choice(words).title(),
+    ]
+    return tuple(rng.choice(patterns)() for _ in range(count))
+
+
+def popularity_stride(n: int) -> int:
+    """Multiplier coprime with `n`, mapping popularity ranks onto song indexes."""
+    stride = 2_654_435_761 % n or 1
+    while math.gcd(stride, n) != 1:
+        stride += 1
+    return stride
+
+
+def song_chunk(config: DatasetConfig, chunk: int) -> List[Row]:
+    """Songs of one chunk, as rows in the import file format plus an "id"."""
+    rng = random.Random(f"{config.seed}:songs:{chunk}")
+    words = vocabulary(config.seed, config.vocabulary)
+    artists = artist_names(config.seed, config.artists, config.vocabulary)
+    span = (config.released_to - config.released_from).days
+    low, high = config.title_words
+
+    rows = []
+    start = chunk * config.chunk_size
+    for index in range(start, min(start + config.chunk_size, config.songs)):
+        level = rng.randint(1, config.levels)
+        difficulty = level * config.difficulty_per_level + rng.gauss(
+            0,
+            config.difficulty_noise,
+        )
+        recency = rng.random() ** (1 / (1 + config.release_growth))
+        title = " ".join(
+            words[zipf_rank(rng, len(words), config.word_skew)]
+            for _ in range(rng.randint(low, high))
+        )
+        rows.append(
+            {
+                "id": str(song_id(config.seed, index)),
+                "artist": artists[zipf_rank(rng, len(artists), config.artist_skew)],
+                "title": title.capitalize(),
+                "difficulty": round(max(0.0, difficulty), 2),
+                "level": level,
+                "released": (
+                    config.released_from + timedelta(days=int(recency * span))
+                ).isoformat(),
+            },
+        )
+    return rows
+
+
+class SeenKeys:
+    """
+    Bloom filter of natural keys, a few bytes per song whatever the catalog
+    size: it never misses a key it was given, and wrongly reports about one
+    in 2000 others as seen.
+    """
+
+    BITS_PER_KEY = 16
+    PROBES = 8
+
+    def __init__(self, capacity: int) -> None:
+        self._size = max(64, capacity * self.BITS_PER_KEY)
+        self._bits = bytearray(self._size // 8 + 1)
+
+    def add(self, key: str) -> bool:
+        """Record a hex digest key; return whether it may have been seen before."""
+        digest = int(key, 16)
+        h1, h2 = digest >> 64, digest & (2**64 - 1) | 1
+        seen = True
+        for probe in range(self.PROBES):
+            bit = (h1 + probe * h2) % self._size
+            mask = 1 << (bit & 7)
+            if not self._bits[bit >> 3] & mask:
+                seen = False
+                self._bits[bit >> 3] |= mask
+        return seen
+
+
+def unique_songs(
+    config: DatasetConfig,
+    chunks: Iterable[List[Row]],
+) -> Iterator[List[Row]]:
+    """
+    Pass song chunks through in order, renaming songs whose artist, title
+    and release date an earlier song already has. Chunks are drawn
+    independently, so large catalogs get a few hundred such songs per
+    million, which the unique natural_key index would reject.
+
+    A renamed song gets its index as a "(Take N)" suffix, which generated
+    titles never have, so its key is unique even when the filter was wrong.
+    """
+    seen = SeenKeys(config.songs)
+    index = 0
+    for rows in chunks:
+        for row in rows:
+            released = date.fromisoformat(row["released"])
+            if seen.add(natural_key(row["artist"], row["title"], released)):
+                row["title"] = f"{row['title']} (Take {index + 1})"
+            index += 1
+        yield rows
+
+
+def rating_chunk(config: DatasetConfig, chunk: int) -> List[Row]:
+    """
+    Ratings of one chunk. Popular songs are spread over the catalog rather
+    than being its first rows, and each song has its own typical rating.
+    """
+    rng = random.Random(f"{config.seed}:ratings:{chunk}")
+    stride = popularity_stride(config.songs)
+
+    rows = []
+    start = chunk * config.chunk_size
+    for _ in range(start, min(start + config.chunk_size, config.ratings)):
+        rank = zipf_rank(rng, config.songs, config.rating_skew)
+        index = rank * stride % config.songs
+        # Golden-ratio hashing: a stable mean between 1.5 and 4.5 per song
+        mean = 1.5 + 3 * ((index * 0.6180339887) % 1)
+        rows.append(
+            {
+                "song_id": str(song_id(config.seed, index)),
+                "rating": min(5, max(1, round(rng.gauss(mean, 1.0)))),
+            },
+        )
+    return rows
+
+
+def generate(
+    config: DatasetConfig,
+    make_chunk: Callable[[DatasetConfig, int], List[Row]],
+    total: int,
+    workers: int = 0,
+) -> Iterator[List[Row]]:
+    """
+    Yield the chunks of `total` rows in order, built in a process pool
+    keeping only a few chunks in flight. With `workers` set to 0 chunks are
+    built in the current process; the rows are the same either way.
+    """
+    chunks = range(math.ceil(total / config.chunk_size))
+    if workers == 0:
+        for chunk in chunks:
+            yield make_chunk(config, chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future[List[Row]]] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(make_chunk, config, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def song_chunks(config: DatasetConfig, workers: int = 0) -> Iterator[List[Row]]:
+    """Yield the chunks of the catalog in order, with unique natural keys."""
+    return unique_songs(config, generate(config, song_chunk, config.songs, workers))
+
+
+def song_document(row: Row) -> Row:
+    """Turn a generated song row into the document the importer would store."""
+    released = date.fromisoformat(row["released"])
+    return {
+        "_id": ObjectId(row["id"]),
+        "artist": row["artist"],
+        "title": row["title"],
+        "difficulty": row["difficulty"],
+        "level": row["level"],
+        "released": datetime.combine(released, datetime.min.time()),
+        "natural_key": natural_key(row["artist"], row["title"], released),
+        "content_hash": content_hash(
+            row["artist"],
+            row["title"],
+            row["difficulty"],
+            row["level"],
+            released,
+        ),
+    }
+
+
+def write_dataset(config: DatasetConfig, out_dir: Path, workers: int = 0) -> None:
+    """
+    Write songs.ndjson, in the format of scripts/import_songs.py, and
+    ratings.ndjson, one {"song_id", "rating"} per line, to `out_dir`.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, chunks, total in (
+        ("songs.ndjson", song_chunks(config, workers), config.songs),
+        (
+            "ratings.ndjson",
+            generate(config, rating_chunk, config.ratings, workers),
+            config.ratings,
+        ),
+    ):
+        path = out_dir / name
+        started_at = time.perf_counter()
+        written = 0
+        with path.open("w", encoding="utf-8") as f:
+            for rows in chunks:
+                f.writelines(json.dumps(row) + "\n" for row in rows)
+                written += len(rows)
+                _progress(path.name, written, total, started_at)
+        print(f"Wrote {written} rows to {path}")
+
+
+def load_dataset(config: DatasetConfig, workers: int = 0) -> None:
+    """
+    Bulk insert the dataset into the current database, then build indexes
+    and the rating summaries, as the importer and rebuild script would, and
+    drop the memoized reads and stamps of the catalog and of every song's
+    ratings.
+    """
+    db = get_db()
+    # Raw collections: the documents' own collections would build indexes
+    # up front
+    for name, chunks, total, to_document in (
+        (
+            Song._get_collection_name(),
+            song_chunks(config, workers),
+            config.songs,
+            song_document,
+        ),
+        (
+            Rating._get_collection_name(),
+            generate(config, rating_chunk, config.ratings, workers),
+            config.ratings,
+            dict,
+        ),
+    ):
+        started_at = time.perf_counter()
+        inserted = 0
+        for rows in chunks:
+            db[name].insert_many([to_document(row) for row in rows], ordered=False)
+            inserted += len(rows)
+            _progress(name, inserted, total, started_at)
+
+    print("Building indexes...")
+    Song.ensure_indexes()
+    Rating.ensure_indexes()
+    print("Rebuilding rating summaries...")
+    written = RatingRepository().rebuild_summaries()
+    print(f"Loaded {config.songs} songs and {config.ratings} ratings ({written} rated)")
+    invalidate_catalog()
+    all_ratings_changed()
+
+
+def _progress(name: str, done: int, total: int, started_at: float) -> None:
+    elapsed = time.perf_counter() - started_at
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"  {name}: {done}/{total} rows ({rate:.0f} rows/s)")
+
+
+def _count(value: str) -> int:
+    """Parse a row count, allowing scientific notation such as 1e6."""
+    return int(float(value))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Generate a dataset as configured on the command line."""
+    import argparse
+
+    defaults = DatasetConfig()
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic song catalog and rating stream",
+    )
+    parser.add_argument("--songs", type=_count, default=defaults.songs)
+    parser.add_argument("--ratings", type=_count, default=defaults.ratings)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--artists", type=_count, default=defaults.artists)
+    parser.add_argument("--artist-skew", type=float, default=defaults.artist_skew)
+    parser.add_argument("--vocabulary", type=_count, default=defaults.vocabulary)
+    parser.add_argument("--word-skew", type=float, default=defaults.word_skew)
+    parser.add_argument(
+        "--title-words",
+        type=int,
+        nargs=2,
+        metavar=("MIN", "MAX"),
+        default=defaults.title_words,
+    )
+    parser.add_argument("--levels", type=int, default=defaults.levels)
+    parser.add_argument(
+        "--difficulty-per-level",
+        type=float,
+        default=defaults.difficulty_per_level,
+    )
+    parser.add_argument(
+        "--difficulty-noise",
+        type=float,
+        default=defaults.difficulty_noise,
+    )
+    parser.add_argument(
+        "--released-from",
+        type=date.fromisoformat,
+        default=defaults.released_from,
+    )
+    parser.add_argument(
+        "--released-to",
+        type=date.fromisoformat,
+        default=defaults.released_to,
+    )
+    parser.add_argument(
+        "--release-growth",
+        type=float,
+        default=defaults.release_growth,
+        help="0 spreads releases evenly; higher values favor recent years",
+    )
+    parser.add_argument("--rating-skew", type=float, default=defaults.rating_skew)
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Rows generated and written per batch (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Generator processes; 0 generates inline (default: CPU count)",
+    )
+    parser.add_argument("--out", help="Directory to write the NDJSON files to")
+    parser.add_argument(
+        "--load",
+        action="store_true",
+        help="Bulk load into MONGO_URI, replacing its songs and ratings",
+    )
+    args = parser.parse_args(argv)
+    if not args.out and not args.load:
+        parser.error("pass --out, --load or both")
+
+    config = DatasetConfig(
+        songs=args.songs,
+        ratings=args.ratings,
+        seed=args.seed,
+        artists=args.artists,
+        artist_skew=args.artist_skew,
+        vocabulary=args.vocabulary,
+        word_skew=args.word_skew,
+        title_words=tuple(args.title_words),
+        levels=args.levels,
+        difficulty_per_level=args.difficulty_per_level,
+        difficulty_noise=args.difficulty_noise,
+        released_from=args.released_from,
+        released_to=args.released_to,
+        release_growth=args.release_growth,
+        rating_skew=args.rating_skew,
+        chunk_size=args.chunk_size,
+    )
+    workers = os.cpu_count() or 1 if args.workers is None else args.workers
+
+    if args.out:
+        write_dataset(config, Path(args.out), workers)
+    if args.load:
+        settings = Settings()
+        connect(host=settings.MONGO_URI)
+        # So invalidations also reach the workers' shared cache and stamps
+        open_shared_cache(settings)
+        configure_versions(settings)
+        print("Dropping existing songs and ratings...")
+        Song.drop_collection()
+        Rating.drop_collection()
+        load_dataset(config, workers)
+        disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,353 @@
 """Script to import songs.json data into MongoDB."""
 
 import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from mongoengine import connect, disconnect
+from bson import ObjectId
+from bson.errors import InvalidId
+from mongoengine import ValidationError, connect, disconnect
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
 
 from songs_api.config import Settings
+from songs_api.db.client import get_db
 from songs_api.db.models.song import Song
+from songs_api.services.song_service import invalidate_catalog
+from songs_api.utils.catalog import content_hash, natural_key
+from songs_api.utils.shared_cache import open_shared_cache
+from songs_api.utils.versions import configure_versions
 
+DEFAULT_CHUNK_SIZE = 5000
 
-def import_songs(file_path: str, drop_existing: bool = False) -> None:
+ParsedChunk = Tuple[List[Dict[str, Any]], List[str]]
+
+
+@dataclass
+class ImportStats:
+    """Running totals of an import."""
+
+    read: int = 0
+    inserted: int = 0
+    invalid: int = 0
+    failed: int = 0
+    started_at: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Rows read per second so far."""
+        elapsed = time.perf_counter() - self.started_at
+        return self.read / elapsed if elapsed > 0 else 0.0
+
+
+@dataclass
+class SyncStats(ImportStats):
+    """Running totals of a sync, i.e. the diff against the collection."""
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    backfilled: int = 0
+
+
+def read_chunks(path: Path, chunk_size: int) -> Iterator[List[str]]:
+    """Lazily yield the non-empty lines of a line-delimited JSON file in chunks."""
+    chunk: List[str] = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_chunk(lines: List[str]) -> ParsedChunk:
+    """Parse, validate and convert a chunk of lines into raw Song documents.
+
+    Runs in worker processes, so it only uses MongoEngine for validation and
+    never touches the database.
+
+    Returns:
+        (documents ready for insert_many, one error message per invalid line)
+    """
+    docs: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    for line in lines:
+        try:
+            song_data = json.loads(line)
+            # Convert released string to date object
+            released_date = datetime.strptime(
+                song_data["released"],
+                "%Y-%m-%d",
+            ).date()
+
+            song = Song(
+                artist=song_data["artist"],
+                title=song_data["title"],
+                difficulty=song_data["difficulty"],
+                level=song_data["level"],
+                released=released_date,
+            )
+            # Optional: keeps ids that other data (e.g. ratings) refers to
+            if "id" in song_data:
+                song.id = ObjectId(song_data["id"])
+            song.validate()
+            song.natural_key = natural_key(song.artist, song.title, song.released)
+            song.content_hash = content_hash(
+                song.artist,
+                song.title,
+                song.difficulty,
+                song.level,
+                song.released,
+            )
+        except (ValueError, KeyError, TypeError, InvalidId, ValidationError) as e:
+            errors.append(f"{type(e).__name__}: {e} in {line.strip()[:80]}")
+            continue
+        docs.append(song.to_mongo().to_dict())
+    return docs, errors
+
+
+def parse_chunks(
+    chunks: Iterable[List[str]],
+    workers: int,
+) -> Iterator[ParsedChunk]:
+    """Parse chunks in a process pool, keeping only a few chunks in flight.
+
+    With `workers` set to 0 chunks are parsed in the current process.
+    """
+    if workers == 0:
+        yield from map(parse_chunk, chunks)
+        return
+
+    # Executor.map would read the whole file up front; bound what's pending
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future[ParsedChunk]] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(parse_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def load_songs(
+    path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+) -> ImportStats:
+    """Stream songs from `path` into the songs collection of the current db.
+
+    Indexes are built once all rows are loaded, which is much cheaper than
+    maintaining them on every insert.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # Raw collection: Song._get_collection() would create indexes up front
+    collection = get_db()[Song._get_collection_name()]
+    stats = ImportStats(started_at=time.perf_counter())
+
+    for docs, errors in parse_chunks(read_chunks(path, chunk_size), workers):
+        stats.read += len(docs) + len(errors)
+        stats.invalid += len(errors)
+        for error in errors:
+            print(f"  Skipping invalid row: {error}")
+
+        if docs:
+            try:
+                result = collection.insert_many(docs, ordered=False)
+                stats.inserted += len(result.inserted_ids)
+            except BulkWriteError as e:
+                failed = len(e.details["writeErrors"])
+                stats.failed += failed
+                stats.inserted += len(docs) - failed
+
+        print(
+            f"  {stats.read} rows read, {stats.inserted} inserted "
+            f"({stats.rate:.0f} rows/s)",
+        )
+
+    print("Building indexes...")
+    Song.ensure_indexes()
+    invalidate_catalog()
+    return stats
+
+
+def backfill_keys(collection: Collection[Dict[str, Any]]) -> int:
+    """Give songs loaded before natural keys existed their key and hash.
+
+    Returns:
+        Number of songs updated.
+    """
+    fields = {"artist": 1, "title": 1, "difficulty": 1, "level": 1, "released": 1}
+    batch: List[UpdateOne] = []
+    updated = 0
+    for doc in collection.find({"natural_key": {"$exists": False}}, fields):
+        released = doc["released"].date()
+        batch.append(
+            UpdateOne(
+                {"_id": doc["_id"]},
+                {
+                    "$set": {
+                        "natural_key": natural_key(
+                            doc["artist"],
+                            doc["title"],
+                            released,
+                        ),
+                        "content_hash": content_hash(
+                            doc["artist"],
+                            doc["title"],
+                            doc["difficulty"],
+                            doc["level"],
+                            released,
+                        ),
+                    },
+                },
+            ),
+        )
+        if len(batch) >= DEFAULT_CHUNK_SIZE:
+            updated += collection.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += collection.bulk_write(batch, ordered=False).modified_count
+    return updated
+
+
+def sync_songs(
+    path: Path,
+    prune: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+) -> SyncStats:
+    """Bring the songs collection in line with `path` without reloading it.
+
+    Songs are matched on their natural key (artist, title, released): new
+    ones are inserted, changed ones updated in place so their _id (and the
+    ratings pointing at it) survive, and unchanged ones are not written at
+    all. With `prune`, songs that are no longer in the source are deleted.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # Make sure natural_key lookups are indexed before matching on them
+    Song.ensure_indexes()
+    collection = get_db()[Song._get_collection_name()]
+    stats = SyncStats(started_at=time.perf_counter())
+    stats.backfilled = backfill_keys(collection)
+    seen: Set[str] = set()
+
+    for docs, errors in parse_chunks(read_chunks(path, chunk_size), workers):
+        stats.read += len(docs) + len(errors)
+        stats.invalid += len(errors)
+        for error in errors:
+            print(f"  Skipping invalid row: {error}")
+
+        # Later rows win over earlier duplicates of the same song
+        by_key = {doc["natural_key"]: doc for doc in docs}
+        existing = {
+            doc["natural_key"]: doc["content_hash"]
+            for doc in collection.find(
+                {"natural_key": {"$in": list(by_key)}},
+                {"natural_key": 1, "content_hash": 1},
+            )
+        }
+
+        batch: List[UpdateOne] = []
+        for key, doc in by_key.items():
+            if prune:
+                seen.add(key)
+            if key not in existing:
+                stats.added += 1
+            elif existing[key] != doc["content_hash"]:
+                stats.updated += 1
+            else:
+                stats.unchanged += 1
+                continue
+            # An _id from the file only applies to new songs; ids never change
+            update: Dict[str, Any] = {"$set": doc}
+            if "_id" in doc:
+                update["$setOnInsert"] = {"_id": doc.pop("_id")}
+            batch.append(UpdateOne({"natural_key": key}, update, upsert=True))
+
+        if batch:
+            collection.bulk_write(batch, ordered=False)
+
+        print(
+            f"  {stats.read} rows read, {stats.added} added, "
+            f"{stats.updated} updated ({stats.rate:.0f} rows/s)",
+        )
+
+    if prune:
+        stale = [
+            doc["_id"]
+            for doc in collection.find({}, {"natural_key": 1})
+            if doc.get("natural_key") not in seen
+        ]
+        for start in range(0, len(stale), chunk_size):
+            result = collection.delete_many(
+                {"_id": {"$in": stale[start : start + chunk_size]}},
+            )
+            stats.deleted += result.deleted_count
+
+    invalidate_catalog()
+    return stats
+
+
+def import_songs(
+    file_path: str,
+    drop_existing: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    sync: bool = False,
+    prune: bool = False,
+) -> None:
     """Import songs from JSON file to MongoDB."""
     print(f"Importing songs from {file_path}...")
 
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+
     # Initialize MongoDB connection
     settings = Settings()
     connect(host=settings.MONGO_URI)
+    # So invalidate_catalog() also reaches the workers' shared cache and
+    # version stamps
+    open_shared_cache(settings)
+    configure_versions(settings)
 
     # Drop existing collection if requested
     if drop_existing:
         print("Dropping existing songs collection...")
         Song.drop_collection()
 
-    # Read and parse songs data
-    path = Path(file_path)
-    if not path.exists():
-        raise FileNotFoundError(f"File not found: {file_path}")
-
-    with open(path, "r", encoding="utf-8") as f:
-        # The file contains one JSON object per line
-        songs_data = [json.loads(line) for line in f if line.strip()]
-
-    songs = []
-    for song_data in songs_data:
-        # Convert released string to date object
-        released_date = datetime.strptime(song_data["released"], "%Y-%m-%d").date()
-
-        song = Song(
-            artist=song_data["artist"],
-            title=song_data["title"],
-            difficulty=song_data["difficulty"],
-            level=song_data["level"],
-            released=released_date,
+    if sync:
+        sync_stats = sync_songs(path, prune, chunk_size=chunk_size, workers=workers)
+        print(
+            f"Synced {sync_stats.read} rows: {sync_stats.added} added, "
+            f"{sync_stats.updated} updated, {sync_stats.unchanged} unchanged, "
+            f"{sync_stats.deleted} deleted, {sync_stats.invalid} invalid "
+            f"({sync_stats.backfilled} existing songs given natural keys)",
         )
-        songs.append(song)
+        disconnect()
+        return
 
-    # Insert songs
-    print(f"Inserting {len(songs)} songs...")
-    for song in songs:
-        song.save()
+    stats = load_songs(path, chunk_size=chunk_size, workers=workers)
 
-    print(f"Successfully imported {len(songs)} songs")
+    print(
+        f"Successfully imported {stats.inserted} songs "
+        f"({stats.invalid} invalid, {stats.failed} failed, {stats.rate:.0f} rows/s)",
+    )
     disconnect()
 
 
@@ -64,12 +360,44 @@ if __name__ == "__main__":
         default="songs.json",
         help="Path to songs.json file (default: songs.json)",
     )
-    parser.add_argument(
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
         "--drop",
         action="store_true",
         help="Drop existing songs collection before import",
     )
+    mode.add_argument(
+        "--sync",
+        action="store_true",
+        help="Upsert new and changed songs only, keeping existing song ids",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="With --sync, delete songs that are missing from the file",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Rows parsed and inserted per batch (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parser processes; 0 parses inline (default: CPU count)",
+    )
 
     args = parser.parse_args()
+    if args.prune and not args.sync:
+        parser.error("--prune requires --sync")
 
-    import_songs(args.file, args.drop)
+    import_songs(
+        args.file,
+        args.drop,
+        args.chunk_size,
+        args.workers,
+        sync=args.sync,
+        prune=args.prune,
+    )
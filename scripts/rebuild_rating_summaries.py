@@ -0,0 +1,71 @@
+"""Script to rebuild or verify rating summaries from the raw ratings data."""
+
+import sys
+from typing import Optional
+
+from mongoengine import connect, disconnect
+
+from songs_api.config import Settings
+from songs_api.db.repositories.rating_repository import RatingRepository
+
+
+def rebuild_summaries(song_id: Optional[str] = None) -> None:
+    """Recompute rating summaries from the ratings collection."""
+    target = f"song {song_id}" if song_id else "all songs"
+    print(f"Rebuilding rating summaries for {target}...")
+
+    settings = Settings()
+    connect(host=settings.MONGO_URI)
+
+    written = RatingRepository().rebuild_summaries(song_id)
+
+    print(f"Successfully rebuilt {written} rating summaries")
+    disconnect()
+
+
+def check_summaries(song_id: Optional[str] = None) -> int:
+    """Report summaries that disagree with the ratings collection.
+
+    Returns:
+        Number of mismatching songs.
+    """
+    target = f"song {song_id}" if song_id else "all songs"
+    print(f"Checking rating summaries for {target}...")
+
+    settings = Settings()
+    connect(host=settings.MONGO_URI)
+
+    mismatches = RatingRepository().check_summaries(song_id)
+    for mismatch in mismatches:
+        print(
+            f"  {mismatch.song_id}: expected {mismatch.expected}, "
+            f"found {mismatch.actual}",
+        )
+
+    print(f"Found {len(mismatches)} inconsistent rating summaries")
+    disconnect()
+    return len(mismatches)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Rebuild or verify rating summaries in MongoDB",
+    )
+    parser.add_argument(
+        "--song-id",
+        default=None,
+        help="Only process this song (default: all songs)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only compare summaries with raw ratings; exit 1 on mismatch",
+    )
+
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(1 if check_summaries(args.song_id) else 0)
+    rebuild_summaries(args.song_id)
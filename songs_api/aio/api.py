@@ -0,0 +1,160 @@
+from typing import Any, AsyncIterator, Dict, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
+from quart import Blueprint, Response, request
+
+from songs_api.aio.client import get_async_db
+from songs_api.aio.services import rating_service, song_service
+from songs_api.api.songs import EXPORT_CHUNK_ROWS, check_song_ids
+from songs_api.schemas.api.rating import (
+    RatingCreateRequest,
+    RatingResponse,
+    RatingStatsResponse,
+)
+from songs_api.schemas.api.song import (
+    AverageDifficultyResponse,
+    DifficultyParams,
+    ExportSongsParams,
+    ListSongsParams,
+    PagedSongsResponse,
+    SearchSongsParams,
+    SongBatchResponse,
+    SongListResponse,
+    SongResponse,
+)
+
+M = TypeVar("M", bound=BaseModel)
+
+songs_bp = Blueprint("songs", __name__, url_prefix="/songs")
+ratings_bp = Blueprint("ratings", __name__)
+health_bp = Blueprint("health", __name__)
+
+
+class RequestValidationError(Exception):
+    """A request's query or body failed validation against its schema."""
+
+    def __init__(self, location: str, error: ValidationError) -> None:
+        super().__init__(str(error))
+        self.location = location
+        self.errors = error.errors(include_url=False, include_context=False)
+
+
+def parse(model: Type[M], data: Any, location: str = "query_params") -> M:
+    """Validate request data the way flask_pydantic does for the sync views."""
+    try:
+        return model.model_validate(data)
+    except ValidationError as e:
+        raise RequestValidationError(location, e) from e
+
+
+def json_response(model: BaseModel, status: int = 200) -> Response:
+    """Render a response model in one pydantic-core call."""
+    return Response(model.model_dump_json(), status=status, mimetype="application/json")
+
+
+@songs_bp.route("", methods=["GET"])
+async def get_songs() -> Response:
+    """A: List songs with offset or cursor pagination, or fetch some by id."""
+    query = parse(ListSongsParams, request.args.to_dict())
+    if query.ids is not None:
+        check_song_ids(query.ids)
+        songs, missing = await song_service.get_songs(query.ids)
+        return json_response(
+            SongBatchResponse(
+                items=[SongResponse.model_construct(**dict(song)) for song in songs],
+                missing=missing,
+            ),
+        )
+
+    page_obj = await song_service.list_songs(
+        page=query.page,
+        size=query.size,
+        cursor=query.cursor,
+    )
+    return json_response(
+        PagedSongsResponse(
+            items=[
+                SongResponse.model_construct(**dict(item)) for item in page_obj.items
+            ],
+            total=page_obj.total,
+            page=page_obj.page,
+            size=page_obj.size,
+            next_cursor=page_obj.next_cursor,
+        ),
+    )
+
+
+@songs_bp.route("/export", methods=["GET"])
+async def export_songs() -> Response:
+    """Stream every song matching the filters as NDJSON, one song per line."""
+    query = parse(ExportSongsParams, request.args.to_dict())
+    songs = song_service.export_songs(
+        level=query.level,
+        released_from=query.released_from,
+        released_to=query.released_to,
+    )
+
+    async def generate() -> AsyncIterator[bytes]:
+        chunk = []
+        async for song in songs:
+            chunk.append(to_json(song))
+            if len(chunk) >= EXPORT_CHUNK_ROWS:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
+
+@songs_bp.route("/difficulty", methods=["GET"])
+async def get_average_difficulty() -> Response:
+    """B: Get average difficulty, optionally filtered by level."""
+    query = parse(DifficultyParams, request.args.to_dict())
+    avg = await song_service.average_difficulty(level=query.level)
+    return json_response(AverageDifficultyResponse(average_difficulty=avg))
+
+
+@songs_bp.route("/search", methods=["GET"])
+async def search_songs() -> Response:
+    """C: Full-text search on artist/title."""
+    query = parse(SearchSongsParams, request.args.to_dict())
+    items = await song_service.search_songs(query.message)
+    return json_response(
+        SongListResponse(
+            songs=[SongResponse.model_construct(**dict(item)) for item in items],
+        ),
+    )
+
+
+@songs_bp.route("/<song_id>", methods=["GET"])
+async def get_song(song_id: str) -> Response:
+    """Get a single song by id."""
+    song = await song_service.get_song(song_id)
+    return json_response(SongResponse.model_construct(**dict(song)))
+
+
+@ratings_bp.route("/ratings", methods=["POST"])
+async def create_rating() -> Response:
+    """D: Add a new rating for a song."""
+    body = parse(RatingCreateRequest, await request.get_json(), "body_params")
+    entity = await rating_service.add_rating(body.song_id, body.rating)
+    return json_response(RatingResponse.model_construct(**dict(entity)))
+
+
+@ratings_bp.route("/ratings/<song_id>/stats", methods=["GET"])
+async def get_rating_stats(song_id: str) -> Response:
+    """E: Retrieve average, lowest, and highest rating for a song."""
+    stats = await rating_service.get_stats(song_id)
+    return json_response(RatingStatsResponse.model_construct(**dict(stats)))
+
+
+@health_bp.route("/health", methods=["GET"])
+async def health_check() -> tuple[Dict[str, str], int]:
+    """Health check endpoint to verify the service and database status."""
+    try:
+        await get_async_db().command("ping")
+        return {"status": "healthy", "database": "connected"}, 200
+    except Exception:
+        return {"status": "unhealthy", "database": "disconnected"}, 503
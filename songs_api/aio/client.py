@@ -0,0 +1,81 @@
+from typing import Any, Dict, Optional
+
+from mongoengine.connection import DEFAULT_DATABASE_NAME
+from pymongo import AsyncMongoClient
+
+from songs_api.config import Settings, settings
+from songs_api.db.client import client_options, connect_db
+from songs_api.db.models.rating import Rating
+from songs_api.db.models.rating_summary import RatingSummary
+from songs_api.db.models.song import Song
+from songs_api.utils.metrics import command_timer
+
+_client: Optional[AsyncMongoClient[Dict[str, Any]]] = None
+_db: Optional[Any] = None
+# Settings the client is opened with, set by the app factory
+_config: Settings = settings
+
+
+def configure_async_db(config: Settings) -> None:
+    """Open the async client with `config` (URI and pool options) on first use.
+
+    Args:
+        config: Settings of the app being created.
+    """
+    global _config  # noqa: PLW0603
+
+    _config = config
+
+
+def get_async_db() -> Any:
+    """Get the database of the async app, connecting on first use.
+
+    The client binds to the running event loop, so this must first be called
+    from within the loop that serves requests.
+    """
+    global _client, _db  # noqa: PLW0603
+
+    if _db is None:
+        _client = AsyncMongoClient(
+            _config.MONGO_URI or None,
+            event_listeners=[command_timer] if _config.METRICS_ENABLED else [],
+            **client_options(_config),
+        )
+        _db = _client.get_default_database(DEFAULT_DATABASE_NAME)
+    return _db
+
+
+def ensure_indexes(config: Settings) -> None:
+    """Build the indexes MongoEngine builds on the sync app's first queries.
+
+    The async repositories read raw collections, so nothing else creates
+    the text index of searches or the unique index of rating summaries.
+    This goes through a sync client and blocks; run it in a thread.
+
+    Args:
+        config: Settings of the app being created.
+    """
+    connect_db(config=config)
+    for document in (Song, Rating, RatingSummary):
+        document.ensure_indexes()
+
+
+def use_async_db(db: Any) -> None:
+    """Serve the async app from another database object, e.g. a test stand-in.
+
+    Args:
+        db: object with the AsyncDatabase API used by the async repositories.
+    """
+    global _db  # noqa: PLW0603
+
+    _db = db
+
+
+async def close_async_db() -> None:
+    """Close the async client, if one was opened."""
+    global _client, _db  # noqa: PLW0603
+
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _db = None
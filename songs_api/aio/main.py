@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from quart import Quart
+
+from songs_api.aio.api import (
+    RequestValidationError,
+    health_bp,
+    ratings_bp,
+    songs_bp,
+)
+from songs_api.aio.client import close_async_db, configure_async_db, ensure_indexes
+from songs_api.aio.services import rating_service, song_service
+from songs_api.config import Settings, settings
+from songs_api.exceptions.custom import BadRequestError, NotFoundError
+from songs_api.utils.shared_cache import open_shared_cache
+from songs_api.utils.versions import configure_versions
+
+Body = Tuple[Dict[str, Any], int]
+
+
+def create_async_app(config: Optional[Settings] = None) -> Quart:
+    """
+    Create the asyncio (ASGI) flavour of the app.
+
+    It serves the same routes, schemas and caches as `create_app`, except
+    for batch rating ingestion (POST /ratings/batch), rating write-behind,
+    ETags and the admin, metrics and profiling endpoints, on top of the
+    async repositories. Run it with an ASGI server, e.g. `uvicorn asgi:app`.
+
+    Args:
+        config: Optional Settings instance to configure the app
+
+    Returns:
+        Quart app instance.
+    """
+    app_config = config or settings
+    app = Quart(__name__)
+
+    app.config["TESTING"] = app_config.TESTING
+    app.config["DEBUG"] = app_config.DEBUG
+
+    if not app.debug:
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        )
+
+    configure_async_db(app_config)
+    shared_cache = open_shared_cache(app_config)
+    if shared_cache is not None:
+        song_service.cache_factory = shared_cache.namespace
+        rating_service.cache_factory = shared_cache.namespace
+    configure_versions(app_config)
+
+    app.register_blueprint(songs_bp)
+    app.register_blueprint(ratings_bp)
+    app.register_blueprint(health_bp)
+    register_error_handlers(app)
+
+    @app.before_serving
+    async def create_indexes() -> None:
+        await asyncio.to_thread(ensure_indexes, app_config)
+
+    @app.after_serving
+    async def close_db() -> None:
+        await close_async_db()
+
+    return app
+
+
+def register_error_handlers(app: Quart) -> None:
+    """Attach the same error responses as the sync app."""
+
+    @app.errorhandler(RequestValidationError)
+    async def handle_request_validation(e: RequestValidationError) -> Body:
+        return {"validation_error": {e.location: e.errors}}, 400
+
+    @app.errorhandler(BadRequestError)
+    async def handle_bad_request(e: BadRequestError) -> Body:
+        return {"error": "Bad Request", "message": str(e)}, 400
+
+    @app.errorhandler(NotFoundError)
+    async def handle_not_found(e: NotFoundError) -> Body:
+        return {"error": "Not Found", "message": str(e)}, 404
+
+    @app.errorhandler(Exception)
+    async def handle_generic(e: Exception) -> Body:
+        return {"error": "Internal Server Error", "message": str(e)}, 500
@@ -0,0 +1,223 @@
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from bson import ObjectId
+
+from songs_api.aio.client import get_async_db
+from songs_api.config import CountStrategy, Settings
+from songs_api.db.client import collection_name
+from songs_api.db.models.rating import Rating
+from songs_api.db.models.rating_summary import RatingSummary
+from songs_api.db.models.song import Song
+from songs_api.db.repositories.rating_repository import summary_changes
+from songs_api.db.repositories.song_repository import SONG_PROJECTION
+from songs_api.db.routing import (
+    RATINGS_STATS,
+    SONGS_COUNT,
+    SONGS_DIFFICULTY,
+    SONGS_EXPORT,
+    SONGS_GET,
+    SONGS_LIST,
+    SONGS_SEARCH,
+    read_preference,
+)
+
+
+def _collection(
+    document: type[Any],
+    operation: Optional[str] = None,
+    config: Optional[Settings] = None,
+) -> Any:
+    collection = get_async_db()[collection_name(document)]
+    if operation is not None:
+        preference = read_preference(operation, config)
+        if preference is not None:
+            collection = collection.with_options(read_preference=preference)
+    return collection
+
+
+@dataclass
+class AsyncSongRepository:
+    """Async counterpart of SongRepository's raw-row reads."""
+
+    settings: Settings = field(default_factory=Settings)
+    # (expires_at, total) for the CACHED count strategy
+    _count_cache: Optional[Tuple[float, int]] = field(
+        default=None,
+        init=False,
+        repr=False,
+    )
+
+    def page_size(self, size: Optional[int] = None) -> int:
+        """Resolve a requested page size against the configured default and max."""
+        size = size or self.settings.PAGE_SIZE_DEFAULT
+        return min(size, self.settings.PAGE_SIZE_MAX)
+
+    async def list_song_rows(
+        self,
+        page: int = 1,
+        size: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return a page of raw projected song rows and total count."""
+        size = self.page_size(size)
+        skip = (page - 1) * size
+
+        cursor = _collection(Song, SONGS_LIST, self.settings).find({}, SONG_PROJECTION)
+        rows = await cursor.sort("_id", 1).skip(skip).limit(size).to_list(None)
+        return rows, await self.count_songs()
+
+    async def list_song_rows_after(
+        self,
+        after: Optional[ObjectId] = None,
+        size: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return the raw song rows following `after` in _id order, and total."""
+        size = self.page_size(size)
+
+        query = {} if after is None else {"_id": {"$gt": after}}
+        cursor = _collection(Song, SONGS_LIST, self.settings).find(
+            query,
+            SONG_PROJECTION,
+        )
+        rows = await cursor.sort("_id", 1).limit(size).to_list(None)
+        return rows, await self.count_songs()
+
+    async def iter_song_rows(
+        self,
+        level: Optional[int] = None,
+        released_from: Optional[date] = None,
+        released_to: Optional[date] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Lazily yield raw projected rows of every song matching the filters."""
+        query: Dict[str, Any] = {}
+        if level is not None:
+            query["level"] = level
+        released: Dict[str, datetime] = {}
+        if released_from is not None:
+            released["$gte"] = datetime.combine(released_from, datetime.min.time())
+        if released_to is not None:
+            released["$lte"] = datetime.combine(released_to, datetime.min.time())
+        if released:
+            query["released"] = released
+
+        cursor = _collection(Song, SONGS_EXPORT, self.settings).find(
+            query,
+            SONG_PROJECTION,
+            batch_size=batch_size,
+        )
+        try:
+            async for row in cursor:
+                yield row
+        finally:
+            await cursor.close()
+
+    async def count_songs(self) -> int:
+        """Count songs using the configured `SONGS_COUNT_STRATEGY`."""
+        strategy = self.settings.SONGS_COUNT_STRATEGY
+        songs = _collection(Song, SONGS_COUNT, self.settings)
+
+        if strategy is CountStrategy.ESTIMATED:
+            return int(await songs.estimated_document_count())
+
+        if strategy is CountStrategy.CACHED:
+            now = time.monotonic()
+            if self._count_cache is None or self._count_cache[0] <= now:
+                expires_at = now + self.settings.SONGS_COUNT_CACHE_TTL
+                total = await songs.count_documents({})
+                self._count_cache = (expires_at, total)
+            return self._count_cache[1]
+
+        return int(await songs.count_documents({}))
+
+    async def average_difficulty(self, level: Optional[int] = None) -> float:
+        """Compute the average difficulty, optionally filtered by level."""
+        pipeline: List[Dict[str, Any]] = []
+
+        if level is not None:
+            pipeline.append({"$match": {"level": level}})
+
+        pipeline.append({"$group": {"_id": None, "avg": {"$avg": "$difficulty"}}})
+
+        songs = _collection(Song, SONGS_DIFFICULTY, self.settings)
+        cursor = await songs.aggregate(pipeline)
+        result = await cursor.to_list(None)
+        if not result or result[0].get("avg") is None:
+            return 0.0
+        return float(result[0]["avg"])
+
+    async def search_song_rows(self, message: str) -> List[Dict[str, Any]]:
+        """Perform case-insensitive text search on artist and title."""
+        query = {"$text": {"$search": message}}
+        songs = _collection(Song, SONGS_SEARCH, self.settings)
+        return list(await songs.find(query, SONG_PROJECTION).to_list(None))
+
+    async def get_song_row(self, song_id: str) -> Dict[str, Any]:
+        """Fetch the raw projected row of one song; raises ValueError if not found."""
+        try:
+            obj_id = ObjectId(song_id)
+        except Exception:
+            raise ValueError(f"Invalid song_id: {song_id}") from None
+
+        songs = _collection(Song, SONGS_GET, self.settings)
+        row = await songs.find_one({"_id": obj_id}, SONG_PROJECTION)
+        if row is None:
+            raise ValueError(f"Song not found: {song_id}")
+        return dict(row)
+
+    async def get_song_rows(
+        self,
+        song_ids: Sequence[ObjectId],
+    ) -> List[Dict[str, Any]]:
+        """Fetch the raw projected rows of many songs with one `$in` query."""
+        query = {"_id": {"$in": list(song_ids)}}
+        songs = _collection(Song, SONGS_GET, self.settings)
+        return list(await songs.find(query, SONG_PROJECTION).to_list(None))
+
+
+@dataclass
+class AsyncRatingRepository:
+    """Async counterpart of RatingRepository's request-path operations."""
+
+    async def add_rating(self, song_id: str, rating_value: int) -> Rating:
+        """
+        Insert a new rating, fold it into the song's summary and return it.
+
+        Raises:
+          ValueError: if `song_id` is invalid.
+        """
+        _check_song_id(song_id)
+
+        rating = Rating(id=ObjectId(), song_id=song_id, rating=rating_value)
+        rating.validate()
+        await _collection(Rating).insert_one(rating.to_mongo())
+        await _collection(RatingSummary).update_one(
+            {"song_id": song_id},
+            summary_changes([rating_value]),
+            upsert=True,
+        )
+        return rating
+
+    async def get_rating_stats(self, song_id: str) -> Tuple[float, int, int]:
+        """
+        Read average, minimum, and maximum rating of a song from its summary.
+
+        Raises:
+          ValueError: if `song_id` is invalid.
+        """
+        _check_song_id(song_id)
+
+        summaries = _collection(RatingSummary, RATINGS_STATS)
+        summary = await summaries.find_one({"song_id": song_id})
+        if summary is None or not summary.get("count"):
+            return 0.0, 0, 0
+        return summary["sum"] / summary["count"], summary["min"], summary["max"]
+
+
+def _check_song_id(song_id: str) -> None:
+    try:
+        ObjectId(song_id)
+    except Exception:
+        raise ValueError(f"Invalid song_id: {song_id}") from None
@@ -0,0 +1,213 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from songs_api.aio.repositories import AsyncRatingRepository, AsyncSongRepository
+from songs_api.config import settings
+from songs_api.exceptions.custom import BadRequestError, NotFoundError
+from songs_api.schemas.entities.rating import RatingEntity, RatingStatsEntity
+from songs_api.schemas.entities.song import SongEntity
+from songs_api.services.rating_service import (
+    STATS_CACHE,
+    ratings_changed,
+    stats_version,
+)
+from songs_api.services.song_service import (
+    DIFFICULTY_CACHE,
+    PAGES_CACHE,
+    SEARCH_CACHE,
+    SONGS_CACHE,
+    catalog_version,
+    found_songs,
+    requested_songs,
+    song_cache_key,
+    song_entity_from_row,
+)
+from songs_api.utils.cache import CacheFactory, memoize, memoize_many
+from songs_api.utils.catalog import normalize_text
+from songs_api.utils.pagination import Page, decode_cursor, encode_cursor
+
+# Cached results share the sync services' namespaces and version stamps, so
+# the same writes and import runs invalidate both.
+
+
+@dataclass
+class AsyncSongService:
+    """Async counterpart of SongService."""
+
+    repo: AsyncSongRepository = field(default_factory=AsyncSongRepository)
+    cache_factory: Optional[CacheFactory] = None
+
+    async def list_songs(
+        self,
+        page: int = 1,
+        size: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[SongEntity]:
+        """
+        Return a paginated list of SongEntity; see SongService.list_songs.
+
+        Raises:
+          BadRequestError: if `cursor` cannot be decoded.
+        """
+        entities, total, next_cursor = await self._load_page(page, size, cursor)
+        return Page[SongEntity](
+            items=entities,
+            total=total,
+            page=page,
+            size=len(entities),
+            next_cursor=next_cursor,
+        )
+
+    @memoize(
+        PAGES_CACHE,
+        ttl=10,
+        maxsize=256,
+        key=lambda page, size, cursor: (page, size, cursor),
+        version=catalog_version,
+    )
+    async def _load_page(
+        self,
+        page: int,
+        size: Optional[int],
+        cursor: Optional[str],
+    ) -> Tuple[List[SongEntity], int, Optional[str]]:
+        """Fetch one page of songs, its total and the cursor of the next one."""
+        if cursor is None:
+            rows, total = await self.repo.list_song_rows(page=page, size=size)
+        else:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError as e:
+                raise BadRequestError(str(e)) from e
+            rows, total = await self.repo.list_song_rows_after(after=after, size=size)
+
+        entities = [song_entity_from_row(row) for row in rows]
+        next_cursor = None
+        if rows and len(rows) == self.repo.page_size(size):
+            next_cursor = encode_cursor(rows[-1]["_id"])
+        return entities, total, next_cursor
+
+    async def export_songs(
+        self,
+        level: Optional[int] = None,
+        released_from: Optional[date] = None,
+        released_to: Optional[date] = None,
+    ) -> AsyncIterator[SongEntity]:
+        """Lazily yield every song matching the filters, as domain entities."""
+        rows = self.repo.iter_song_rows(
+            level=level,
+            released_from=released_from,
+            released_to=released_to,
+            batch_size=settings.SONGS_EXPORT_BATCH_SIZE,
+        )
+        async for row in rows:
+            yield song_entity_from_row(row)
+
+    @memoize(
+        DIFFICULTY_CACHE,
+        ttl=300,
+        maxsize=128,
+        key=lambda level=None: level,
+        version=catalog_version,
+    )
+    async def average_difficulty(self, level: Optional[int] = None) -> float:
+        """Get average difficulty, optionally filtering by level."""
+        return await self.repo.average_difficulty(level=level)
+
+    @memoize(
+        SEARCH_CACHE,
+        ttl=60,
+        maxsize=1024,
+        key=lambda message: normalize_text(message),
+        version=catalog_version,
+    )
+    async def search_songs(self, message: str) -> List[SongEntity]:
+        """Search songs by text, returning domain entities."""
+        rows = await self.repo.search_song_rows(message)
+        return [song_entity_from_row(row) for row in rows]
+
+    @memoize(
+        SONGS_CACHE,
+        ttl=300,
+        maxsize=10_000,
+        key=song_cache_key,
+        version=catalog_version,
+    )
+    async def get_song(self, song_id: str) -> SongEntity:
+        """Fetch a single song entity or raise NotFoundError."""
+        try:
+            row = await self.repo.get_song_row(song_id)
+        except ValueError as e:
+            raise NotFoundError(str(e)) from e
+        return song_entity_from_row(row)
+
+    async def get_songs(
+        self,
+        song_ids: List[str],
+    ) -> Tuple[List[SongEntity], List[str]]:
+        """Fetch many songs at once; see SongService.get_songs."""
+        requested = requested_songs(song_ids)
+        valid = [key for key in requested if isinstance(key, ObjectId)]
+        found = await self._load_songs(valid) if valid else {}
+        return found_songs(requested, found)
+
+    @memoize_many(
+        SONGS_CACHE,
+        ttl=300,
+        maxsize=10_000,
+        key=song_cache_key,
+        version=catalog_version,
+    )
+    async def _load_songs(
+        self,
+        song_ids: List[ObjectId],
+    ) -> Dict[ObjectId, SongEntity]:
+        """Read songs by id; ids without a song are left out."""
+        rows = await self.repo.get_song_rows(song_ids)
+        return {row["_id"]: song_entity_from_row(row) for row in rows}
+
+
+@dataclass
+class AsyncRatingService:
+    """Async counterpart of RatingService, without write-behind or batches."""
+
+    repo: AsyncRatingRepository = field(default_factory=AsyncRatingRepository)
+    cache_factory: Optional[CacheFactory] = None
+
+    async def add_rating(self, song_id: str, rating_value: int) -> RatingEntity:
+        """Add a new rating; raise NotFoundError on invalid song."""
+        try:
+            rating_doc = await self.repo.add_rating(song_id, rating_value)
+        except ValueError as e:
+            raise NotFoundError(str(e)) from e
+        ratings_changed([song_id])
+
+        return RatingEntity(
+            id=str(rating_doc.id),
+            song_id=str(rating_doc.song_id),
+            rating=rating_doc.rating,
+        )
+
+    @memoize(
+        STATS_CACHE,
+        ttl=30,
+        maxsize=10_000,
+        key=lambda song_id: song_id,
+        version=stats_version,
+    )
+    async def get_stats(self, song_id: str) -> RatingStatsEntity:
+        """Fetch rating stats; raise NotFoundError on invalid song."""
+        try:
+            avg, lowest, highest = await self.repo.get_rating_stats(song_id)
+        except ValueError as e:
+            raise NotFoundError(str(e)) from e
+
+        return RatingStatsEntity(average=avg, lowest=lowest, highest=highest)
+
+
+# Module-level singletons
+song_service = AsyncSongService()
+rating_service = AsyncRatingService()
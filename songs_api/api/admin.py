@@ -0,0 +1,27 @@
+from flask import Blueprint, current_app
+from flask_pydantic import validate
+
+from songs_api.db.slow_queries import top_shapes
+from songs_api.schemas.api.admin import (
+    SlowQueriesParams,
+    SlowQueriesResponse,
+    SlowQueryShapeResponse,
+)
+from songs_api.utils.admin import admin_only
+
+admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
+
+
+@admin_bp.route("/slow-queries", methods=["GET"])
+@admin_only
+@validate()
+def get_slow_queries(query: SlowQueriesParams) -> SlowQueriesResponse:
+    """List the slowest MongoDB query shapes of the slow-query log."""
+    shapes = top_shapes(
+        current_app.config["SLOW_QUERY_LOG_PATH"],
+        limit=query.limit,
+        by=query.by.value,
+    )
+    return SlowQueriesResponse(
+        shapes=[SlowQueryShapeResponse.model_validate(shape) for shape in shapes],
+    )
@@ -1,6 +1,7 @@
 from flask import Blueprint, Response, jsonify
 
-from songs_api.db.client import get_db
+from songs_api.db.client import connection_manager, get_db
+from songs_api.db.routing import routing_stats
 
 health_bp = Blueprint("health", __name__)
 
@@ -13,6 +14,16 @@ def health_check() -> tuple[Response, int]:
         # Check MongoDB connection
         db = get_db()
         db.command("ping")
-        return jsonify({"status": "healthy", "database": "connected"}), 200
+        return (
+            jsonify(
+                {
+                    "status": "healthy",
+                    "database": "connected",
+                    "pool": connection_manager.pool_stats(),
+                    "reads": routing_stats(),
+                },
+            ),
+            200,
+        )
     except Exception:
         return jsonify({"status": "unhealthy", "database": "disconnected"}), 503
@@ -0,0 +1,11 @@
+from flask import Blueprint, Response
+
+from songs_api.utils.metrics import render_metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics() -> Response:
+    """Prometheus metrics of the app, summed over workers in multiprocess mode."""
+    return render_metrics()
@@ -1,18 +1,30 @@
-from flask import Blueprint
-from flask_pydantic import validate
+import json
+from typing import Any, Dict, List, Tuple
 
+from flask import Blueprint, request
+from pydantic import ValidationError
+
+from songs_api.config import settings
+from songs_api.exceptions.custom import BadRequestError
 from songs_api.schemas.api.rating import (
+    RatingBatchItemResponse,
+    RatingBatchResponse,
     RatingCreateRequest,
     RatingResponse,
     RatingStatsResponse,
 )
 from songs_api.services.rating_service import rating_service
+from songs_api.utils.conditional import conditional
+from songs_api.utils.tracing import traced_validate
+from songs_api.utils.versions import ratings_scope
 
 ratings_bp = Blueprint("ratings", __name__)
 
+NDJSON_MIMETYPES = frozenset({"application/x-ndjson", "application/jsonl"})
+
 
 @ratings_bp.route("/ratings", methods=["POST"])
-@validate(body=RatingCreateRequest)
+@traced_validate(body=RatingCreateRequest)
 def create_rating(body: RatingCreateRequest) -> RatingResponse:
     """D: Add a new rating for a song."""
     entity = rating_service.add_rating(
@@ -22,9 +34,92 @@ def create_rating(body: RatingCreateRequest) -> RatingResponse:
     return RatingResponse.model_validate(entity.model_dump())
 
 
+@ratings_bp.route("/ratings/batch", methods=["POST"])
+@traced_validate()
+def create_ratings_batch() -> RatingBatchResponse:
+    """Add many ratings from a JSON array or a streamed NDJSON body."""
+    errors: Dict[int, str] = {}
+    valid: List[Tuple[int, RatingCreateRequest]] = []
+    for index, item in enumerate(_read_batch_items()):
+        if isinstance(item, ValueError):
+            errors[index] = "Invalid JSON"
+            continue
+        try:
+            valid.append((index, RatingCreateRequest.model_validate(item)))
+        except ValidationError as e:
+            errors[index] = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc']) or 'item'}: {err['msg']}"
+                for err in e.errors()
+            )
+
+    ids: Dict[int, str] = {}
+    outcomes = rating_service.add_ratings(
+        [(body.song_id, body.rating) for _, body in valid],
+    )
+    for outcome in outcomes:
+        index = valid[outcome.index][0]
+        if outcome.rating is None:
+            errors[index] = outcome.error or "Rating could not be stored"
+        else:
+            ids[index] = outcome.rating.id
+
+    return RatingBatchResponse(
+        inserted=len(ids),
+        failed=sorted(errors),
+        results=[
+            RatingBatchItemResponse(
+                index=index,
+                id=ids.get(index),
+                error=errors.get(index),
+            )
+            for index in range(len(ids) + len(errors))
+        ],
+    )
+
+
 @ratings_bp.route("/ratings/<song_id>/stats", methods=["GET"])
-@validate()
+@conditional(ratings_scope)
+@traced_validate()
 def get_rating_stats(song_id: str) -> RatingStatsResponse:
     """E: Retrieve average, lowest, and highest rating for a song."""
     stats = rating_service.get_stats(song_id)
     return RatingStatsResponse.model_validate(stats.model_dump())
+
+
+def _read_batch_items() -> List[Any]:
+    """
+    Read the raw items of a batch request.
+
+    NDJSON bodies are consumed line by line from the request stream; lines
+    that are not valid JSON are returned as the ValueError they raised, so
+    they can be reported at their index.
+
+    Raises:
+      BadRequestError: if the body is neither a JSON array nor NDJSON, is
+        empty, or has more than RATINGS_BATCH_MAX_ITEMS items.
+    """
+    max_items = settings.RATINGS_BATCH_MAX_ITEMS
+    too_many = BadRequestError(f"A batch holds at most {max_items} ratings")
+
+    items: List[Any] = []
+    if request.mimetype in NDJSON_MIMETYPES:
+        for line in request.stream:
+            if not line.strip():
+                continue
+            if len(items) == max_items:
+                raise too_many
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                items.append(e)
+    else:
+        body = request.get_json(silent=True)
+        if not isinstance(body, list):
+            raise BadRequestError("Expected a JSON array or an NDJSON body")
+        if len(body) > max_items:
+            raise too_many
+        items = body
+
+    if not items:
+        raise BadRequestError("A batch needs at least one rating")
+    return items
@@ -1,40 +1,116 @@
-from flask import Blueprint
-from flask_pydantic import validate
+from typing import Iterator, List, Union
 
+from flask import Blueprint, Response
+from pydantic_core import to_json
+
+from songs_api.config import settings
+from songs_api.exceptions.custom import BadRequestError
 from songs_api.schemas.api.song import (
     AverageDifficultyResponse,
     DifficultyParams,
+    ExportSongsParams,
     ListSongsParams,
     PagedSongsResponse,
     SearchSongsParams,
+    SongBatchResponse,
     SongListResponse,
     SongResponse,
 )
 from songs_api.services.song_service import song_service
+from songs_api.utils.conditional import conditional
+from songs_api.utils.tracing import traced_validate
+from songs_api.utils.versions import SONGS_SCOPE
 
 songs_bp = Blueprint("songs", __name__, url_prefix="/songs")
 
+# Songs encoded per chunk written to the client by GET /songs/export
+EXPORT_CHUNK_ROWS = 500
+
 
 @songs_bp.route("", methods=["GET"])
-@validate(query=ListSongsParams)
-def get_songs(query: ListSongsParams) -> PagedSongsResponse:
-    """A: List songs with pagination."""
+@conditional(lambda: SONGS_SCOPE)
+@traced_validate(query=ListSongsParams)
+def get_songs(
+    query: ListSongsParams,
+) -> Union[PagedSongsResponse, SongBatchResponse]:
+    """A: List songs with offset or cursor pagination, or fetch some by id."""
+    if query.ids is not None:
+        return _get_songs_by_ids(query.ids)
+
     page_obj = song_service.list_songs(
         page=query.page,
         size=query.size,
+        cursor=query.cursor,
     )
-    items = [SongResponse.model_validate(item.model_dump()) for item in page_obj.items]
+    # Entities are already valid; copy their fields without re-validating
+    items = [SongResponse.model_construct(**dict(item)) for item in page_obj.items]
 
     return PagedSongsResponse(
         items=items,
         total=page_obj.total,
         page=page_obj.page,
         size=page_obj.size,
+        next_cursor=page_obj.next_cursor,
     )
 
 
+def check_song_ids(song_ids: List[str]) -> None:
+    """
+    Check a multi-get lists between 1 and SONGS_MULTI_GET_MAX_IDS ids.
+
+    Raises:
+      BadRequestError: if no ids or too many are given.
+    """
+    max_ids = settings.SONGS_MULTI_GET_MAX_IDS
+    if not song_ids:
+        raise BadRequestError("ids must list at least one song id")
+    if len(song_ids) > max_ids:
+        raise BadRequestError(f"At most {max_ids} songs can be fetched at once")
+
+
+def _get_songs_by_ids(song_ids: List[str]) -> SongBatchResponse:
+    """
+    Fetch up to SONGS_MULTI_GET_MAX_IDS songs, in request order.
+
+    Raises:
+      BadRequestError: if no ids or too many are given.
+    """
+    check_song_ids(song_ids)
+    songs, missing = song_service.get_songs(song_ids)
+    return SongBatchResponse(
+        items=[SongResponse.model_construct(**dict(song)) for song in songs],
+        missing=missing,
+    )
+
+
+@songs_bp.route("/export", methods=["GET"])
+@conditional(lambda: SONGS_SCOPE)
+@traced_validate()
+def export_songs(query: ExportSongsParams) -> Response:
+    """Stream every song matching the filters as NDJSON, one song per line."""
+    songs = song_service.export_songs(
+        level=query.level,
+        released_from=query.released_from,
+        released_to=query.released_to,
+    )
+
+    def generate() -> Iterator[bytes]:
+        chunk = []
+        for song in songs:
+            chunk.append(to_json(song))
+            if len(chunk) >= EXPORT_CHUNK_ROWS:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+
+    # The rows come from MongoDB alone, so no request context is needed
+    return Response(generate(), mimetype="application/x-ndjson")
+
+
 @songs_bp.route("/difficulty", methods=["GET"])
-@validate()
+@conditional(lambda: SONGS_SCOPE)
+@traced_validate()
 def get_average_difficulty(
     query: DifficultyParams,
 ) -> AverageDifficultyResponse:
@@ -46,10 +122,20 @@ def get_average_difficulty(
 
 
 @songs_bp.route("/search", methods=["GET"])
-@validate()
+@conditional(lambda: SONGS_SCOPE)
+@traced_validate()
 def search_songs(query: SearchSongsParams) -> SongListResponse:
     """C: Full-text search on artist/title."""
     items = song_service.search_songs(query.message)
     return SongListResponse(
-        songs=[SongResponse.model_validate(item.model_dump()) for item in items],
+        songs=[SongResponse.model_construct(**dict(item)) for item in items],
     )
+
+
+@songs_bp.route("/<song_id>", methods=["GET"])
+@conditional(lambda song_id: SONGS_SCOPE)
+@traced_validate()
+def get_song(song_id: str) -> SongResponse:
+    """Get a single song by id."""
+    song = song_service.get_song(song_id)
+    return SongResponse.model_construct(**dict(song))
@@ -1,5 +1,7 @@
 from enum import Enum
+from typing import Dict, List, Optional
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,10 +11,146 @@ class Environment(str, Enum):
     PRODUCTION = "production"
 
 
+class CountStrategy(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+
+
+class CacheBackendType(str, Enum):
+    LOCAL = "local"
+    SHARED = "shared"
+
+
+class JSONProviderType(str, Enum):
+    FLASK = "flask"
+    PYDANTIC = "pydantic"
+    ORJSON = "orjson"
+
+
+class ReadPreferenceMode(str, Enum):
+    PRIMARY = "primary"
+    PRIMARY_PREFERRED = "primaryPreferred"
+    SECONDARY = "secondary"
+    SECONDARY_PREFERRED = "secondaryPreferred"
+    NEAREST = "nearest"
+
+
+# Smallest maxStalenessSeconds MongoDB accepts
+MIN_MAX_STALENESS_SECONDS = 90
+
+
 class Settings(BaseSettings):
     MONGO_URI: str = ""
+    # MongoClient pool per worker process. Requests wait up to
+    # MONGO_WAIT_QUEUE_TIMEOUT_MS for a free connection once MONGO_MAX_POOL_SIZE
+    # are in use; the socket timeouts are unset (driver default) when None.
+    # MONGO_COMPRESSORS is a comma-separated list, e.g. "zstd,zlib".
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 30_000
+    MONGO_CONNECT_TIMEOUT_MS: int = 20_000
+    MONGO_SOCKET_TIMEOUT_MS: Optional[int] = None
+    MONGO_COMPRESSORS: str = ""
+    # Read preference per repository read, e.g. {"songs.search":
+    # "secondaryPreferred"}; reads not listed use the client's (MONGO_URI).
+    # Non-primary reads skip secondaries lagging more than
+    # READ_MAX_STALENESS_SECONDS behind (at least 90; -1 for no limit).
+    READ_PREFERENCES: Dict[str, ReadPreferenceMode] = {}
+    READ_MAX_STALENESS_SECONDS: int = -1
+    # Prometheus metrics of requests, MongoDB commands, pools and caches at
+    # /metrics; set PROMETHEUS_MULTIPROC_DIR to sum them over processes.
+    METRICS_ENABLED: bool = True
+    # Break each response's time down by layer in a Server-Timing header;
+    # with TRACE_EXPORT_PATH set, also append each request's spans to that
+    # file as JSON lines.
+    TRACING_ENABLED: bool = True
+    TRACE_EXPORT_PATH: str = ""
+    # Log MongoDB commands slower than SLOW_QUERY_THRESHOLD_MS to a rotating
+    # JSON lines file per process (SLOW_QUERY_LOG_PATH.<pid>, default in the
+    # temp directory), explaining a SLOW_QUERY_EXPLAIN_RATE sample of the
+    # slow reads.
+    SLOW_QUERY_LOG: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    SLOW_QUERY_EXPLAIN_RATE: float = 0.1
+    SLOW_QUERY_LOG_PATH: str = ""
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS: int = 3
+    # Secret expected in the X-Admin-Token header of /admin endpoints; they
+    # are not served while empty.
+    ADMIN_TOKEN: str = ""
+    # Profile single requests sent with the admin token and an X-Profile
+    # header (or `_profile` query flag), and one in PROFILE_SAMPLE_EVERY other
+    # requests (0 disables sampling); artifacts are saved to PROFILE_DIR,
+    # default in the temp directory.
+    PROFILE_DIR: str = ""
+    PROFILE_SAMPLE_EVERY: int = 0
+    # Admission control per worker process: at most ADMISSION_MAX_IN_FLIGHT
+    # requests run at once (0 disables the global limit), and at most
+    # ADMISSION_ROUTE_LIMITS[rule] per URL rule, e.g. {"/songs/search": 4}.
+    # Requests over a limit wait up to ADMISSION_MAX_WAIT_MS, at most
+    # ADMISSION_MAX_QUEUE of them, then get a 503 with Retry-After. Reads
+    # can't take the last ADMISSION_WRITE_RESERVE slots; paths starting with
+    # one of ADMISSION_EXEMPT_PATHS are never limited.
+    ADMISSION_MAX_IN_FLIGHT: int = 0
+    ADMISSION_ROUTE_LIMITS: Dict[str, int] = {}
+    ADMISSION_MAX_WAIT_MS: int = 100
+    ADMISSION_MAX_QUEUE: int = 64
+    ADMISSION_WRITE_RESERVE: int = 0
+    ADMISSION_EXEMPT_PATHS: List[str] = ["/health", "/metrics"]
+    ADMISSION_RETRY_AFTER: int = 1
     PAGE_SIZE_DEFAULT: int = 10
     PAGE_SIZE_MAX: int = 100
+    # How GET /songs computes `total`: an exact count, the collection metadata
+    # estimate, or an exact count reused for SONGS_COUNT_CACHE_TTL seconds.
+    SONGS_COUNT_STRATEGY: CountStrategy = CountStrategy.EXACT
+    SONGS_COUNT_CACHE_TTL: float = 30.0
+    # Read song lists and search results as raw pymongo rows mapped straight
+    # to entities, instead of hydrating MongoEngine documents first.
+    SONGS_RAW_READS: bool = False
+    # Memoized service reads; CACHE_TTLS overrides the TTL (seconds) of a
+    # cache namespace, e.g. {"songs.search": 10}
+    CACHE_ENABLED: bool = True
+    CACHE_TTLS: Dict[str, float] = {}
+    # "shared" keeps memoized reads in an mmap'd file that every worker of the
+    # host uses (CACHE_SHARED_PATH, default /dev/shm/songs-api-cache, suffixed
+    # with the geometry), made of CACHE_SHARED_SLOTS slots of
+    # CACHE_SHARED_SLOT_SIZE bytes each.
+    CACHE_BACKEND: CacheBackendType = CacheBackendType.LOCAL
+    CACHE_SHARED_PATH: str = ""
+    CACHE_SHARED_SLOTS: int = 4096
+    CACHE_SHARED_SLOT_SIZE: int = 32768
+    # Rows fetched per MongoDB round trip by GET /songs/export
+    SONGS_EXPORT_BATCH_SIZE: int = 1000
+    # Most ids fetched at once by GET /songs?ids=...
+    SONGS_MULTI_GET_MAX_IDS: int = 100
+    RATINGS_BATCH_MAX_ITEMS: int = 1000
+    # Opt-in write-behind ingestion for POST /ratings: ratings are queued in
+    # memory and inserted in batches of up to RATINGS_BUFFER_BATCH_SIZE, or
+    # every RATINGS_BUFFER_FLUSH_INTERVAL_MS, whichever comes first. A batch
+    # that fails is retried RATINGS_BUFFER_MAX_RETRIES times, waiting
+    # RATINGS_BUFFER_RETRY_BACKOFF_MS and twice as long each next time.
+    RATINGS_WRITE_BEHIND: bool = False
+    RATINGS_BUFFER_MAX_SIZE: int = 10_000
+    RATINGS_BUFFER_BATCH_SIZE: int = 500
+    RATINGS_BUFFER_FLUSH_INTERVAL_MS: int = 50
+    RATINGS_BUFFER_PUT_TIMEOUT_MS: int = 100
+    RATINGS_BUFFER_MAX_RETRIES: int = 3
+    RATINGS_BUFFER_RETRY_BACKOFF_MS: int = 100
+    # Opt-in batching of GET /ratings/<id>/stats reads: stats looked up by
+    # concurrent requests within RATINGS_STATS_BATCH_WINDOW_MS (0 disables)
+    # are read with one query, of at most RATINGS_STATS_BATCH_MAX_KEYS songs.
+    RATINGS_STATS_BATCH_WINDOW_MS: float = 0.0
+    RATINGS_STATS_BATCH_MAX_KEYS: int = 100
+    # Answer GET /songs* and /ratings/<id>/stats with ETags, and If-None-Match
+    # with 304s, from version stamps that writes and the importer bump. The
+    # stamps are then kept in a file every process of the host shares (next
+    # to CACHE_SHARED_PATH), whatever CACHE_BACKEND.
+    ETAGS_ENABLED: bool = False
+    # JSON encoder of responses: Flask's default, pydantic-core, or orjson
+    # (optional dependency; falls back to pydantic-core when not installed)
+    JSON_PROVIDER: JSONProviderType = JSONProviderType.FLASK
     DEBUG: bool = True
     ENVIRONMENT: Environment = Environment.DEVELOPMENT
     TESTING: bool = False
@@ -22,6 +160,16 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
     )
 
+    @field_validator("READ_MAX_STALENESS_SECONDS")
+    @classmethod
+    def check_max_staleness(cls, value: int) -> int:
+        """MongoDB only accepts no limit (-1) or a limit of 90 s or more."""
+        if value != -1 and value < MIN_MAX_STALENESS_SECONDS:
+            raise ValueError(
+                f"must be -1 (no limit) or at least {MIN_MAX_STALENESS_SECONDS}",
+            )
+        return value
+
     @classmethod
     def get_test_settings(cls) -> "Settings":
         """Return settings configured for testing."""
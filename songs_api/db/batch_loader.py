@@ -0,0 +1,112 @@
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class LoaderStats:
+    """Counters describing the loader's batches."""
+
+    batches: int = 0
+    keys_loaded: int = 0
+    last_batch_size: int = 0
+    max_batch_size: int = 0
+
+
+@dataclass
+class _Batch(Generic[K, V]):
+    """Keys collected during one window, and what loading them produced."""
+
+    # Insertion-ordered set of the keys asked for
+    keys: Dict[K, None] = field(default_factory=dict)
+    done: threading.Event = field(default_factory=threading.Event)
+    results: Dict[K, V] = field(default_factory=dict)
+    error: Optional[BaseException] = None
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Collects single-key lookups made by concurrent threads and resolves them
+    with one `load` call per batch, DataLoader-style: the read counterpart
+    of WriteBehindBuffer.
+
+    The first lookup opens a batch and waits up to `window` seconds, or
+    until `max_batch` distinct keys have joined, then calls `load` with all
+    of them and hands every caller its own result. `load` must return a
+    value for each key it is given; if it raises, every caller of the batch
+    gets the error and the next lookup opens a new batch.
+
+    The first caller does the loading itself, so there is no background
+    thread, but a lone lookup still waits a full window.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[List[K]], Dict[K, V]],
+        window: float = 0.002,
+        max_batch: int = 100,
+    ) -> None:
+        self._load = load
+        self.window = window
+        self.max_batch = max_batch
+        self.stats = LoaderStats()
+
+        self._cond = threading.Condition()
+        # Batch still accepting keys, if any
+        self._open: Optional[_Batch[K, V]] = None
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def load(self, key: K) -> V:
+        """Return the value of `key`, loaded in a batch with concurrent lookups."""
+        with self._cond:
+            batch = self._open
+            leader = batch is None
+            if batch is None:
+                batch = self._open = _Batch()
+            batch.keys[key] = None
+            if len(batch.keys) >= self.max_batch:
+                # Full: close it to new keys and wake its leader
+                self._open = None
+                self._cond.notify_all()
+
+        if leader:
+            self._dispatch(batch)
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the batch counters."""
+        with self._cond:
+            return asdict(self.stats)
+
+    def _dispatch(self, batch: _Batch[K, V]) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: self._open is not batch, timeout=self.window)
+            if self._open is batch:
+                self._open = None
+            keys = list(batch.keys)
+            self.stats.batches += 1
+            self.stats.keys_loaded += len(keys)
+            self.stats.last_batch_size = len(keys)
+            self.stats.max_batch_size = max(self.stats.max_batch_size, len(keys))
+
+        try:
+            batch.results = self._load(keys)
+        except BaseException as e:
+            batch.error = e
+        finally:
+            batch.done.set()
+
+    def _after_fork(self) -> None:
+        # A batch open in the parent is the parent's to load, and its lock may
+        # have been held by a thread that does not exist here.
+        self._cond = threading.Condition()
+        self._open = None
@@ -1,19 +1,121 @@
-from functools import lru_cache
-from typing import Optional
+import os
+import threading
+from typing import Any, Dict, List, Optional
 
 import mongoengine
+from mongoengine import connection as mongoengine_connection
+from mongoengine.base.common import _get_documents_by_db
+from mongoengine.connection import DEFAULT_CONNECTION_NAME
+from pymongo.collection import Collection
 
-from songs_api.config import settings
+from songs_api.config import Settings, settings
+from songs_api.db.pool import PoolMonitor
+from songs_api.db.slow_queries import SlowQueryLog
+from songs_api.utils.metrics import command_timer
 
 
-@lru_cache(maxsize=1)
-def connect_db(alias: str = "default") -> None:
-    """Connect to MongoDB using MongoEngine.
+def client_options(config: Settings) -> Dict[str, Any]:
+    """MongoClient keyword arguments for the pool settings of `config`."""
+    options: Dict[str, Any] = {
+        "maxPoolSize": config.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": config.MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": config.MONGO_CONNECT_TIMEOUT_MS,
+    }
+    if config.MONGO_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options["waitQueueTimeoutMS"] = config.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    if config.MONGO_SOCKET_TIMEOUT_MS is not None:
+        options["socketTimeoutMS"] = config.MONGO_SOCKET_TIMEOUT_MS
+    if config.MONGO_COMPRESSORS:
+        options["compressors"] = config.MONGO_COMPRESSORS
+    return options
+
+
+class ConnectionManager:
+    """
+    Registers MongoEngine connections whose MongoClients are created lazily.
+
+    MongoEngine builds a client the first time an alias is used, so an app
+    created before gunicorn forks (--preload) gets a client per worker. A
+    client that was still opened before the fork is dropped in the child
+    without closing it, since its sockets and monitor threads belong to the
+    parent; the next query then opens a fresh one.
+    """
+
+    def __init__(self) -> None:
+        self.monitor: Optional[PoolMonitor] = None
+        self.slow_queries: Optional[SlowQueryLog] = None
+        self._aliases: Dict[str, Settings] = {}
+        self._lock = threading.Lock()
+        os.register_at_fork(after_in_child=self.reset)
+
+    def connect(
+        self,
+        alias: str = "default",
+        config: Optional[Settings] = None,
+    ) -> None:
+        """Register `alias` once; no connection is made until it is used."""
+        config = config or settings
+        with self._lock:
+            if alias in self._aliases:
+                return
+            if self.monitor is None:
+                self.monitor = PoolMonitor(config.MONGO_MAX_POOL_SIZE)
+            listeners: List[Any] = [self.monitor]
+            if config.METRICS_ENABLED:
+                listeners.append(command_timer)
+            if config.SLOW_QUERY_LOG:
+                if self.slow_queries is None:
+                    self.slow_queries = SlowQueryLog.from_settings(
+                        config,
+                        client=lambda: mongoengine_connection.get_connection(alias),
+                    )
+                listeners.append(self.slow_queries)
+
+            mongoengine_connection.register_connection(
+                alias,
+                host=config.MONGO_URI,
+                event_listeners=listeners,
+                **client_options(config),
+            )
+            self._aliases[alias] = config
+
+    def disconnect(self, alias: Optional[str] = None) -> None:
+        """Close the client of `alias`, or of every alias when None."""
+        with self._lock:
+            aliases = list(self._aliases) if alias is None else [alias]
+            for name in aliases:
+                self._aliases.pop(name, None)
+                mongoengine.disconnect(alias=name)
+
+    def reset(self) -> None:
+        """Forget clients opened by a parent process; settings stay registered."""
+        self._lock = threading.Lock()
+        connections = mongoengine_connection._connections  # noqa: SLF001
+        dbs = mongoengine_connection._dbs  # noqa: SLF001
+        for alias in self._aliases:
+            connections.pop(alias, None)
+            if dbs.pop(alias, None) is not None:
+                for document in _get_documents_by_db(alias, DEFAULT_CONNECTION_NAME):
+                    if issubclass(document, mongoengine.Document):
+                        document._disconnect()  # noqa: SLF001
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Checkout waits and utilization of this process's pools."""
+        return {} if self.monitor is None else self.monitor.snapshot()
+
+
+connection_manager = ConnectionManager()
+
+
+def connect_db(alias: str = "default", config: Optional[Settings] = None) -> None:
+    """Register the MongoDB connection; the client is opened on first use.
 
     Args:
         alias: Database connection alias. Default is 'default'.
+        config: Settings with the URI and pool options. Default is `settings`.
     """
-    mongoengine.connect(host=settings.MONGO_URI, alias=alias)
+    connection_manager.connect(alias=alias, config=config)
 
 
 def disconnect_db(alias: Optional[str] = None) -> None:
@@ -22,7 +124,7 @@ def disconnect_db(alias: Optional[str] = None) -> None:
     Args:
         alias: Database connection alias. If None, disconnects all connections.
     """
-    mongoengine.disconnect(alias=alias)
+    connection_manager.disconnect(alias=alias)
 
 
 def get_db(alias: str = "default") -> mongoengine.Document:
@@ -32,3 +134,21 @@ def get_db(alias: str = "default") -> mongoengine.Document:
         alias: Database connection alias. Default is 'default'.
     """
     return mongoengine.connection.get_db(alias=alias)
+
+
+def get_collection(document: type[mongoengine.Document]) -> Collection[Dict[str, Any]]:
+    """Get the raw pymongo collection behind a MongoEngine document class.
+
+    Args:
+        document: MongoEngine document class, e.g. `Song`.
+    """
+    return document._get_collection()  # noqa: SLF001
+
+
+def collection_name(document: type[mongoengine.Document]) -> str:
+    """Get the name of the collection behind a MongoEngine document class.
+
+    Args:
+        document: MongoEngine document class, e.g. `Song`.
+    """
+    return str(document._get_collection_name())  # noqa: SLF001
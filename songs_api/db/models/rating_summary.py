@@ -0,0 +1,17 @@
+from typing import ClassVar
+
+from mongoengine import Document, IntField, StringField
+
+
+class RatingSummary(Document):
+    """Running count/sum/min/max of a song's ratings, kept in step with `ratings`."""
+
+    song_id = StringField(required=True, unique=True)
+    count = IntField(required=True, min_value=0)
+    rating_sum = IntField(required=True, min_value=0, db_field="sum")
+    lowest = IntField(required=True, min_value=1, max_value=5, db_field="min")
+    highest = IntField(required=True, min_value=1, max_value=5, db_field="max")
+
+    meta: ClassVar = {
+        "collection": "rating_summaries",
+    }
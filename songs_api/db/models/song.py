@@ -1,6 +1,15 @@
-from typing import ClassVar
+import logging
+from typing import Any, ClassVar, Dict, List
 
 from mongoengine import DateField, Document, FloatField, IntField, StringField
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+logger = logging.getLogger(__name__)
+
+NATURAL_KEY_INDEX = "natural_key_1"
+# Most natural keys listed when reporting songs that share one
+DUPLICATES_REPORTED = 20
 
 
 class Song(Document):
@@ -11,6 +20,9 @@ class Song(Document):
     difficulty = FloatField(min_value=0, required=True)
     level = IntField(min_value=1, required=True)
     released = DateField(required=True)
+    # Set by the importer: identity across reloads, and a digest of the fields
+    natural_key = StringField()
+    content_hash = StringField()
 
     meta: ClassVar = {
         "collection": "songs",
@@ -20,5 +32,55 @@ class Song(Document):
                 "default_language": "english",
             },  # full-text search
             {"fields": ["level"]},  # filter by level
+            {"fields": ["released"]},  # export by release range
+            # Catalog sync lookups and upserts; keep it last (see ensure_indexes)
+            {"fields": ["natural_key"], "unique": True, "sparse": True},
         ],
     }
+
+    @classmethod
+    def ensure_indexes(cls) -> None:
+        """
+        Create the indexes, replacing a natural_key index built before it
+        was unique.
+
+        The unique index can't be built while songs share a natural key:
+        those are logged, and a non-unique index kept, until they're merged.
+        """
+        collection = cls._get_db()[cls._get_collection_name()]
+        try:
+            super().ensure_indexes()
+            return
+        except OperationFailure as e:
+            index = collection.index_information().get(NATURAL_KEY_INDEX)
+            outdated = index is not None and not index.get("unique")
+            if not isinstance(e, DuplicateKeyError) and not outdated:
+                raise
+
+        duplicates = _duplicate_natural_keys(collection)
+        if duplicates:
+            logger.error(
+                "Songs share natural keys, so natural_key is not unique until "
+                "they are merged: %s",
+                duplicates,
+            )
+            collection.create_index("natural_key", name=NATURAL_KEY_INDEX)
+            return
+        collection.drop_index(NATURAL_KEY_INDEX)
+        super().ensure_indexes()
+
+
+def _duplicate_natural_keys(
+    collection: Collection[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Return natural keys shared by several songs, with the songs' ids."""
+    return list(
+        collection.aggregate(
+            [
+                {"$match": {"natural_key": {"$type": "string"}}},
+                {"$group": {"_id": "$natural_key", "ids": {"$push": "$_id"}}},
+                {"$match": {"ids.1": {"$exists": True}}},
+                {"$limit": DUPLICATES_REPORTED},
+            ],
+        ),
+    )
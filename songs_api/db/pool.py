@@ -0,0 +1,143 @@
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from pymongo.monitoring import (
+    ConnectionCheckedInEvent,
+    ConnectionCheckedOutEvent,
+    ConnectionCheckOutFailedEvent,
+    ConnectionCheckOutFailedReason,
+    ConnectionCheckOutStartedEvent,
+    ConnectionClosedEvent,
+    ConnectionCreatedEvent,
+    ConnectionPoolListener,
+    ConnectionReadyEvent,
+    PoolClearedEvent,
+    PoolClosedEvent,
+    PoolCreatedEvent,
+    PoolReadyEvent,
+)
+
+from songs_api.utils.metrics import (
+    MONGO_POOL_IN_USE,
+    MONGO_POOL_TIMEOUTS,
+    MONGO_POOL_WAIT,
+)
+
+
+@dataclass
+class PoolStats:
+    """Connection pool counters of this process, summed over all servers."""
+
+    checkouts: int = 0
+    checkout_failures: int = 0
+    # Failures because no connection freed up within waitQueueTimeoutMS
+    checkout_timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    in_use: int = 0
+    in_use_max: int = 0
+    open_connections: int = 0
+    pool_clears: int = 0
+
+
+class PoolMonitor(ConnectionPoolListener):
+    """
+    Records how long requests wait to check out a pooled connection and how
+    many connections are in use, to size gunicorn workers against
+    `MONGO_MAX_POOL_SIZE`.
+
+    Counters are per process and start over in forked children; the same
+    events also feed the Prometheus pool metrics.
+    """
+
+    def __init__(self, max_pool_size: int) -> None:
+        self.max_pool_size = max_pool_size
+        self.stats = PoolStats()
+        self._lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters plus average wait and current utilization."""
+        with self._lock:
+            stats = asdict(self.stats)
+        waits = stats["checkouts"] + stats["checkout_failures"]
+        stats["wait_seconds_avg"] = (
+            stats["wait_seconds_total"] / waits if waits else 0.0
+        )
+        stats["max_pool_size"] = self.max_pool_size
+        stats["utilization"] = (
+            stats["in_use"] / self.max_pool_size if self.max_pool_size else 0.0
+        )
+        return stats
+
+    def connection_checked_out(self, event: ConnectionCheckedOutEvent) -> None:
+        """Count a checkout and how long it waited for a connection."""
+        with self._lock:
+            self.stats.checkouts += 1
+            self._waited(event.duration)
+            self.stats.in_use += 1
+            self.stats.in_use_max = max(self.stats.in_use_max, self.stats.in_use)
+        MONGO_POOL_IN_USE.inc()
+
+    def connection_check_out_failed(
+        self,
+        event: ConnectionCheckOutFailedEvent,
+    ) -> None:
+        """Count a failed checkout, telling pool timeouts apart."""
+        with self._lock:
+            self.stats.checkout_failures += 1
+            if event.reason == ConnectionCheckOutFailedReason.TIMEOUT:
+                self.stats.checkout_timeouts += 1
+                MONGO_POOL_TIMEOUTS.inc()
+            self._waited(event.duration)
+
+    def connection_checked_in(self, event: ConnectionCheckedInEvent) -> None:
+        """Count a connection going back to the pool."""
+        with self._lock:
+            self.stats.in_use = max(self.stats.in_use - 1, 0)
+        MONGO_POOL_IN_USE.dec()
+
+    def connection_created(self, event: ConnectionCreatedEvent) -> None:
+        """Count a new pooled connection."""
+        with self._lock:
+            self.stats.open_connections += 1
+
+    def connection_closed(self, event: ConnectionClosedEvent) -> None:
+        """Count a pooled connection going away."""
+        with self._lock:
+            self.stats.open_connections = max(self.stats.open_connections - 1, 0)
+
+    def pool_cleared(self, event: PoolClearedEvent) -> None:
+        """Count a pool reset, e.g. after a network error or failover."""
+        with self._lock:
+            self.stats.pool_clears += 1
+
+    def connection_check_out_started(
+        self,
+        event: ConnectionCheckOutStartedEvent,
+    ) -> None:
+        """Ignored; the checkout events carry the wait."""
+
+    def connection_ready(self, event: ConnectionReadyEvent) -> None:
+        """Ignored."""
+
+    def pool_created(self, event: PoolCreatedEvent) -> None:
+        """Ignored."""
+
+    def pool_ready(self, event: PoolReadyEvent) -> None:
+        """Ignored."""
+
+    def pool_closed(self, event: PoolClosedEvent) -> None:
+        """Ignored."""
+
+    def _waited(self, seconds: Optional[float]) -> None:
+        seconds = seconds or 0.0
+        self.stats.wait_seconds_total += seconds
+        self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, seconds)
+        MONGO_POOL_WAIT.observe(seconds)
+
+    def _after_fork(self) -> None:
+        self.stats = PoolStats()
+        self._lock = threading.Lock()
@@ -1,18 +1,90 @@
-from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 from bson import ObjectId
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
 
+from songs_api.config import Settings
+from songs_api.db.batch_loader import BatchLoader
+from songs_api.db.client import get_collection
 from songs_api.db.models.rating import Rating
+from songs_api.db.models.rating_summary import RatingSummary
+from songs_api.db.routing import RATINGS_STATS, route_queryset
+from songs_api.utils.tracing import DB, traced
+
+# Number of summaries written per bulk_write during a rebuild
+REBUILD_BATCH_SIZE = 1000
+# MongoDB's duplicate key error code
+DUPLICATE_KEY = 11000
+
+# (average, lowest, highest) rating of a song
+RatingStats = Tuple[float, int, int]
+NO_RATINGS: RatingStats = (0.0, 0, 0)
+
+
+@dataclass
+class SummaryMismatch:
+    """A song whose stored summary disagrees with its raw ratings."""
+
+    song_id: str
+    expected: Optional[Dict[str, Any]]
+    actual: Optional[Dict[str, Any]]
+
+
+def summary_changes(ratings: Sequence[int]) -> Dict[str, Any]:
+    """Build the update document that folds `ratings` into a rating summary."""
+    return {
+        "$inc": {"count": len(ratings), "sum": sum(ratings)},
+        "$min": {"min": min(ratings)},
+        "$max": {"max": max(ratings)},
+    }
 
 
 @dataclass
 class RatingRepository:
     """Handles persistence of ratings and computing statistics."""
 
+    # Set by `enable_stats_batching`; None means one query per stats lookup
+    stats_loader: Optional[BatchLoader[str, RatingStats]] = field(
+        default=None,
+        repr=False,
+    )
+
+    def enable_stats_batching(self, config: Settings) -> None:
+        """
+        Read the stats of songs looked up concurrently with one query per
+        batch, collected over RATINGS_STATS_BATCH_WINDOW_MS.
+        """
+        if self.stats_loader is not None:
+            return
+
+        self.stats_loader = BatchLoader(
+            load=self.get_rating_stats_many,
+            window=config.RATINGS_STATS_BATCH_WINDOW_MS / 1000,
+            max_batch=config.RATINGS_STATS_BATCH_MAX_KEYS,
+        )
+
+    def build_rating(self, song_id: str, rating_value: int) -> Rating:
+        """
+        Return an unsaved Rating document with its id already assigned.
+
+        Raises:
+          ValueError: if `song_id` is invalid.
+        """
+        try:
+            ObjectId(song_id)
+        except Exception:
+            raise ValueError(f"Invalid song_id: {song_id}") from None
+
+        return Rating(id=ObjectId(), song_id=song_id, rating=rating_value)
+
+    @traced(DB)
     def add_rating(self, song_id: str, rating_value: int) -> Rating:
         """
-        Insert a new Rating document and return it.
+        Insert a new Rating document, fold it into the song's summary and
+        return it.
 
         Raises:
           ValueError: if `song_id` is invalid.
@@ -24,11 +96,66 @@ class RatingRepository:
 
         rating = Rating(song_id=song_id, rating=rating_value)
         rating.save()
+        get_collection(RatingSummary).update_one(
+            {"song_id": song_id},
+            summary_changes([rating_value]),
+            upsert=True,
+        )
         return rating
 
-    def get_rating_stats(self, song_id: str) -> Tuple[float, int, int]:
+    @traced(DB)
+    def insert_ratings(self, ratings: Sequence[Rating]) -> List[int]:
+        """
+        Insert many Rating documents in one unordered round trip, then fold
+        the inserted ones into their summaries with one upsert per song.
+
+        Ratings carry their `_id` from `build_rating`, so inserting a batch
+        again is safe: documents already there fail with a duplicate key and
+        count as written. An earlier attempt may or may not have folded them,
+        so the summaries of their songs are recomputed from the raw ratings
+        instead.
+
+        Returns:
+          Indexes into `ratings` of the documents that were not inserted.
+        """
+        if not ratings:
+            return []
+
+        failed: Set[int] = set()
+        duplicates: Set[int] = set()
+        try:
+            get_collection(Rating).insert_many(
+                [rating.to_mongo() for rating in ratings],
+                ordered=False,
+            )
+        except BulkWriteError as e:
+            for error in e.details["writeErrors"]:
+                is_duplicate = error.get("code") == DUPLICATE_KEY
+                (duplicates if is_duplicate else failed).add(error["index"])
+
+        rebuilt = {ratings[index].song_id for index in duplicates}
+        by_song: Dict[str, List[int]] = defaultdict(list)
+        for index, rating in enumerate(ratings):
+            if index not in failed and rating.song_id not in rebuilt:
+                by_song[rating.song_id].append(rating.rating)
+
+        if rebuilt:
+            self._rebuild({"song_id": {"$in": sorted(rebuilt)}})
+        if by_song:
+            get_collection(RatingSummary).bulk_write(
+                [
+                    UpdateOne({"song_id": song}, summary_changes(values), upsert=True)
+                    for song, values in by_song.items()
+                ],
+                ordered=False,
+            )
+        return sorted(failed)
+
+    @traced(DB)
+    def get_rating_stats(self, song_id: str) -> RatingStats:
         """
-        Compute average, minimum, and maximum rating for a given song.
+        Read average, minimum, and maximum rating for a given song from its
+        summary document, batched with concurrent lookups when enabled.
 
         Raises:
           ValueError: if `song_id` is invalid.
@@ -41,21 +168,137 @@ class RatingRepository:
         except Exception:
             raise ValueError(f"Invalid song_id: {song_id}") from None
 
-        pipeline: List[Dict[str, Any]] = [
-            {"$match": {"song_id": song_id}},
+        if self.stats_loader is not None:
+            return self.stats_loader.load(song_id)
+
+        queryset = route_queryset(RatingSummary.objects, RATINGS_STATS)
+        summary = queryset(song_id=song_id).first()
+        if summary is None or not summary.count:
+            return NO_RATINGS
+        return summary.rating_sum / summary.count, summary.lowest, summary.highest
+
+    @traced(DB)
+    def get_rating_stats_many(self, song_ids: List[str]) -> Dict[str, RatingStats]:
+        """
+        Read the stats of many songs with one `$in` query on their summaries.
+
+        Returns:
+          (average, lowest, highest) per song id; (0.0, 0, 0) for songs
+          without ratings.
+        """
+        stats = dict.fromkeys(song_ids, NO_RATINGS)
+        queryset = route_queryset(RatingSummary.objects, RATINGS_STATS)
+        for summary in queryset(song_id__in=song_ids):
+            if summary.count:
+                stats[summary.song_id] = (
+                    summary.rating_sum / summary.count,
+                    summary.lowest,
+                    summary.highest,
+                )
+        return stats
+
+    def rebuild_summaries(self, song_id: Optional[str] = None) -> int:
+        """
+        Recompute rating summaries from the raw `ratings` collection.
+
+        Summaries of songs that no longer have any rating are removed.
+
+        Args:
+          song_id: rebuild only this song's summary; all songs if None
+
+        Returns:
+          Number of summaries written.
+        """
+        return self._rebuild({} if song_id is None else {"song_id": song_id})
+
+    def _rebuild(self, query: Dict[str, Any]) -> int:
+        """Recompute the summaries of the songs matching `query`."""
+        collection = get_collection(RatingSummary)
+        seen: set[str] = set()
+        batch: List[ReplaceOne[Dict[str, Any]]] = []
+        written = 0
+
+        for expected in self._aggregate_summaries(query):
+            seen.add(expected["song_id"])
+            batch.append(
+                ReplaceOne({"song_id": expected["song_id"]}, expected, upsert=True),
+            )
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                written += len(batch)
+                collection.bulk_write(batch, ordered=False)
+                batch = []
+
+        if batch:
+            written += len(batch)
+            collection.bulk_write(batch, ordered=False)
+
+        # Drop summaries whose ratings are all gone
+        orphans = [
+            doc["song_id"]
+            for doc in collection.find(query, {"song_id": 1})
+            if doc["song_id"] not in seen
+        ]
+        if orphans:
+            collection.delete_many({"song_id": {"$in": orphans}})
+        return written
+
+    def check_summaries(self, song_id: Optional[str] = None) -> List[SummaryMismatch]:
+        """
+        Compare stored summaries against the raw `ratings` collection.
+
+        Args:
+          song_id: check only this song; all songs if None
+
+        Returns:
+          One SummaryMismatch per song whose summary is missing, stale, or
+          has no ratings behind it.
+        """
+        query: Dict[str, Any] = {} if song_id is None else {"song_id": song_id}
+        actual = {
+            doc["song_id"]: doc
+            for doc in get_collection(RatingSummary).find(query, {"_id": 0})
+        }
+
+        mismatches: List[SummaryMismatch] = []
+        for expected in self._aggregate_summaries(query):
+            stored = actual.pop(expected["song_id"], None)
+            if stored != expected:
+                mismatches.append(
+                    SummaryMismatch(expected["song_id"], expected, stored),
+                )
+        mismatches.extend(
+            SummaryMismatch(orphan, None, stored) for orphan, stored in actual.items()
+        )
+        return mismatches
+
+    def _aggregate_summaries(
+        self,
+        query: Dict[str, Any],
+    ) -> Iterable[Dict[str, Any]]:
+        """
+        Yield summaries computed from the raw ratings matching `query`,
+        shaped like stored ones.
+        """
+        pipeline: List[Dict[str, Any]] = []
+        if query:
+            pipeline.append({"$match": query})
+        pipeline.append(
             {
                 "$group": {
-                    "_id": None,
-                    "avg": {"$avg": "$rating"},
+                    "_id": "$song_id",
+                    "count": {"$sum": 1},
+                    "sum": {"$sum": "$rating"},
                     "min": {"$min": "$rating"},
                     "max": {"$max": "$rating"},
                 },
             },
-        ]
-        result = Rating.objects.aggregate(*pipeline)
+        )
 
-        try:
-            stats = next(result)
-            return stats.get("avg", 0.0), stats.get("min", 0), stats.get("max", 0)
-        except StopIteration:
-            return 0.0, 0, 0
+        for row in Rating.objects.aggregate(*pipeline, allowDiskUse=True):
+            yield {
+                "song_id": row["_id"],
+                "count": row["count"],
+                "sum": row["sum"],
+                "min": row["min"],
+                "max": row["max"],
+            }
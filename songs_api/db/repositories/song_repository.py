@@ -1,16 +1,45 @@
+import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from bson import ObjectId
 
-from songs_api.config import Settings
+from songs_api.config import CountStrategy, Settings
+from songs_api.db.client import get_collection
 from songs_api.db.models.song import Song
+from songs_api.db.routing import (
+    SONGS_COUNT,
+    SONGS_DIFFICULTY,
+    SONGS_EXPORT,
+    SONGS_GET,
+    SONGS_LIST,
+    SONGS_SEARCH,
+    route_collection,
+    route_queryset,
+)
+from songs_api.utils.tracing import DB, traced
+
+# Fields read by the raw-row methods: everything a SongEntity needs
+SONG_PROJECTION = {"artist": 1, "title": 1, "difficulty": 1, "level": 1, "released": 1}
 
 
 @dataclass
 class SongRepository:
     settings: Settings = field(default_factory=Settings)
+    # (expires_at, total) for the CACHED count strategy
+    _count_cache: Optional[Tuple[float, int]] = field(
+        default=None,
+        init=False,
+        repr=False,
+    )
+
+    def page_size(self, size: Optional[int] = None) -> int:
+        """Resolve a requested page size against the configured default and max."""
+        size = size or self.settings.PAGE_SIZE_DEFAULT
+        return min(size, self.settings.PAGE_SIZE_MAX)
 
+    @traced(DB)
     def list_songs(
         self,
         page: int = 1,
@@ -24,14 +53,141 @@ class SongRepository:
           size: number of items per page
         """
         # Enforce max page size
-        size = size or self.settings.PAGE_SIZE_DEFAULT
-        size = min(size, self.settings.PAGE_SIZE_MAX)
+        size = self.page_size(size)
+        skip = (page - 1) * size
+
+        # Sort on _id so offset pages line up with keyset (cursor) pages
+        queryset = route_queryset(Song.objects, SONGS_LIST, self.settings)
+        songs = queryset.order_by("id").skip(skip).limit(size)
+        return list(songs), self.count_songs()
+
+    @traced(DB)
+    def list_songs_after(
+        self,
+        after: Optional[ObjectId] = None,
+        size: Optional[int] = None,
+    ) -> tuple[List[Song], int]:
+        """
+        Return the songs following `after` in _id order, and total count.
+
+        Unlike `list_songs`, this walks the _id index from the last seen key,
+        so deep pages cost the same as the first one.
+
+        Args:
+          after: _id of the last song of the previous page; None to start
+          size: number of items per page
+        """
+        size = self.page_size(size)
+
+        queryset = route_queryset(Song.objects, SONGS_LIST, self.settings)
+        if after is not None:
+            queryset = queryset(id__gt=after)
+
+        songs = queryset.order_by("id").limit(size)
+        return list(songs), self.count_songs()
+
+    @traced(DB)
+    def list_song_rows(
+        self,
+        page: int = 1,
+        size: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Same as `list_songs`, but return raw projected rows instead of Song
+        documents, skipping MongoEngine hydration.
+        """
+        size = self.page_size(size)
         skip = (page - 1) * size
 
-        songs = Song.objects.skip(skip).limit(size)
-        total = Song.objects.count()
-        return list(songs), total
+        collection = route_collection(get_collection(Song), SONGS_LIST, self.settings)
+        cursor = collection.find({}, SONG_PROJECTION)
+        rows = list(cursor.sort("_id", 1).skip(skip).limit(size))
+        return rows, self.count_songs()
 
+    @traced(DB)
+    def list_song_rows_after(
+        self,
+        after: Optional[ObjectId] = None,
+        size: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Same as `list_songs_after`, but return raw projected rows."""
+        size = self.page_size(size)
+
+        query = {} if after is None else {"_id": {"$gt": after}}
+        collection = route_collection(get_collection(Song), SONGS_LIST, self.settings)
+        cursor = collection.find(query, SONG_PROJECTION)
+        rows = list(cursor.sort("_id", 1).limit(size))
+        return rows, self.count_songs()
+
+    def iter_song_rows(
+        self,
+        level: Optional[int] = None,
+        released_from: Optional[date] = None,
+        released_to: Optional[date] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield raw projected rows of every song matching the filters.
+
+        Rows come from one server-side cursor fetching `batch_size` rows per
+        round trip, so memory stays flat whatever the catalog size.
+
+        Args:
+          level: only songs of this level
+          released_from: only songs released on or after this date
+          released_to: only songs released on or before this date
+          batch_size: rows per cursor batch
+        """
+        query: Dict[str, Any] = {}
+        if level is not None:
+            query["level"] = level
+        released: Dict[str, datetime] = {}
+        if released_from is not None:
+            released["$gte"] = datetime.combine(released_from, datetime.min.time())
+        if released_to is not None:
+            released["$lte"] = datetime.combine(released_to, datetime.min.time())
+        if released:
+            query["released"] = released
+
+        collection = route_collection(get_collection(Song), SONGS_EXPORT, self.settings)
+        cursor = collection.find(
+            query,
+            SONG_PROJECTION,
+            batch_size=batch_size,
+        )
+        try:
+            yield from cursor
+        finally:
+            # Release the server-side cursor if the client goes away early
+            cursor.close()
+
+    @traced(DB)
+    def count_songs(self) -> int:
+        """Count songs using the configured `SONGS_COUNT_STRATEGY`."""
+        strategy = self.settings.SONGS_COUNT_STRATEGY
+
+        if strategy is CountStrategy.ESTIMATED:
+            # Reads collection metadata instead of scanning the index
+            collection = route_collection(
+                get_collection(Song),
+                SONGS_COUNT,
+                self.settings,
+            )
+            return int(collection.estimated_document_count())
+
+        if strategy is CountStrategy.CACHED:
+            now = time.monotonic()
+            if self._count_cache is None or self._count_cache[0] <= now:
+                expires_at = now + self.settings.SONGS_COUNT_CACHE_TTL
+                self._count_cache = (expires_at, self._count_exact())
+            return self._count_cache[1]
+
+        return self._count_exact()
+
+    def _count_exact(self) -> int:
+        return int(route_queryset(Song.objects, SONGS_COUNT, self.settings).count())
+
+    @traced(DB)
     def average_difficulty(self, level: Optional[int] = None) -> float:
         """Compute the average difficulty, optionally filtered by level."""
         pipeline: List[Dict[str, Any]] = []
@@ -41,7 +197,8 @@ class SongRepository:
 
         pipeline.append({"$group": {"_id": None, "avg": {"$avg": "$difficulty"}}})
 
-        result = Song.objects.aggregate(*pipeline)
+        queryset = route_queryset(Song.objects, SONGS_DIFFICULTY, self.settings)
+        result = queryset.aggregate(*pipeline)
 
         try:
             # Get the first result
@@ -49,11 +206,21 @@ class SongRepository:
         except (StopIteration, KeyError):
             return 0.0
 
+    @traced(DB)
     def search_songs(self, message: str) -> List[Song]:
         """Perform case-insensitive text search on artist and title."""
         # Use MongoDB text index
-        return list(Song.objects.search_text(message))
+        queryset = route_queryset(Song.objects, SONGS_SEARCH, self.settings)
+        return list(queryset.search_text(message))
+
+    @traced(DB)
+    def search_song_rows(self, message: str) -> List[Dict[str, Any]]:
+        """Same as `search_songs`, but return raw projected rows."""
+        query = {"$text": {"$search": message}}
+        collection = route_collection(get_collection(Song), SONGS_SEARCH, self.settings)
+        return list(collection.find(query, SONG_PROJECTION))
 
+    @traced(DB)
     def get_song_by_id(self, song_id: str) -> Song:
         """Fetch a single song; raises ValueError if not found."""
         try:
@@ -61,7 +228,18 @@ class SongRepository:
         except Exception:
             raise ValueError(f"Invalid song_id: {song_id}") from None
 
-        song = Song.objects.get(id=obj_id)
-        if not song:
-            raise ValueError(f"Song not found: {song_id}") from None
+        queryset = route_queryset(Song.objects, SONGS_GET, self.settings)
+        song = queryset(id=obj_id).first()
+        if song is None:
+            raise ValueError(f"Song not found: {song_id}")
         return song
+
+    @traced(DB)
+    def get_song_rows(self, song_ids: Sequence[ObjectId]) -> List[Dict[str, Any]]:
+        """
+        Fetch the raw projected rows of many songs with one `$in` query, in
+        no particular order; ids without a song are simply left out.
+        """
+        query = {"_id": {"$in": list(song_ids)}}
+        collection = route_collection(get_collection(Song), SONGS_GET, self.settings)
+        return list(collection.find(query, SONG_PROJECTION))
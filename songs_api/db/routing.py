@@ -0,0 +1,121 @@
+import functools
+import logging
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from mongoengine.queryset import QuerySet
+from pymongo.collection import Collection
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+)
+
+from songs_api.config import ReadPreferenceMode, Settings, settings
+from songs_api.utils.metrics import MONGO_READS_ROUTED
+
+logger = logging.getLogger(__name__)
+
+# Routable reads, named after the repository method that issues them
+SONGS_LIST = "songs.list"
+SONGS_COUNT = "songs.count"
+SONGS_EXPORT = "songs.export"
+SONGS_DIFFICULTY = "songs.difficulty"
+SONGS_SEARCH = "songs.search"
+SONGS_GET = "songs.get"
+RATINGS_STATS = "ratings.stats"
+
+# A read preference, without relying on pymongo's private base class
+ServerMode = Union[Primary, PrimaryPreferred, Secondary, SecondaryPreferred, Nearest]
+
+_NON_PRIMARY: Dict[ReadPreferenceMode, Callable[..., ServerMode]] = {
+    ReadPreferenceMode.PRIMARY_PREFERRED: PrimaryPreferred,
+    ReadPreferenceMode.SECONDARY: Secondary,
+    ReadPreferenceMode.SECONDARY_PREFERRED: SecondaryPreferred,
+    ReadPreferenceMode.NEAREST: Nearest,
+}
+
+_lock = threading.Lock()
+# Reads routed so far in this process, by (operation, mode)
+_routed: Counter[Tuple[str, str]] = Counter()
+# Operations whose routing was already logged
+_logged: Dict[str, str] = {}
+
+
+# Read preferences are immutable: one is built per (mode, max staleness) and
+# shared by every read configured with them
+@functools.lru_cache(maxsize=None)
+def _make(mode: ReadPreferenceMode, max_staleness: int) -> ServerMode:
+    if mode is ReadPreferenceMode.PRIMARY:
+        return Primary()
+    return _NON_PRIMARY[mode](max_staleness=max_staleness)
+
+
+def read_preference(
+    operation: str,
+    config: Optional[Settings] = None,
+) -> Optional[ServerMode]:
+    """
+    Return the read preference configured for a read, or None to leave it
+    to the client.
+
+    Only reads call this: writes always go to the primary, whatever the
+    read preference. Each call is counted per (operation, mode), and the
+    first routing of each operation is logged.
+
+    Args:
+        operation: name of the read, e.g. SONGS_SEARCH
+        config: Settings holding READ_PREFERENCES. Default is `settings`.
+    """
+    config = config or settings
+    mode = config.READ_PREFERENCES.get(operation)
+    name = "default" if mode is None else mode.value
+
+    with _lock:
+        _routed[operation, name] += 1
+        first = _logged.get(operation) != name
+        if first:
+            _logged[operation] = name
+    MONGO_READS_ROUTED.labels(operation, name).inc()
+    if first:
+        logger.info("Routing %s reads to %s", operation, name)
+
+    if mode is None:
+        return None
+    return _make(mode, config.READ_MAX_STALENESS_SECONDS)
+
+
+def route_queryset(
+    queryset: QuerySet,
+    operation: str,
+    config: Optional[Settings] = None,
+) -> QuerySet:
+    """Apply the read preference of `operation` to a MongoEngine queryset."""
+    preference = read_preference(operation, config)
+    if preference is None:
+        return queryset
+    return queryset.read_preference(preference)
+
+
+def route_collection(
+    collection: Collection[Dict[str, Any]],
+    operation: str,
+    config: Optional[Settings] = None,
+) -> Collection[Dict[str, Any]]:
+    """Apply the read preference of `operation` to a raw pymongo collection."""
+    preference = read_preference(operation, config)
+    if preference is None:
+        return collection
+    return collection.with_options(read_preference=preference)
+
+
+def routing_stats() -> Dict[str, Dict[str, int]]:
+    """Return how many reads of each operation went to each mode."""
+    stats: Dict[str, Dict[str, int]] = {}
+    with _lock:
+        for (operation, mode), count in _routed.items():
+            stats.setdefault(operation, {})[mode] = count
+    return stats
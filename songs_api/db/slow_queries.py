@@ -0,0 +1,390 @@
+import hashlib
+import json
+import logging
+import os
+import queue
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pymongo import MongoClient
+from pymongo.monitoring import (
+    CommandFailedEvent,
+    CommandListener,
+    CommandStartedEvent,
+    CommandSucceededEvent,
+)
+
+from songs_api.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Read commands that can be re-run under `explain`
+EXPLAINABLE = frozenset({"find", "aggregate", "count", "distinct"})
+# Session, cluster and cursor plumbing: not part of what a query asks for
+NOISE = frozenset(
+    {
+        "lsid",
+        "txnNumber",
+        "$db",
+        "$clusterTime",
+        "$readPreference",
+        "readConcern",
+        "writeConcern",
+        "maxTimeMS",
+        "comment",
+        "batchSize",
+        "singleBatch",
+        "cursor",
+        "ordered",
+        "documents",
+    },
+)
+# Values kept as they are in shapes: which fields and in which order matter
+KEPT = frozenset({"sort", "projection", "hint"})
+# Shapes explained at most once per this many seconds
+EXPLAIN_COOLDOWN = 60.0
+
+
+def query_shape(value: Any) -> Any:
+    """
+    Replace every literal of a query with "?", keeping field names, operators
+    and `$field` references, so queries differing only in values compare
+    equal. Lists of literals (e.g. `$in`) collapse to one "?".
+    """
+    if isinstance(value, dict):
+        return {k: v if k in KEPT else query_shape(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = [query_shape(v) for v in value]
+        if all(shape == "?" for shape in shapes):
+            return ["?"] if shapes else []
+        return shapes
+    if isinstance(value, str) and value.startswith("$"):
+        return value
+    return "?"
+
+
+def command_shape(command_name: str, command: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the shape of a command: its collection and normalized query."""
+    if command_name == "getMore":
+        return {"getMore": command.get("collection")}
+    return {
+        k: v if k == command_name else query_shape(v)
+        for k, v in command.items()
+        if k not in NOISE
+    }
+
+
+def shape_id(collection: str, command_name: str, shape: Dict[str, Any]) -> str:
+    """Stable id of a query shape, to group log records by."""
+    raw = json.dumps([collection, command_name, shape], sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+
+def summarize_explain(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pick what tells an index miss from data growth out of an
+    `executionStats` explain: documents and keys examined versus returned,
+    and the indexes (or collection scan) of the winning plan.
+    """
+    stats: Dict[str, Any] = {}
+    indexes = set()
+    stages = set()
+    for node in _walk(explain):
+        if not stats and isinstance(node.get("executionStats"), dict):
+            stats = node["executionStats"]
+        if isinstance(node.get("winningPlan"), dict):
+            for plan_node in _walk(node["winningPlan"]):
+                if "indexName" in plan_node:
+                    indexes.add(str(plan_node["indexName"]))
+                if "stage" in plan_node:
+                    stages.add(str(plan_node["stage"]))
+
+    return {
+        "n_returned": stats.get("nReturned"),
+        "docs_examined": stats.get("totalDocsExamined"),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "execution_ms": stats.get("executionTimeMillis"),
+        "indexes": sorted(indexes),
+        "collection_scan": "COLLSCAN" in stages,
+    }
+
+
+def _walk(value: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(value, dict):
+        yield value
+        for v in value.values():
+            yield from _walk(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _walk(v)
+
+
+class SlowQueryLog(CommandListener):
+    """
+    Logs every MongoDB command slower than a threshold to a rotating JSON
+    lines file: collection, command, duration and normalized query shape.
+
+    A sample of the slow reads is re-run with `explain("executionStats")` in
+    a background thread, whose summary is logged as a record of its own.
+
+    Each process writes and rotates a file of its own, `<path>.<pid>`, since
+    rotating a file that forked workers share would lose or mix records.
+    The file is opened on the first record, so a preloading parent leaves
+    none to its workers.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        threshold_ms: float = 100.0,
+        explain_rate: float = 0.1,
+        client: Optional[Callable[[], MongoClient[Dict[str, Any]]]] = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backups: int = 3,
+    ) -> None:
+        self.path = path
+        self.threshold_ms = threshold_ms
+        self.explain_rate = explain_rate
+        self._client = client
+        # (connection, request id) -> (database, command) of commands in flight
+        self._started: Dict[Tuple[Any, int], Tuple[str, Any]] = {}
+        self._explained: Dict[str, float] = {}
+        self._explains: queue.Queue[Tuple[str, str, Dict[str, Any]]] = queue.Queue(
+            maxsize=100,
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._after_fork)
+
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._handler: Optional[logging.Handler] = None
+        self._log = logging.getLogger(f"{__name__}.{id(self)}")
+        self._log.propagate = False
+        self._log.setLevel(logging.INFO)
+
+    @staticmethod
+    def default_path(config: Settings) -> str:
+        """Resolve SLOW_QUERY_LOG_PATH, defaulting to the temp directory."""
+        return config.SLOW_QUERY_LOG_PATH or str(
+            Path(tempfile.gettempdir()) / "songs-api-slow-queries.jsonl",
+        )
+
+    @classmethod
+    def from_settings(
+        cls,
+        config: Settings,
+        client: Optional[Callable[[], MongoClient[Dict[str, Any]]]] = None,
+    ) -> "SlowQueryLog":
+        """Build the log configured by the SLOW_QUERY_* settings."""
+        return cls(
+            cls.default_path(config),
+            threshold_ms=config.SLOW_QUERY_THRESHOLD_MS,
+            explain_rate=config.SLOW_QUERY_EXPLAIN_RATE,
+            client=client,
+            max_bytes=config.SLOW_QUERY_LOG_MAX_BYTES,
+            backups=config.SLOW_QUERY_LOG_BACKUPS,
+        )
+
+    def started(self, event: CommandStartedEvent) -> None:
+        """Keep the command until we know whether it was slow."""
+        if event.command_name != "explain":
+            self._started[event.connection_id, event.request_id] = (
+                event.database_name,
+                event.command,
+            )
+
+    def succeeded(self, event: CommandSucceededEvent) -> None:
+        """Log the command if it was slow."""
+        self._finished(event.connection_id, event.request_id, event.duration_micros)
+
+    def failed(self, event: CommandFailedEvent) -> None:
+        """Log the command if it was slow; a timeout is at least as telling."""
+        self._finished(event.connection_id, event.request_id, event.duration_micros)
+
+    def close(self) -> None:
+        """Close the log file."""
+        with self._lock:
+            for handler in list(self._log.handlers):
+                self._log.removeHandler(handler)
+                handler.close()
+            self._handler = None
+
+    def _finished(self, connection_id: Any, request_id: int, micros: int) -> None:
+        started = self._started.pop((connection_id, request_id), None)
+        duration_ms = micros / 1000
+        if started is None or duration_ms < self.threshold_ms:
+            return
+
+        database, command = started
+        command_name = next(iter(command))
+        collection = command[command_name]
+        if command_name == "getMore":
+            collection = command.get("collection")
+        collection = collection if isinstance(collection, str) else ""
+        shape = command_shape(command_name, command)
+        key = shape_id(collection, command_name, shape)
+
+        self._write(
+            {
+                "type": "slow",
+                "shape_id": key,
+                "collection": collection,
+                "command": command_name,
+                "duration_ms": round(duration_ms, 3),
+                "shape": shape,
+            },
+        )
+        if self._should_explain(key, command_name):
+            try:
+                self._explains.put_nowait((key, database, command))
+            except queue.Full:
+                return
+            self._ensure_started()
+
+    def _should_explain(self, key: str, command_name: str) -> bool:
+        if self._client is None or command_name not in EXPLAINABLE:
+            return False
+        if random.random() >= self.explain_rate:  # noqa: S311
+            return False
+
+        now = time.monotonic()
+        with self._lock:
+            if now - self._explained.get(key, -EXPLAIN_COOLDOWN) < EXPLAIN_COOLDOWN:
+                return False
+            self._explained[key] = now
+        return True
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name="slow-query-explainer",
+                daemon=True,
+            )
+            self._pid = pid
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            key, database, command = self._explains.get()
+            try:
+                summary = self._explain(database, command)
+            except Exception:
+                logger.exception("Could not explain slow query %s", key)
+                continue
+            self._write({"type": "explain", "shape_id": key, **summary})
+
+    def _explain(self, database: str, command: Dict[str, Any]) -> Dict[str, Any]:
+        if self._client is None:
+            return {}
+        explainable = {k: v for k, v in command.items() if k not in NOISE}
+        explain = self._client()[database].command(
+            {"explain": explainable, "verbosity": "executionStats"},
+        )
+        return summarize_explain(explain)
+
+    def _after_fork(self) -> None:
+        # Commands and explains in flight belong to the parent's threads
+        self._started = {}
+        self._explains = queue.Queue(maxsize=100)
+        self._lock = threading.Lock()
+        # So is the parent's file; this process opens its own
+        if self._handler is not None:
+            self._log.removeHandler(self._handler)
+            self._handler = None
+
+    def _open(self) -> None:
+        with self._lock:
+            if self._handler is not None:
+                return
+            handler = RotatingFileHandler(
+                f"{self.path}.{os.getpid()}",
+                maxBytes=self._max_bytes,
+                backupCount=self._backups,
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._log.addHandler(handler)
+            self._handler = handler
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self._handler is None:
+            self._open()
+        record = {"ts": datetime.now(timezone.utc).isoformat(), **record}
+        self._log.info(json.dumps(record, default=str))
+
+
+def top_shapes(path: str, limit: int = 10, by: str = "max_ms") -> List[Dict[str, Any]]:
+    """
+    Aggregate the slow-query log, every process's and rotated files
+    included, into the `limit` slowest query shapes, each with its latest
+    explain summary.
+
+    Args:
+      path: the log path given to SlowQueryLog
+      limit: number of shapes to return
+      by: "max_ms", "total_ms" or "count"
+    """
+    shapes: Dict[str, Dict[str, Any]] = {}
+    explains: Dict[str, Dict[str, Any]] = {}
+    for record in _read_records(path):
+        key = str(record.get("shape_id"))
+        if record.get("type") == "explain":
+            if key not in explains or explains[key]["ts"] < record["ts"]:
+                explains[key] = record
+            continue
+
+        entry = shapes.setdefault(
+            key,
+            {
+                "shape_id": key,
+                "collection": record["collection"],
+                "command": record["command"],
+                "shape": record["shape"],
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "last_seen": record["ts"],
+            },
+        )
+        entry["count"] += 1
+        entry["total_ms"] += record["duration_ms"]
+        entry["max_ms"] = max(entry["max_ms"], record["duration_ms"])
+        entry["last_seen"] = max(entry["last_seen"], record["ts"])
+
+    ranked = sorted(shapes.values(), key=lambda entry: entry[by], reverse=True)
+    for entry in ranked[:limit]:
+        entry["avg_ms"] = entry["total_ms"] / entry["count"]
+        explain = explains.get(entry["shape_id"])
+        entry["explain"] = (
+            None
+            if explain is None
+            else {k: v for k, v in explain.items() if k not in ("type", "shape_id")}
+        )
+    return ranked[:limit]
+
+
+def _read_records(path: str) -> Iterator[Dict[str, Any]]:
+    log = Path(path)
+    # <path>.<pid> of every process, their rotated files, and <path> itself
+    # as written before logs were kept per process
+    for file in [*log.parent.glob(f"{log.name}.*"), log]:
+        try:
+            with file.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            continue
@@ -0,0 +1,273 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from songs_api.utils.metrics import (
+    WRITE_BUFFER_BATCH_SIZE,
+    WRITE_BUFFER_FLUSH_SECONDS,
+    WRITE_BUFFER_ITEMS_LOST,
+    WRITE_BUFFER_RETRIES,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BufferFullError(Exception):
+    """Raised when an item cannot be enqueued before the put timeout."""
+
+
+@dataclass
+class BufferStats:
+    """Counters describing the buffer's flush activity."""
+
+    flushes: int = 0
+    items_flushed: int = 0
+    # Items `flush` reported as not written; they are not retried
+    items_failed: int = 0
+    items_rejected: int = 0
+    # Batches written again after `flush` raised
+    retries: int = 0
+    # Items of batches that still raised after every retry
+    items_dropped: int = 0
+    last_batch_size: int = 0
+    max_batch_size: int = 0
+    last_flush_seconds: float = 0.0
+    flush_seconds_total: float = 0.0
+
+
+class WriteBehindBuffer(Generic[T]):
+    """
+    Bounded in-process queue drained in batches by a background thread.
+
+    A batch is handed to `flush` as soon as `batch_size` items have
+    accumulated, or `flush_interval` seconds after its first item arrived,
+    whichever comes first; `flush` returns how many items it failed to
+    write. When the queue is full, `put` blocks for at most
+    `put_timeout` seconds and then raises BufferFullError, pushing back on
+    callers instead of growing without bound.
+
+    A batch whose `flush` raises (e.g. the database is unreachable) is
+    written again up to `max_retries` times, `retry_backoff` seconds after
+    the first failure and twice as long after each next one, then dropped.
+    `flush` must therefore be safe to call again with items it may already
+    have written.
+
+    Batch sizes, flush times, retries and lost items are also exported as
+    Prometheus metrics labelled with the buffer's `name`.
+
+    The flusher thread is started lazily by the first `put` in each process
+    and the queue is reset in forked children, so a buffer created before a
+    fork (e.g. gunicorn --preload) is safe to use in the workers.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[T]], int],
+        max_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        put_timeout: float = 0.1,
+        max_retries: int = 3,
+        retry_backoff: float = 0.1,
+        name: str = "default",
+    ) -> None:
+        self._flush = flush
+        self.name = name
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.stats = BufferStats()
+
+        self._items: Deque[T] = deque()
+        # Arrival time of the oldest queued item, which starts the interval
+        self._oldest_at = 0.0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def put(self, item: T) -> None:
+        """
+        Enqueue an item for the next batch.
+
+        Raises:
+          BufferFullError: if the buffer stayed full for `put_timeout` seconds.
+        """
+        self._ensure_started()
+        with self._cond:
+            deadline = time.monotonic() + self.put_timeout
+            while len(self._items) >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    self.stats.items_rejected += 1
+                    WRITE_BUFFER_ITEMS_LOST.labels(self.name, "rejected").inc()
+                    raise BufferFullError(
+                        f"Write buffer is full ({self.max_size} pending items)",
+                    )
+
+            if not self._items:
+                self._oldest_at = time.monotonic()
+            self._items.append(item)
+            if len(self._items) in (1, self.batch_size):
+                self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Synchronously flush everything currently queued."""
+        while True:
+            with self._cond:
+                batch = self._pop_batch()
+            if not batch:
+                return
+            self._write(batch)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the flusher thread and flush whatever is still queued."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None and self._pid == os.getpid():
+            thread.join(timeout)
+        self.flush()
+
+    def pending(self) -> int:
+        """Number of queued items."""
+        return len(self._items)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the flush counters plus the current queue depth."""
+        with self._cond:
+            return {**asdict(self.stats), "pending": self.pending()}
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        with self._cond:
+            if self._pid == pid:
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name="write-behind-flusher",
+                daemon=True,
+            )
+            self._pid = pid
+            self._thread.start()
+
+    def _after_fork(self) -> None:
+        # Whatever the parent had queued is the parent's to flush, and its
+        # lock may have been held by a thread that does not exist here.
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._pid = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._items and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+
+                # Wait for a full batch, but no longer than one interval
+                while len(self._items) < self.batch_size and not self._stopped:
+                    remaining = self._oldest_at + self.flush_interval
+                    remaining -= time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopped:
+                    return
+                batch = self._pop_batch()
+
+            self._write(batch)
+
+    def _pop_batch(self) -> List[T]:
+        """Take up to `batch_size` items; the caller must hold the condition."""
+        count = min(len(self._items), self.batch_size)
+        batch = [self._items.popleft() for _ in range(count)]
+        if batch:
+            # Wake producers blocked on a full buffer
+            self._cond.notify_all()
+        return batch
+
+    def _flush_with_retries(self, batch: List[T]) -> Tuple[int, int]:
+        """Return (items `flush` failed to write, items dropped after retries)."""
+        backoff = self.retry_backoff
+        for _ in range(self.max_retries):
+            try:
+                return self._flush(batch), 0
+            except Exception:
+                logger.warning(
+                    "Failed to flush %d buffered items, retrying in %.2fs",
+                    len(batch),
+                    backoff,
+                    exc_info=True,
+                )
+            with self._cond:
+                self.stats.retries += 1
+            WRITE_BUFFER_RETRIES.labels(self.name).inc()
+            time.sleep(backoff)
+            backoff *= 2
+
+        try:
+            return self._flush(batch), 0
+        except Exception:
+            logger.exception(
+                "Dropping %d buffered items after %d retries",
+                len(batch),
+                self.max_retries,
+            )
+            return 0, len(batch)
+
+    def _write(self, batch: List[T]) -> None:
+        start = time.perf_counter()
+        failed, dropped = self._flush_with_retries(batch)
+        elapsed = time.perf_counter() - start
+
+        with self._cond:
+            self.stats.flushes += 1
+            self.stats.items_flushed += len(batch) - failed - dropped
+            self.stats.items_failed += failed
+            self.stats.items_dropped += dropped
+            self.stats.last_batch_size = len(batch)
+            self.stats.max_batch_size = max(self.stats.max_batch_size, len(batch))
+            self.stats.last_flush_seconds = elapsed
+            self.stats.flush_seconds_total += elapsed
+
+        WRITE_BUFFER_BATCH_SIZE.labels(self.name).observe(len(batch))
+        WRITE_BUFFER_FLUSH_SECONDS.labels(self.name).observe(elapsed)
+        if failed:
+            WRITE_BUFFER_ITEMS_LOST.labels(self.name, "failed").inc(failed)
+        if dropped:
+            WRITE_BUFFER_ITEMS_LOST.labels(self.name, "dropped").inc(dropped)
+
+        if failed or dropped:
+            logger.warning(
+                "%d of %d buffered items were not written",
+                failed + dropped,
+                len(batch),
+            )
+        logger.debug("Flushed %d buffered items in %.4fs", len(batch), elapsed)
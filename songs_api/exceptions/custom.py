@@ -1,2 +1,14 @@
 class NotFoundError(Exception):
     """Raised when a requested resource (e.g. song or rating) is not found."""
+
+
+class BadRequestError(Exception):
+    """Raised when a request is well-formed but carries unusable values."""
+
+
+class UnauthorizedError(Exception):
+    """Raised when a request lacks valid credentials for the resource."""
+
+
+class ServiceUnavailableError(Exception):
+    """Raised when the service is temporarily unable to accept the request."""
@@ -1,7 +1,12 @@
 from flask import Flask, Response, jsonify
 from pydantic import ValidationError
 
-from songs_api.exceptions.custom import NotFoundError
+from songs_api.exceptions.custom import (
+    BadRequestError,
+    NotFoundError,
+    ServiceUnavailableError,
+    UnauthorizedError,
+)
 
 
 def register_error_handlers(app: Flask) -> None:
@@ -11,10 +16,25 @@ def register_error_handlers(app: Flask) -> None:
     def handle_validation(e: ValidationError) -> tuple[Response, int]:
         return jsonify({"error": "Validation Error", "messages": e.errors()}), 400
 
+    @app.errorhandler(BadRequestError)
+    def handle_bad_request(e: BadRequestError) -> tuple[Response, int]:
+        return jsonify({"error": "Bad Request", "message": str(e)}), 400
+
     @app.errorhandler(NotFoundError)
     def handle_not_found(e: NotFoundError) -> tuple[Response, int]:
         return jsonify({"error": "Not Found", "message": str(e)}), 404
 
+    @app.errorhandler(UnauthorizedError)
+    def handle_unauthorized(e: UnauthorizedError) -> tuple[Response, int]:
+        return jsonify({"error": "Unauthorized", "message": str(e)}), 401
+
+    @app.errorhandler(ServiceUnavailableError)
+    def handle_unavailable(
+        e: ServiceUnavailableError,
+    ) -> tuple[Response, int, dict[str, str]]:
+        body = {"error": "Service Unavailable", "message": str(e)}
+        return jsonify(body), 503, {"Retry-After": "1"}
+
     @app.errorhandler(Exception)
     def handle_generic(e: Exception) -> tuple[Response, int]:
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
@@ -6,7 +6,15 @@ from flask import Flask
 from songs_api.api.health import health_bp
 from songs_api.config import Settings, settings
 from songs_api.db.client import connect_db
+from songs_api.db.slow_queries import SlowQueryLog
 from songs_api.exceptions.handlers import register_error_handlers
+from songs_api.utils.admission import AdmissionMiddleware
+from songs_api.utils.json_provider import configure_json
+from songs_api.utils.metrics import init_metrics
+from songs_api.utils.profiling import ProfilerMiddleware
+from songs_api.utils.shared_cache import open_shared_cache
+from songs_api.utils.tracing import init_tracing
+from songs_api.utils.versions import configure_versions
 
 
 def create_app(config: Optional[Settings] = None) -> Flask:
@@ -25,6 +33,10 @@ def create_app(config: Optional[Settings] = None) -> Flask:
     # Configure Flask app
     app.config["TESTING"] = app_config.TESTING
     app.config["DEBUG"] = app_config.DEBUG
+    app.config["ETAGS_ENABLED"] = app_config.ETAGS_ENABLED
+    app.config["ADMIN_TOKEN"] = app_config.ADMIN_TOKEN
+    app.config["SLOW_QUERY_LOG_PATH"] = SlowQueryLog.default_path(app_config)
+    configure_json(app, app_config)
 
     # Configure logging
     if not app.debug:
@@ -34,17 +46,54 @@ def create_app(config: Optional[Settings] = None) -> Flask:
         )
 
     # Connect to MongoDB
-    connect_db()
+    connect_db(config=app_config)
 
     # Register Flask blueprints
+    from songs_api.api.admin import admin_bp
     from songs_api.api.ratings import ratings_bp
     from songs_api.api.songs import songs_bp
+    from songs_api.services.rating_service import rating_service
+    from songs_api.services.song_service import song_service
+
+    shared_cache = open_shared_cache(app_config)
+    if shared_cache is not None:
+        song_service.cache_factory = shared_cache.namespace
+        rating_service.cache_factory = shared_cache.namespace
+    configure_versions(app_config)
+
+    if app_config.RATINGS_WRITE_BEHIND:
+        rating_service.enable_write_behind(app_config)
+    if app_config.RATINGS_STATS_BATCH_WINDOW_MS > 0:
+        rating_service.repo.enable_stats_batching(app_config)
 
     app.register_blueprint(songs_bp)
     app.register_blueprint(ratings_bp)
     app.register_blueprint(health_bp)
+    app.register_blueprint(admin_bp)
+    if app_config.METRICS_ENABLED:
+        from songs_api.api.metrics import metrics_bp
+
+        init_metrics(app)
+        app.register_blueprint(metrics_bp)
+    if app_config.TRACING_ENABLED:
+        init_tracing(app, app_config.TRACE_EXPORT_PATH)
 
     # Register error handlers
     register_error_handlers(app)
 
+    # Profile on demand, around everything the app does for a request
+    if app_config.ADMIN_TOKEN or app_config.PROFILE_SAMPLE_EVERY > 0:
+        app.wsgi_app = ProfilerMiddleware.from_settings(  # type: ignore[method-assign]
+            app.wsgi_app,
+            app_config,
+        )
+
+    # Shed load before doing any work for a request
+    if app_config.ADMISSION_MAX_IN_FLIGHT > 0 or app_config.ADMISSION_ROUTE_LIMITS:
+        app.wsgi_app = AdmissionMiddleware.from_settings(  # type: ignore[method-assign]
+            app.wsgi_app,
+            app.url_map,
+            app_config,
+        )
+
     return app
@@ -0,0 +1,49 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SlowQueryOrder(str, Enum):
+    MAX_MS = "max_ms"
+    TOTAL_MS = "total_ms"
+    COUNT = "count"
+
+
+class SlowQueriesParams(BaseModel):
+    limit: int = Field(10, ge=1, le=100, description="Number of query shapes")
+    by: SlowQueryOrder = Field(
+        SlowQueryOrder.MAX_MS,
+        description="Rank shapes by slowest run, total time or occurrences",
+    )
+
+
+class ExplainSummaryResponse(BaseModel):
+    ts: datetime
+    n_returned: Optional[int] = None
+    docs_examined: Optional[int] = None
+    keys_examined: Optional[int] = None
+    execution_ms: Optional[int] = None
+    indexes: List[str] = Field(..., description="Indexes of the winning plan")
+    collection_scan: bool
+
+
+class SlowQueryShapeResponse(BaseModel):
+    shape_id: str
+    collection: str
+    command: str
+    shape: Dict[str, Any] = Field(..., description="Query with values as '?'")
+    count: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+    last_seen: datetime
+    explain: Optional[ExplainSummaryResponse] = Field(
+        None,
+        description="Latest explain('executionStats') summary, if sampled",
+    )
+
+
+class SlowQueriesResponse(BaseModel):
+    shapes: List[SlowQueryShapeResponse]
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -16,3 +18,15 @@ class RatingStatsResponse(BaseModel):
     average: float = Field(..., description="Average rating of the song")
     lowest: int = Field(..., description="Lowest rating")
     highest: int = Field(..., description="Highest rating")
+
+
+class RatingBatchItemResponse(BaseModel):
+    index: int = Field(..., description="Position of the item in the request")
+    id: Optional[str] = Field(None, description="ID of the stored rating")
+    error: Optional[str] = Field(None, description="Why the item was not stored")
+
+
+class RatingBatchResponse(BaseModel):
+    inserted: int = Field(..., description="Number of ratings stored")
+    failed: List[int] = Field(..., description="Indexes of items not stored")
+    results: List[RatingBatchItemResponse]
@@ -1,7 +1,7 @@
 from datetime import date
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from pydantic import BaseModel, Field, field_serializer
+from pydantic import BaseModel, Field, field_validator
 
 
 # --- Response Schemas ---
@@ -11,13 +11,9 @@ class SongResponse(BaseModel):
     title: str
     difficulty: float
     level: int
+    # Serialized as YYYY-MM-DD by pydantic-core, without a Python call per row
     released: date
 
-    @field_serializer("released")
-    def serialize_released(self, dt: date) -> str:
-        """Convert date to string format YYYY-MM-DD."""
-        return dt.strftime("%Y-%m-%d")
-
 
 class SongListResponse(BaseModel):
     songs: List[SongResponse]
@@ -28,6 +24,13 @@ class PagedSongsResponse(BaseModel):
     total: int
     page: int
     size: int
+    next_cursor: Optional[str] = None
+
+
+class SongBatchResponse(BaseModel):
+    items: List[SongResponse]
+    # Requested ids that are invalid or have no song
+    missing: List[str]
 
 
 class AverageDifficultyResponse(BaseModel):
@@ -38,6 +41,41 @@ class AverageDifficultyResponse(BaseModel):
 class ListSongsParams(BaseModel):
     page: int = Field(1, ge=1, description="Page number (1-based)")
     size: Optional[int] = Field(None, ge=1, description="Items per page")
+    cursor: Optional[str] = Field(
+        None,
+        description="Opaque `next_cursor` from a previous page; overrides `page`",
+    )
+    ids: Optional[List[str]] = Field(
+        None,
+        description="Comma-separated song ids to fetch instead of a page",
+    )
+
+    @field_validator("ids", mode="before")
+    @classmethod
+    def split_ids(cls, value: Any) -> Any:
+        """Accept `ids=a,b` as well as repeated `ids=a&ids=b`."""
+        if isinstance(value, str):
+            value = [value]
+        if isinstance(value, list):
+            return [
+                song_id.strip()
+                for item in value
+                for song_id in str(item).split(",")
+                if song_id.strip()
+            ]
+        return value
+
+
+class ExportSongsParams(BaseModel):
+    level: Optional[int] = Field(None, ge=1, description="Filter by song level")
+    released_from: Optional[date] = Field(
+        None,
+        description="Only songs released on or after this date (YYYY-MM-DD)",
+    )
+    released_to: Optional[date] = Field(
+        None,
+        description="Only songs released on or before this date (YYYY-MM-DD)",
+    )
 
 
 class DifficultyParams(BaseModel):
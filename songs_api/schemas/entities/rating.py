@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -15,3 +17,9 @@ class RatingStatsEntity(BaseModel):
     highest: int
 
     model_config = {"from_attributes": True}
+
+
+class RatingBatchItemEntity(BaseModel):
+    index: int
+    rating: Optional[RatingEntity] = None
+    error: Optional[str] = None
@@ -1,8 +1,42 @@
+import atexit
 from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+from songs_api.config import Settings
+from songs_api.db.models.rating import Rating
 from songs_api.db.repositories.rating_repository import RatingRepository
-from songs_api.exceptions.custom import NotFoundError
-from songs_api.schemas.entities.rating import RatingEntity, RatingStatsEntity
+from songs_api.db.write_buffer import BufferFullError, WriteBehindBuffer
+from songs_api.exceptions.custom import NotFoundError, ServiceUnavailableError
+from songs_api.schemas.entities.rating import (
+    RatingBatchItemEntity,
+    RatingEntity,
+    RatingStatsEntity,
+)
+from songs_api.utils.cache import CacheFactory, invalidate, memoize
+from songs_api.utils.tracing import MAP, SERVICE, span, traced
+from songs_api.utils.versions import bump, bump_all, current, ratings_scope
+
+# Cache namespace of memoized rating stats, keyed by song_id
+STATS_CACHE = "ratings.stats"
+
+
+def stats_version(song_id: str) -> str:
+    """Version stamp of the ratings a song's stats are computed from."""
+    return current(ratings_scope(song_id))
+
+
+def ratings_changed(song_ids: Iterable[str]) -> None:
+    """Drop memoized stats and bump version stamps of songs that got ratings."""
+    for song_id in song_ids:
+        invalidate(STATS_CACHE, song_id)
+        bump(ratings_scope(song_id))
+
+
+def all_ratings_changed() -> None:
+    """Drop every memoized stats and bump every song's stamp, e.g. after a reload."""
+    invalidate(STATS_CACHE)
+    # Cheaper than bumping each song's scope once there are many songs
+    bump_all()
 
 
 @dataclass
@@ -10,24 +44,119 @@ class RatingService:
     """Orchestrates rating operations and maps results to domain entities."""
 
     repo: RatingRepository = field(default_factory=RatingRepository)
+    # Set by `enable_write_behind`; None means ratings are written inline
+    buffer: Optional[WriteBehindBuffer[Rating]] = None
+    cache_factory: Optional[CacheFactory] = None
+
+    def enable_write_behind(self, config: Settings) -> None:
+        """Queue new ratings and insert them in batches from a background thread."""
+        if self.buffer is not None:
+            return
 
+        self.buffer = WriteBehindBuffer(
+            flush=self._flush_ratings,
+            max_size=config.RATINGS_BUFFER_MAX_SIZE,
+            batch_size=config.RATINGS_BUFFER_BATCH_SIZE,
+            flush_interval=config.RATINGS_BUFFER_FLUSH_INTERVAL_MS / 1000,
+            put_timeout=config.RATINGS_BUFFER_PUT_TIMEOUT_MS / 1000,
+            max_retries=config.RATINGS_BUFFER_MAX_RETRIES,
+            retry_backoff=config.RATINGS_BUFFER_RETRY_BACKOFF_MS / 1000,
+            name="ratings",
+        )
+        # Don't lose queued ratings on a graceful shutdown
+        atexit.register(self.buffer.close)
+
+    @traced(SERVICE)
     def add_rating(self, song_id: str, rating_value: int) -> RatingEntity:
-        """Add a new rating; raise NotFoundError on invalid song."""
+        """
+        Add a new rating; raise NotFoundError on invalid song.
+
+        With write-behind enabled the rating is only queued, and
+        ServiceUnavailableError is raised if the queue stays full.
+        """
         try:
-            rating_doc = self.repo.add_rating(
-                song_id=song_id,
-                rating_value=rating_value,
-            )
+            if self.buffer is None:
+                rating_doc = self.repo.add_rating(
+                    song_id=song_id,
+                    rating_value=rating_value,
+                )
+                ratings_changed([song_id])
+            else:
+                rating_doc = self.repo.build_rating(
+                    song_id=song_id,
+                    rating_value=rating_value,
+                )
+                self.buffer.put(rating_doc)
         except ValueError as e:
             raise NotFoundError(str(e)) from e
+        except BufferFullError as e:
+            raise ServiceUnavailableError(str(e)) from e
 
         # Map to domain entity
-        return RatingEntity(
-            id=str(rating_doc.id),
-            song_id=str(rating_doc.song_id),
-            rating=rating_doc.rating,
-        )
+        with span(MAP):
+            return RatingEntity(
+                id=str(rating_doc.id),
+                song_id=str(rating_doc.song_id),
+                rating=rating_doc.rating,
+            )
+
+    @traced(SERVICE)
+    def add_ratings(
+        self,
+        ratings: Sequence[Tuple[str, int]],
+    ) -> List[RatingBatchItemEntity]:
+        """
+        Add many (song_id, rating) pairs with a single bulk write.
+
+        Always written inline, even with write-behind enabled, since the
+        request is already a batch. Returns one result per input pair, in
+        input order, carrying either the stored rating or an error.
+        """
+        errors: Dict[int, str] = {}
+        docs: List[Rating] = []
+        positions: List[int] = []
+        for index, (song_id, rating_value) in enumerate(ratings):
+            try:
+                docs.append(self.repo.build_rating(song_id, rating_value))
+                positions.append(index)
+            except ValueError as e:
+                errors[index] = str(e)
+
+        for failed in self.repo.insert_ratings(docs):
+            errors[positions[failed]] = "Rating could not be stored"
+        ratings_changed({doc.song_id for doc in docs})
 
+        with span(MAP):
+            stored = dict(zip(positions, docs))
+            results: List[RatingBatchItemEntity] = []
+            for index in range(len(ratings)):
+                if index in errors:
+                    results.append(
+                        RatingBatchItemEntity(index=index, error=errors[index]),
+                    )
+                    continue
+
+                rating_doc = stored[index]
+                results.append(
+                    RatingBatchItemEntity(
+                        index=index,
+                        rating=RatingEntity(
+                            id=str(rating_doc.id),
+                            song_id=str(rating_doc.song_id),
+                            rating=rating_doc.rating,
+                        ),
+                    ),
+                )
+        return results
+
+    @traced(SERVICE)
+    @memoize(
+        STATS_CACHE,
+        ttl=30,
+        maxsize=10_000,
+        key=lambda song_id: song_id,
+        version=stats_version,
+    )
     def get_stats(self, song_id: str) -> RatingStatsEntity:
         """Fetch rating stats; raise NotFoundError on invalid song."""
         try:
@@ -36,11 +165,18 @@ class RatingService:
             raise NotFoundError(str(e)) from e
 
         # Map to domain entity for stats
-        return RatingStatsEntity(
-            average=avg,
-            lowest=lowest,
-            highest=highest,
-        )
+        with span(MAP):
+            return RatingStatsEntity(
+                average=avg,
+                lowest=lowest,
+                highest=highest,
+            )
+
+    def _flush_ratings(self, ratings: List[Rating]) -> int:
+        """Write a batch of buffered ratings; return how many failed."""
+        failed = self.repo.insert_ratings(ratings)
+        ratings_changed({rating.song_id for rating in ratings})
+        return len(failed)
 
 
 # Module-level singleton
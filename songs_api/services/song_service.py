@@ -1,10 +1,94 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from datetime import date
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
 
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from songs_api.config import settings
 from songs_api.db.repositories.song_repository import SongRepository
-from songs_api.exceptions.custom import NotFoundError
+from songs_api.exceptions.custom import BadRequestError, NotFoundError
 from songs_api.schemas.entities.song import SongEntity
-from songs_api.utils.pagination import Page
+from songs_api.utils.cache import CacheFactory, invalidate, memoize, memoize_many
+from songs_api.utils.catalog import normalize_text
+from songs_api.utils.pagination import Page, decode_cursor, encode_cursor
+from songs_api.utils.tracing import MAP, SERVICE, span, traced
+from songs_api.utils.versions import SONGS_SCOPE, bump, current
+
+# Cache namespaces of memoized catalog reads
+DIFFICULTY_CACHE = "songs.difficulty"
+SEARCH_CACHE = "songs.search"
+PAGES_CACHE = "songs.pages"
+# Read-through cache of single songs, keyed by ObjectId
+SONGS_CACHE = "songs.by_id"
+
+
+def invalidate_catalog() -> None:
+    """Drop memoized catalog reads; call whenever the songs collection changes."""
+    invalidate(DIFFICULTY_CACHE)
+    invalidate(SEARCH_CACHE)
+    invalidate(PAGES_CACHE)
+    invalidate(SONGS_CACHE)
+    bump(SONGS_SCOPE)
+
+
+def catalog_version(*args: Any, **kwargs: Any) -> str:
+    """Version stamp of the data of every catalog read, whatever its arguments."""
+    return current(SONGS_SCOPE)
+
+
+def song_cache_key(song_id: Any) -> Hashable:
+    """Key a song by ObjectId, whether given as one or as a string."""
+    try:
+        return ObjectId(song_id)
+    except (InvalidId, TypeError):
+        # Not cached anyway: reading it fails
+        return str(song_id)
+
+
+def requested_songs(song_ids: List[str]) -> Dict[Hashable, str]:
+    """
+    Map the cache key of each requested song to the id it was first
+    requested as; ids spelled differently (e.g. in upper case) are the same
+    song.
+    """
+    requested: Dict[Hashable, str] = {}
+    for song_id in song_ids:
+        requested.setdefault(song_cache_key(song_id), song_id)
+    return requested
+
+
+def found_songs(
+    requested: Dict[Hashable, str],
+    found: Dict[ObjectId, SongEntity],
+) -> Tuple[List[SongEntity], List[str]]:
+    """Split requested songs into those found, in order, and missing ids."""
+    songs: List[SongEntity] = []
+    missing: List[str] = []
+    for key, song_id in requested.items():
+        song = found.get(key) if isinstance(key, ObjectId) else None
+        if song is None:
+            missing.append(song_id)
+        else:
+            songs.append(song)
+    return songs, missing
+
+
+def song_entity_from_row(row: Dict[str, Any]) -> SongEntity:
+    """
+    Map a raw song row (see SONG_PROJECTION) to a SongEntity in one step.
+
+    Rows were validated by MongoEngine when written, so validation is skipped.
+    """
+    return SongEntity.model_construct(
+        id=str(row["_id"]),
+        artist=row["artist"],
+        title=row["title"],
+        difficulty=float(row["difficulty"]),
+        level=row["level"],
+        # DateField values are stored as midnight datetimes
+        released=row["released"].date(),
+    )
 
 
 @dataclass
@@ -12,44 +96,165 @@ class SongService:
     """Orchestrates song-related operations, mapping repo calls to domain entities."""
 
     repo: SongRepository = field(default_factory=SongRepository)
+    cache_factory: Optional[CacheFactory] = None
+    raw_reads: bool = field(default_factory=lambda: settings.SONGS_RAW_READS)
 
+    @traced(SERVICE)
     def list_songs(
         self,
         page: int = 1,
         size: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> Page[SongEntity]:
-        """Return a paginated list of SongEntity."""
-        items, total = self.repo.list_songs(page=page, size=size)
-
-        entities: List[SongEntity] = []
-        for doc in items:
-            entities.append(
-                SongEntity(
-                    id=str(doc.id),
-                    artist=doc.artist,
-                    title=doc.title,
-                    difficulty=doc.difficulty,
-                    level=doc.level,
-                    released=doc.released,
-                ),
-            )
+        """
+        Return a paginated list of SongEntity.
 
+        When `cursor` is given, `page` is ignored and the page starts right
+        after the song the cursor points at; raise BadRequestError if the
+        cursor cannot be decoded.
+        """
+        entities, total, next_cursor = self._load_page(page, size, cursor)
         return Page[SongEntity](
             items=entities,
             total=total,
             page=page,
             size=len(entities),
+            next_cursor=next_cursor,
+        )
+
+    # Cached as a plain tuple: parametrized Page classes cannot be pickled
+    # into the shared cache
+    @memoize(
+        PAGES_CACHE,
+        ttl=10,
+        maxsize=256,
+        key=lambda page, size, cursor: (page, size, cursor),
+        version=catalog_version,
+    )
+    def _load_page(
+        self,
+        page: int,
+        size: Optional[int],
+        cursor: Optional[str],
+    ) -> Tuple[List[SongEntity], int, Optional[str]]:
+        """Fetch one page of songs, its total and the cursor of the next one."""
+        after = None
+        if cursor is not None:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError as e:
+                raise BadRequestError(str(e)) from e
+
+        if self.raw_reads:
+            rows, total = (
+                self.repo.list_song_rows(page=page, size=size)
+                if after is None
+                else self.repo.list_song_rows_after(after=after, size=size)
+            )
+            with span(MAP):
+                entities = [song_entity_from_row(row) for row in rows]
+            last_id = rows[-1]["_id"] if rows else None
+        else:
+            items, total = (
+                self.repo.list_songs(page=page, size=size)
+                if after is None
+                else self.repo.list_songs_after(after=after, size=size)
+            )
+            with span(MAP):
+                entities = [
+                    SongEntity(
+                        id=str(doc.id),
+                        artist=doc.artist,
+                        title=doc.title,
+                        difficulty=doc.difficulty,
+                        level=doc.level,
+                        released=doc.released,
+                    )
+                    for doc in items
+                ]
+            last_id = items[-1].id if items else None
+
+        # A full page means there may be more songs after the last one
+        next_cursor = None
+        if last_id is not None and len(entities) == self.repo.page_size(size):
+            next_cursor = encode_cursor(last_id)
+
+        return entities, total, next_cursor
+
+    def export_songs(
+        self,
+        level: Optional[int] = None,
+        released_from: Optional[date] = None,
+        released_to: Optional[date] = None,
+    ) -> Iterator[SongEntity]:
+        """Lazily yield every song matching the filters, as domain entities."""
+        rows = self.repo.iter_song_rows(
+            level=level,
+            released_from=released_from,
+            released_to=released_to,
+            batch_size=settings.SONGS_EXPORT_BATCH_SIZE,
         )
+        for row in rows:
+            yield song_entity_from_row(row)
 
+    @traced(SERVICE)
+    @memoize(
+        DIFFICULTY_CACHE,
+        ttl=300,
+        maxsize=128,
+        key=lambda level=None: level,
+        version=catalog_version,
+    )
     def average_difficulty(self, level: Optional[int] = None) -> float:
         """Get average difficulty, optionally filtering by level."""
         return self.repo.average_difficulty(level=level)
 
+    @traced(SERVICE)
+    @memoize(
+        SEARCH_CACHE,
+        ttl=60,
+        maxsize=1024,
+        key=lambda message: normalize_text(message),
+        version=catalog_version,
+    )
     def search_songs(self, message: str) -> List[SongEntity]:
         """Search songs by text, returning domain entities."""
+        if self.raw_reads:
+            rows = self.repo.search_song_rows(message)
+            with span(MAP):
+                return [song_entity_from_row(row) for row in rows]
+
         docs = self.repo.search_songs(message)
-        return [
-            SongEntity(
+        with span(MAP):
+            return [
+                SongEntity(
+                    id=str(doc.id),
+                    artist=doc.artist,
+                    title=doc.title,
+                    difficulty=doc.difficulty,
+                    level=doc.level,
+                    released=doc.released,
+                )
+                for doc in docs
+            ]
+
+    @traced(SERVICE)
+    @memoize(
+        SONGS_CACHE,
+        ttl=300,
+        maxsize=10_000,
+        key=song_cache_key,
+        version=catalog_version,
+    )
+    def get_song(self, song_id: str) -> SongEntity:
+        """Fetch a single song entity or raise NotFoundError."""
+        try:
+            doc = self.repo.get_song_by_id(song_id)
+        except ValueError as e:
+            raise NotFoundError(str(e)) from e
+
+        with span(MAP):
+            return SongEntity(
                 id=str(doc.id),
                 artist=doc.artist,
                 title=doc.title,
@@ -57,24 +262,34 @@ class SongService:
                 level=doc.level,
                 released=doc.released,
             )
-            for doc in docs
-        ]
 
-    def get_song(self, song_id: str) -> SongEntity:
-        """Fetch a single song entity or raise NotFoundError."""
-        try:
-            doc = self.repo.get_song_by_id(song_id)
-        except ValueError as e:
-            raise NotFoundError(str(e)) from e
+    @traced(SERVICE)
+    def get_songs(self, song_ids: List[str]) -> Tuple[List[SongEntity], List[str]]:
+        """
+        Fetch many songs at once, reading only those not cached yet, with a
+        single query.
 
-        return SongEntity(
-            id=str(doc.id),
-            artist=doc.artist,
-            title=doc.title,
-            difficulty=doc.difficulty,
-            level=doc.level,
-            released=doc.released,
-        )
+        Returns:
+          (the songs found, in request order without duplicates, and the
+          requested ids that are invalid or have no song)
+        """
+        requested = requested_songs(song_ids)
+        valid = [key for key in requested if isinstance(key, ObjectId)]
+        found = self._load_songs(valid) if valid else {}
+        return found_songs(requested, found)
+
+    @memoize_many(
+        SONGS_CACHE,
+        ttl=300,
+        maxsize=10_000,
+        key=song_cache_key,
+        version=catalog_version,
+    )
+    def _load_songs(self, song_ids: List[ObjectId]) -> Dict[ObjectId, SongEntity]:
+        """Read songs by id; ids without a song are left out."""
+        rows = self.repo.get_song_rows(song_ids)
+        with span(MAP):
+            return {row["_id"]: song_entity_from_row(row) for row in rows}
 
 
 # Module-level singleton for convenience
@@ -0,0 +1,38 @@
+import functools
+import hmac
+from typing import Any, Callable, Optional, TypeVar, cast
+
+from flask import current_app, request
+
+from songs_api.exceptions.custom import NotFoundError, UnauthorizedError
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def admin_token_valid(provided: Optional[str], expected: str) -> bool:
+    """Compare a presented token with ADMIN_TOKEN in constant time."""
+    if not expected or provided is None:
+        return False
+    return hmac.compare_digest(provided.encode(), expected.encode())
+
+
+def admin_only(view: F) -> F:
+    """
+    Serve a view only to requests carrying the admin token.
+
+    Raises NotFoundError while no ADMIN_TOKEN is configured, so the endpoint
+    does not exist, and UnauthorizedError on a missing or wrong token.
+    """
+
+    @functools.wraps(view)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        expected = current_app.config.get("ADMIN_TOKEN", "")
+        if not expected:
+            raise NotFoundError("Not Found")
+        if not admin_token_valid(request.headers.get(ADMIN_TOKEN_HEADER), expected):
+            raise UnauthorizedError(f"Missing or invalid {ADMIN_TOKEN_HEADER}")
+        return view(*args, **kwargs)
+
+    return cast(F, wrapper)
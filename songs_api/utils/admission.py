@@ -0,0 +1,201 @@
+import json
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import Map
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import ClosingIterator
+
+from songs_api.config import Settings
+from songs_api.utils.metrics import (
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_QUEUE_WAIT,
+    ADMISSION_SHED,
+)
+from songs_api.utils.profiling import StartResponse, WSGIApp
+
+# Why a request was shed: too many already waiting, or waited too long
+QUEUE_FULL, TIMEOUT = "queue_full", "timeout"
+# Methods that don't write, and so can't use the slots reserved for writes
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class AdmissionController:
+    """
+    Admits requests while fewer than `max_in_flight` run in the process, and
+    fewer than `route_limits[route]` run for routes that have a limit
+    (0 means no global limit).
+
+    Requests over a limit wait up to `max_wait` seconds for a slot, at most
+    `max_queue` of them at a time; the others are shed at once. Reads may
+    only take `max_in_flight - write_reserve` slots, which keeps writes
+    flowing while reads pile up.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 0,
+        route_limits: Optional[Dict[str, int]] = None,
+        max_wait: float = 0.1,
+        max_queue: int = 64,
+        write_reserve: int = 0,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.route_limits = route_limits or {}
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.write_reserve = write_reserve
+        self.in_flight = 0
+        self.route_in_flight: Counter[str] = Counter()
+        self.waiting = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, route: str, write: bool = False) -> Optional[str]:
+        """
+        Take a slot for a request to `route`, waiting for one if need be.
+
+        Returns:
+            None once admitted (call `release` when done), otherwise why the
+            request was shed: QUEUE_FULL or TIMEOUT.
+        """
+        with self._cond:
+            if not self._has_room(route, write):
+                if self.waiting >= self.max_queue:
+                    return QUEUE_FULL
+                if not self._wait(route, write):
+                    return TIMEOUT
+            self.in_flight += 1
+            self.route_in_flight[route] += 1
+            return None
+
+    def release(self, route: str) -> None:
+        """Give back the slot of a finished request."""
+        with self._cond:
+            self.in_flight -= 1
+            self.route_in_flight[route] -= 1
+            self._cond.notify_all()
+
+    def _wait(self, route: str, write: bool) -> bool:
+        self.waiting += 1
+        depth = ADMISSION_QUEUE_DEPTH.labels(route)
+        depth.inc()
+        started_at = time.perf_counter()
+        try:
+            return self._cond.wait_for(
+                lambda: self._has_room(route, write),
+                timeout=self.max_wait,
+            )
+        finally:
+            self.waiting -= 1
+            depth.dec()
+            ADMISSION_QUEUE_WAIT.labels(route).observe(
+                time.perf_counter() - started_at,
+            )
+
+    def _has_room(self, route: str, write: bool) -> bool:
+        if self.max_in_flight > 0:
+            limit = self.max_in_flight - (0 if write else self.write_reserve)
+            if self.in_flight >= limit:
+                return False
+        route_limit = self.route_limits.get(route)
+        return route_limit is None or self.route_in_flight[route] < route_limit
+
+
+class AdmissionMiddleware:
+    """
+    WSGI middleware shedding load before the app does any work: requests
+    the controller doesn't admit get a 503 with a Retry-After header instead
+    of queuing until clients time out. Requests whose path starts with one
+    of `exempt` (health checks, metrics scrapes) are always served.
+
+    Routes are the URL rules of `url_map`, e.g. "/songs/search", so that
+    per-route limits and metrics don't depend on path parameters. A slot is
+    held until the response body is fully sent.
+    """
+
+    def __init__(
+        self,
+        app: WSGIApp,
+        controller: AdmissionController,
+        url_map: Map,
+        exempt: Sequence[str] = (),
+        retry_after: int = 1,
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.url_map = url_map
+        self.exempt = tuple(exempt)
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_settings(
+        cls,
+        app: WSGIApp,
+        url_map: Map,
+        config: Settings,
+    ) -> "AdmissionMiddleware":
+        """Wrap `app` as configured by the ADMISSION_* settings."""
+        controller = AdmissionController(
+            max_in_flight=config.ADMISSION_MAX_IN_FLIGHT,
+            route_limits=config.ADMISSION_ROUTE_LIMITS,
+            max_wait=config.ADMISSION_MAX_WAIT_MS / 1000,
+            max_queue=config.ADMISSION_MAX_QUEUE,
+            write_reserve=config.ADMISSION_WRITE_RESERVE,
+        )
+        return cls(
+            app,
+            controller,
+            url_map,
+            exempt=config.ADMISSION_EXEMPT_PATHS,
+            retry_after=config.ADMISSION_RETRY_AFTER,
+        )
+
+    def __call__(
+        self,
+        environ: Dict[str, Any],
+        start_response: StartResponse,
+    ) -> Iterable[bytes]:
+        """Serve the request if admitted, otherwise answer 503."""
+        if environ.get("PATH_INFO", "").startswith(self.exempt):
+            return self.app(environ, start_response)
+
+        route = self._route(environ)
+        write = environ.get("REQUEST_METHOD", "GET") not in READ_METHODS
+        reason = self.controller.acquire(route, write)
+        if reason is not None:
+            ADMISSION_SHED.labels(route, reason).inc()
+            return self._shed(environ, start_response)
+
+        try:
+            result = self.app(environ, start_response)
+        except BaseException:
+            self.controller.release(route)
+            raise
+        return ClosingIterator(result, lambda: self.controller.release(route))
+
+    def _route(self, environ: Dict[str, Any]) -> str:
+        try:
+            rule, _ = self.url_map.bind_to_environ(environ).match(return_rule=True)
+        except HTTPException:
+            return "unmatched"
+        return str(rule.rule)
+
+    def _shed(
+        self,
+        environ: Dict[str, Any],
+        start_response: StartResponse,
+    ) -> Iterable[bytes]:
+        body = {
+            "error": "Service Unavailable",
+            "message": "Server is overloaded, retry later",
+        }
+        response = Response(
+            json.dumps(body),
+            status=503,
+            headers={"Retry-After": str(self.retry_after)},
+            mimetype="application/json",
+        )
+        return response(environ, start_response)
@@ -0,0 +1,496 @@
+import functools
+import inspect
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from songs_api.config import settings
+from songs_api.utils.metrics import CACHE_INVALIDATIONS, CACHE_LOOKUPS
+from songs_api.utils.singleflight import SingleFlight
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class CacheBackend(Protocol):
+    """Storage behind one memoized method of one service instance."""
+
+    stats: CacheStats
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value)."""
+        ...
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store a value for `ttl` seconds."""
+        ...
+
+    def delete(self, key: Hashable) -> None:
+        """Drop a single entry, if present."""
+        ...
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        ...
+
+    def __len__(self) -> int: ...
+
+
+class CacheStore(Protocol):
+    """Storage shared beyond this process, invalidated by namespace."""
+
+    def delete(self, namespace: str, key: Hashable) -> None:
+        """Drop one entry of a namespace."""
+        ...
+
+    def clear(self, namespace: str) -> None:
+        """Drop every entry of a namespace."""
+        ...
+
+
+# Builds the backend of a namespace: (namespace, maxsize) -> backend
+CacheFactory = Callable[[str, int], CacheBackend]
+
+
+class LRUCache:
+    """Thread-safe LRU cache whose entries also expire after a TTL."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value); expired entries count as misses."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.stats.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return True, entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store a value for `ttl` seconds, evicting the least recently used."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Drop a single entry, if present."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self.stats.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class _Namespace:
+    """A memoized method's settings and the per-instance caches backing it."""
+
+    key: Callable[..., Hashable]
+    ttl: float
+    maxsize: int
+    version: Optional[Callable[..., Hashable]] = None
+    caches: "weakref.WeakSet[CacheBackend]" = field(default_factory=weakref.WeakSet)
+    flights: "weakref.WeakSet[SingleFlight]" = field(default_factory=weakref.WeakSet)
+    # Bumped by every invalidation, so values read before it aren't cached
+    generation: int = 0
+
+
+_namespaces: Dict[str, _Namespace] = {}
+# Shared stores that `invalidate` reaches even without a local backend on them
+_stores: List[CacheStore] = []
+
+
+def _default_key(*args: Any, **kwargs: Any) -> Hashable:
+    return args, tuple(sorted(kwargs.items()))
+
+
+def _backend(instance: Any, namespace: str, ns: _Namespace) -> CacheBackend:
+    """Return, creating it on first use, an instance's cache of a namespace."""
+    attr = f"_memo_{namespace}"
+    cache = instance.__dict__.get(attr)
+    if cache is None:
+        factory = getattr(instance, "cache_factory", None)
+        created = (
+            factory(namespace, ns.maxsize)
+            if factory is not None
+            else LRUCache(ns.maxsize)
+        )
+        cache = instance.__dict__.setdefault(attr, created)
+        ns.caches.add(cache)
+    return cast(CacheBackend, cache)
+
+
+def _stamp(ns: _Namespace, *args: Any, **kwargs: Any) -> Hashable:
+    """Return the version of the data a call reads, if the namespace has one."""
+    return ns.version(*args, **kwargs) if ns.version is not None else None
+
+
+def _lookup(
+    cache: CacheBackend,
+    cache_key: Hashable,
+    stamp: Hashable,
+) -> Tuple[bool, Any]:
+    """
+    Return (found, value) of a cached entry, which holds (stamp, value); an
+    entry computed under another version than `stamp` counts as missing.
+    """
+    found, entry = cache.get(cache_key)
+    # Entries of a shared store may predate the stamps
+    if found and isinstance(entry, tuple) and entry[0] == stamp:
+        return True, entry[1]
+    return False, None
+
+
+def _store(
+    cache: CacheBackend,
+    namespace: str,
+    ns: _Namespace,
+    cache_key: Hashable,
+    generation: int,
+    value: Any,
+) -> Any:
+    """
+    Cache a freshly computed value for the namespace's TTL, and return it.
+
+    `generation` is the namespace's generation from before the value was
+    computed: if the namespace was invalidated since, the value may predate
+    the change and is returned without being cached. The generation is
+    checked again once stored, in case an invalidation ran in between.
+    """
+    if ns.generation != generation:
+        return value
+    cache.set(cache_key, value, settings.CACHE_TTLS.get(namespace, ns.ttl))
+    if ns.generation != generation:
+        cache.delete(cache_key)
+    return value
+
+
+def _flight(instance: Any, namespace: str, ns: _Namespace) -> SingleFlight:
+    """Return, creating it on first use, an instance's misses in flight."""
+    attr = f"_flight_{namespace}"
+    flight = instance.__dict__.get(attr)
+    if flight is None:
+        flight = instance.__dict__.setdefault(attr, SingleFlight())
+        ns.flights.add(flight)
+    return cast(SingleFlight, flight)
+
+
+def memoize(
+    namespace: str,
+    ttl: float,
+    maxsize: int = 1024,
+    key: Optional[Callable[..., Hashable]] = None,
+    version: Optional[Callable[..., Hashable]] = None,
+) -> Callable[[F], F]:
+    """
+    Cache a service method's results per instance, with a TTL and LRU limit.
+
+    Args:
+      namespace: name used to invalidate the cache and report its counters;
+        `CACHE_TTLS[namespace]` overrides `ttl`
+      ttl: seconds a result stays fresh
+      maxsize: most results kept per instance
+      key: maps the method's arguments (without self) to a cache key, e.g.
+        to normalize free text; defaults to the arguments themselves
+      version: maps the method's arguments to the version stamp of the data
+        the result is read from (see utils.versions); a result is cached
+        with the stamp taken before it was computed, and only reused while
+        the stamp is unchanged
+
+    Results are kept in an in-process LRUCache, unless the instance has a
+    `cache_factory` attribute (a CacheFactory) providing another backend.
+    Concurrent misses of one key are coalesced: a single call runs and the
+    other callers share its result (see SingleFlight). Coroutine methods are
+    supported: their awaited results are cached.
+    """
+    ns = _namespaces.setdefault(
+        namespace,
+        _Namespace(
+            key=key or _default_key,
+            ttl=ttl,
+            maxsize=maxsize,
+            version=version,
+        ),
+    )
+    hits = CACHE_LOOKUPS.labels(namespace, "hit")
+    # Misses, by whether they shared the call of a concurrent caller
+    misses = {
+        False: CACHE_LOOKUPS.labels(namespace, "miss"),
+        True: CACHE_LOOKUPS.labels(namespace, "coalesced"),
+    }
+
+    def decorate(method: F) -> F:
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+                if not settings.CACHE_ENABLED:
+                    return await method(self, *args, **kwargs)
+
+                cache = _backend(self, namespace, ns)
+                cache_key = ns.key(*args, **kwargs)
+                stamp = _stamp(ns, *args, **kwargs)
+                found, value = _lookup(cache, cache_key, stamp)
+                if found:
+                    hits.inc()
+                    return value
+
+                async def load() -> Any:
+                    generation = ns.generation
+                    value = await method(self, *args, **kwargs)
+                    entry = (stamp, value)
+                    return _store(cache, namespace, ns, cache_key, generation, entry)
+
+                flight = _flight(self, namespace, ns)
+                (_, value), shared = await flight.do_async(cache_key, load)
+                misses[shared].inc()
+                return value
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(method)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            if not settings.CACHE_ENABLED:
+                return method(self, *args, **kwargs)
+
+            cache = _backend(self, namespace, ns)
+            cache_key = ns.key(*args, **kwargs)
+            stamp = _stamp(ns, *args, **kwargs)
+            found, value = _lookup(cache, cache_key, stamp)
+            if found:
+                hits.inc()
+                return value
+
+            # The generation argument is read before the method is called
+            (_, value), shared = _flight(self, namespace, ns).do(
+                cache_key,
+                lambda: _store(
+                    cache,
+                    namespace,
+                    ns,
+                    cache_key,
+                    ns.generation,
+                    (stamp, method(self, *args, **kwargs)),
+                ),
+            )
+            misses[shared].inc()
+            return value
+
+        return cast(F, wrapper)
+
+    return decorate
+
+
+def _lookup_many(
+    cache: CacheBackend,
+    ns: _Namespace,
+    keys: List[Hashable],
+) -> Tuple[Dict[Hashable, Any], Dict[Hashable, Any], List[Hashable]]:
+    """Return the version stamps of `keys`, their cached values and misses."""
+    stamps = {item: _stamp(ns, item) for item in keys}
+    values: Dict[Hashable, Any] = {}
+    missing: List[Hashable] = []
+    for item in keys:
+        found, value = _lookup(cache, ns.key(item), stamps[item])
+        if found:
+            values[item] = value
+        else:
+            missing.append(item)
+    return stamps, values, missing
+
+
+def _store_many(
+    cache: CacheBackend,
+    namespace: str,
+    ns: _Namespace,
+    generation: int,
+    stamps: Dict[Hashable, Any],
+    loaded: Dict[Hashable, Any],
+) -> None:
+    """Cache loaded values, each under the stamp taken before loading it."""
+    for item, value in loaded.items():
+        entry = (stamps.get(item), value)
+        _store(cache, namespace, ns, ns.key(item), generation, entry)
+
+
+def memoize_many(
+    namespace: str,
+    ttl: float,
+    maxsize: int = 1024,
+    key: Optional[Callable[[Any], Hashable]] = None,
+    version: Optional[Callable[[Any], Hashable]] = None,
+) -> Callable[[F], F]:
+    """
+    Read-through cache, per key, of a service method loading many keys at
+    once: the method gets the list of keys missing from the cache and
+    returns a dict of the values it found, which are cached one by one.
+
+    Args:
+      namespace: as for `memoize`; the namespace may be shared with a
+        `memoize`d method loading one key, so both read the same entries
+      ttl: seconds a value stays fresh
+      maxsize: most values kept per instance
+      key: maps one key to its cache key; defaults to the key itself
+      version: maps one key to the version stamp of its data, as for `memoize`
+
+    The wrapped method returns the values of every requested key that was
+    cached or found. Keys not found are not cached. Coroutine methods are
+    supported, as for `memoize`.
+    """
+    ns = _namespaces.setdefault(
+        namespace,
+        _Namespace(
+            key=key or (lambda item: item),
+            ttl=ttl,
+            maxsize=maxsize,
+            version=version,
+        ),
+    )
+    hits = CACHE_LOOKUPS.labels(namespace, "hit")
+    misses = CACHE_LOOKUPS.labels(namespace, "miss")
+
+    def decorate(method: F) -> F:
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(
+                self: Any,
+                keys: List[Hashable],
+            ) -> Dict[Hashable, Any]:
+                if not settings.CACHE_ENABLED:
+                    return cast(Dict[Hashable, Any], await method(self, keys))
+
+                cache = _backend(self, namespace, ns)
+                stamps, values, missing = _lookup_many(cache, ns, keys)
+                hits.inc(len(values))
+                misses.inc(len(missing))
+                if missing:
+                    generation = ns.generation
+                    loaded: Dict[Hashable, Any] = await method(self, missing)
+                    _store_many(cache, namespace, ns, generation, stamps, loaded)
+                    values.update(loaded)
+                return values
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(method)
+        def wrapper(self: Any, keys: List[Hashable]) -> Dict[Hashable, Any]:
+            if not settings.CACHE_ENABLED:
+                return cast(Dict[Hashable, Any], method(self, keys))
+
+            cache = _backend(self, namespace, ns)
+            stamps, values, missing = _lookup_many(cache, ns, keys)
+            hits.inc(len(values))
+            misses.inc(len(missing))
+            if missing:
+                generation = ns.generation
+                loaded: Dict[Hashable, Any] = method(self, missing)
+                _store_many(cache, namespace, ns, generation, stamps, loaded)
+                values.update(loaded)
+            return values
+
+        return cast(F, wrapper)
+
+    return decorate
+
+
+def invalidate(namespace: str, *args: Any, **kwargs: Any) -> None:
+    """
+    Drop cached results of a memoized method, in every instance and every
+    registered shared store.
+
+    With arguments, only the result for those arguments is dropped (they go
+    through the namespace's key function); without, the whole namespace is.
+    """
+    ns = _namespaces.get(namespace)
+    if ns is None:
+        return
+
+    CACHE_INVALIDATIONS.labels(namespace).inc()
+    ns.generation += 1
+    if args or kwargs:
+        cache_key = ns.key(*args, **kwargs)
+        for cache in list(ns.caches):
+            cache.delete(cache_key)
+        # Later callers must not join reads that started before the change
+        for flight in list(ns.flights):
+            flight.forget(cache_key)
+        for store in _stores:
+            store.delete(namespace, cache_key)
+    else:
+        for cache in list(ns.caches):
+            cache.clear()
+        for flight in list(ns.flights):
+            flight.forget()
+        for store in _stores:
+            store.clear(namespace)
+
+
+def register_store(store: CacheStore) -> None:
+    """Make `invalidate` also reach a shared store, e.g. from the importer."""
+    if store not in _stores:
+        _stores.append(store)
+
+
+def clear_all() -> None:
+    """Drop every memoized result."""
+    for namespace in _namespaces:
+        invalidate(namespace)
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Return hit/miss/eviction/invalidation counters, coalesced misses and
+    sizes per namespace.
+    """
+    report: Dict[str, Dict[str, int]] = {}
+    for namespace, ns in _namespaces.items():
+        totals = {**asdict(CacheStats()), "coalesced": 0, "size": 0}
+        for cache in list(ns.caches):
+            for name, count in asdict(cache.stats).items():
+                totals[name] += count
+            totals["size"] += len(cache)
+        for flight in list(ns.flights):
+            totals["coalesced"] += flight.coalesced
+        report[namespace] = totals
+    return report
@@ -0,0 +1,30 @@
+import hashlib
+import json
+from datetime import date
+
+
+def normalize_text(value: str) -> str:
+    """Case-fold and collapse whitespace so equivalent strings compare equal."""
+    return " ".join(value.casefold().split())
+
+
+def natural_key(artist: str, title: str, released: date) -> str:
+    """Return the stable identity of a catalog song, independent of its _id."""
+    raw = "\x1f".join(
+        (normalize_text(artist), normalize_text(title), released.isoformat()),
+    )
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def content_hash(
+    artist: str,
+    title: str,
+    difficulty: float,
+    level: int,
+    released: date,
+) -> str:
+    """Return a digest of every stored song field, to detect changed rows."""
+    raw = json.dumps(
+        [artist, title, float(difficulty), int(level), released.isoformat()],
+    )
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,88 @@
+import logging
+from typing import Any, Dict, Type, Union, cast
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+from pydantic import BaseModel
+from pydantic_core import from_json, to_json, to_jsonable_python
+
+from songs_api.config import JSONProviderType, Settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+def _fallback(obj: Any) -> Any:
+    # ObjectId and other types pydantic-core does not know render as strings
+    return str(obj)
+
+
+class PydanticJSONProvider(JSONProvider):
+    """
+    JSON provider serializing with pydantic-core.
+
+    Response models, dicts and lists are encoded to bytes in a single call
+    in Rust: models are not dumped to intermediate dicts first, and dates
+    are rendered without per-value Python calls.
+    """
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize `obj` to a JSON string."""
+        return self.dumps_bytes(obj).decode()
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Serialize `obj` to JSON bytes."""
+        return to_json(obj, fallback=_fallback)
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize JSON data."""
+        return from_json(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Build a JSON response without going through a str first."""
+        obj = self._prepare_response_obj(args, kwargs)
+        response_class = cast(Type[Response], self._app.response_class)
+        return response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+
+class OrjsonJSONProvider(PydanticJSONProvider):
+    """
+    Same as PydanticJSONProvider, but plain dicts and lists, and parsing of
+    request bodies, go through orjson.
+    """
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Serialize `obj` to JSON bytes."""
+        if isinstance(obj, BaseModel):
+            return to_json(obj, fallback=_fallback)
+        return orjson.dumps(
+            obj,
+            default=lambda value: to_jsonable_python(value, fallback=_fallback),
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize JSON data."""
+        return orjson.loads(s)
+
+
+PROVIDERS: Dict[JSONProviderType, Type[JSONProvider]] = {
+    JSONProviderType.FLASK: DefaultJSONProvider,
+    JSONProviderType.PYDANTIC: PydanticJSONProvider,
+    JSONProviderType.ORJSON: OrjsonJSONProvider,
+}
+
+
+def configure_json(app: Flask, config: Settings) -> None:
+    """Install the JSON provider selected by `JSON_PROVIDER` on the app."""
+    provider = config.JSON_PROVIDER
+    if provider is JSONProviderType.ORJSON and orjson is None:
+        logger.warning("orjson is not installed, using the pydantic JSON provider")
+        provider = JSONProviderType.PYDANTIC
+    app.json = PROVIDERS[provider](app)
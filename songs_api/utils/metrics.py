@@ -0,0 +1,235 @@
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Flask, Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from pymongo.monitoring import (
+    CommandFailedEvent,
+    CommandListener,
+    CommandStartedEvent,
+    CommandSucceededEvent,
+)
+
+# Metrics are process-local unless PROMETHEUS_MULTIPROC_DIR is set before
+# this module is imported; gunicorn.conf.py sets it so that /metrics sums
+# every worker.
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+MONGO_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+BATCH_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+HTTP_REQUESTS = Counter(
+    "songs_api_http_requests_total",
+    "HTTP requests served.",
+    ["blueprint", "route", "method", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "songs_api_http_request_duration_seconds",
+    "Time to produce a response, up to the first byte of streamed bodies.",
+    ["blueprint", "route", "method"],
+)
+HTTP_IN_FLIGHT = Gauge(
+    "songs_api_http_requests_in_flight",
+    "Requests being handled.",
+    ["blueprint", "route"],
+    multiprocess_mode="livesum",
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "songs_api_http_response_size_bytes",
+    "Size of response bodies with a known length.",
+    ["blueprint", "route"],
+    buckets=SIZE_BUCKETS,
+)
+MONGO_COMMANDS = Histogram(
+    "songs_api_mongo_command_duration_seconds",
+    "MongoDB command round trips, as timed by the driver.",
+    ["collection", "command"],
+    buckets=MONGO_BUCKETS,
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "songs_api_mongo_command_failures_total",
+    "MongoDB commands that returned an error.",
+    ["collection", "command"],
+)
+MONGO_POOL_WAIT = Histogram(
+    "songs_api_mongo_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection, failed checkouts included.",
+    buckets=MONGO_BUCKETS,
+)
+MONGO_POOL_TIMEOUTS = Counter(
+    "songs_api_mongo_pool_checkout_timeouts_total",
+    "Checkouts that gave up after waitQueueTimeoutMS.",
+)
+MONGO_POOL_IN_USE = Gauge(
+    "songs_api_mongo_pool_connections_in_use",
+    "Pooled connections checked out.",
+    multiprocess_mode="livesum",
+)
+MONGO_READS_ROUTED = Counter(
+    "songs_api_mongo_reads_routed_total",
+    "Repository reads by read name and read preference mode.",
+    ["operation", "mode"],
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "songs_api_admission_queue_depth",
+    "Requests waiting for an admission slot.",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    "songs_api_admission_queue_wait_seconds",
+    "Time requests over a concurrency limit waited, admitted or not.",
+    ["route"],
+    buckets=MONGO_BUCKETS,
+)
+ADMISSION_SHED = Counter(
+    "songs_api_admission_shed_total",
+    "Requests answered 503 by admission control, by reason.",
+    ["route", "reason"],
+)
+CACHE_LOOKUPS = Counter(
+    "songs_api_cache_lookups_total",
+    "Memoized service reads, by cache namespace and result.",
+    ["namespace", "result"],
+)
+CACHE_INVALIDATIONS = Counter(
+    "songs_api_cache_invalidations_total",
+    "Invalidations of one key or a whole cache namespace.",
+    ["namespace"],
+)
+
+WRITE_BUFFER_BATCH_SIZE = Histogram(
+    "songs_api_write_buffer_batch_size",
+    "Items per batch flushed by a write-behind buffer.",
+    ["buffer"],
+    buckets=BATCH_BUCKETS,
+)
+WRITE_BUFFER_FLUSH_SECONDS = Histogram(
+    "songs_api_write_buffer_flush_duration_seconds",
+    "Time to flush a write-behind batch, retries included.",
+    ["buffer"],
+    buckets=MONGO_BUCKETS,
+)
+WRITE_BUFFER_RETRIES = Counter(
+    "songs_api_write_buffer_retries_total",
+    "Write-behind batches written again after their flush raised.",
+    ["buffer"],
+)
+WRITE_BUFFER_ITEMS_LOST = Counter(
+    "songs_api_write_buffer_items_lost_total",
+    "Write-behind items not written: failed by the flush, dropped after "
+    "every retry, or rejected by a full buffer.",
+    ["buffer", "reason"],
+)
+
+
+class CommandTimer(CommandListener):
+    """Times MongoDB commands per collection and command name."""
+
+    def __init__(self) -> None:
+        # (connection, request id) -> collection of the command in flight
+        self._collections: Dict[Tuple[Any, int], str] = {}
+
+    def started(self, event: CommandStartedEvent) -> None:
+        """Remember which collection the command targets."""
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        self._collections[event.connection_id, event.request_id] = (
+            target if isinstance(target, str) else ""
+        )
+
+    def succeeded(self, event: CommandSucceededEvent) -> None:
+        """Observe the command's duration."""
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMANDS.labels(collection, event.command_name).observe(
+            event.duration_micros / 1e6,
+        )
+
+    def failed(self, event: CommandFailedEvent) -> None:
+        """Observe the command's duration and count the failure."""
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMANDS.labels(collection, event.command_name).observe(
+            event.duration_micros / 1e6,
+        )
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+
+
+command_timer = CommandTimer()
+
+
+def _route() -> Tuple[str, str]:
+    rule = request.url_rule
+    return request.blueprint or "", rule.rule if rule is not None else "unmatched"
+
+
+def init_metrics(app: Flask) -> None:
+    """Measure every request of the app, except scrapes of /metrics."""
+
+    @app.before_request
+    def start_timer() -> None:
+        if request.blueprint == "metrics":
+            return
+        g.metrics_route = _route()
+        g.metrics_started_at = time.perf_counter()
+        HTTP_IN_FLIGHT.labels(*g.metrics_route).inc()
+
+    @app.after_request
+    def observe(response: Response) -> Response:
+        if "metrics_route" not in g:
+            return response
+
+        blueprint, route = g.metrics_route
+        HTTP_LATENCY.labels(blueprint, route, request.method).observe(
+            time.perf_counter() - g.metrics_started_at,
+        )
+        HTTP_REQUESTS.labels(
+            blueprint,
+            route,
+            request.method,
+            response.status_code,
+        ).inc()
+        if response.content_length is not None:
+            HTTP_RESPONSE_SIZE.labels(blueprint, route).observe(
+                response.content_length,
+            )
+        return response
+
+    @app.teardown_request
+    def done(exc: Optional[BaseException]) -> None:
+        route = g.pop("metrics_route", None)
+        if route is not None:
+            HTTP_IN_FLIGHT.labels(*route).dec()
+
+
+def render_metrics() -> Response:
+    """Render every metric in the Prometheus text format."""
+    registry = REGISTRY
+    if MULTIPROC_DIR_ENV in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
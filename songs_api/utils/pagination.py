@@ -1,5 +1,9 @@
-from typing import Generic, List, TypeVar
+import base64
+import binascii
+from typing import Generic, List, Optional, TypeVar
 
+from bson import ObjectId
+from bson.errors import InvalidId
 from pydantic import BaseModel
 
 T = TypeVar("T")
@@ -10,3 +14,23 @@ class Page(BaseModel, Generic[T]):
     total: int
     page: int
     size: int
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(last_id: ObjectId) -> str:
+    """Encode the last seen ObjectId as an opaque, URL-safe cursor token."""
+    return base64.urlsafe_b64encode(last_id.binary).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> ObjectId:
+    """
+    Decode a cursor produced by `encode_cursor` back into an ObjectId.
+
+    Raises:
+      ValueError: if `cursor` is not a valid cursor token.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return ObjectId(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, InvalidId, UnicodeEncodeError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}") from None
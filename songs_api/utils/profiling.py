@@ -0,0 +1,242 @@
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from songs_api.config import Settings
+from songs_api.utils.admin import ADMIN_TOKEN_HEADER, admin_token_valid
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_FLAG = "_profile"
+ARTIFACT_HEADER = "X-Profile-Artifact"
+# On-demand modes: a cProfile summary as the response body, a .prof file, or
+# a collapsed-stack file from the sampling profiler
+SUMMARY, PSTATS, SAMPLE = "summary", "pstats", "sample"
+MODES = frozenset({SUMMARY, PSTATS, SAMPLE})
+# Functions listed in summaries
+SUMMARY_TOP = 40
+
+StartResponse = Callable[..., Any]
+WSGIApp = Callable[[Dict[str, Any], StartResponse], Iterable[bytes]]
+
+
+class StackSampler:
+    """
+    Sampling profiler of one thread: a background thread records the target
+    thread's stack every `interval` seconds, as collapsed stacks
+    (`outer;inner count` lines, the input of flamegraph tools).
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.001) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="stack-sampler",
+            daemon=True,
+        )
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Return the samples in collapsed-stack format."""
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # noqa: SLF001
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+
+def _collapse(frame: Optional[FrameType]) -> str:
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{Path(code.co_filename).name}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class ProfilerMiddleware:
+    """
+    WSGI middleware profiling single requests, around the whole Flask app:
+    routing, flask_pydantic validation, services, MongoEngine hydration and
+    the iteration of streamed bodies.
+
+    A request is profiled on demand when it carries the admin token and an
+    `X-Profile` header (or `_profile` query flag) naming a mode:
+
+    - summary: respond with the top cumulative functions instead of the body
+    - pstats: save a cProfile `.prof` file to `output_dir`
+    - sample: save collapsed stacks of a sampling profiler to `output_dir`
+
+    With `sample_every` N > 0, one in N other requests is also profiled to
+    a `.prof` file. Saved artifacts are named in the `X-Profile-Artifact`
+    response header. One request is profiled at a time per process, since
+    profilers hook the interpreter globally; others meanwhile run as usual.
+    """
+
+    def __init__(
+        self,
+        app: WSGIApp,
+        token: str = "",
+        output_dir: str = "",
+        sample_every: int = 0,
+    ) -> None:
+        self.app = app
+        self.token = token
+        self.output_dir = Path(output_dir)
+        self.sample_every = sample_every
+        self._busy = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, app: WSGIApp, config: Settings) -> "ProfilerMiddleware":
+        """Wrap `app` as configured by ADMIN_TOKEN and the PROFILE_* settings."""
+        return cls(
+            app,
+            token=config.ADMIN_TOKEN,
+            output_dir=config.PROFILE_DIR
+            or str(Path(tempfile.gettempdir()) / "songs-api-profiles"),
+            sample_every=config.PROFILE_SAMPLE_EVERY,
+        )
+
+    def __call__(
+        self,
+        environ: Dict[str, Any],
+        start_response: StartResponse,
+    ) -> Iterable[bytes]:
+        """Serve the request, profiled if asked for or sampled."""
+        mode = self._requested_mode(environ)
+        if mode is None and self._sampled():
+            mode = PSTATS
+        if mode is None or not self._busy.acquire(blocking=False):
+            return self.app(environ, start_response)
+
+        try:
+            return self._profile(mode, environ, start_response)
+        finally:
+            self._busy.release()
+
+    def _sampled(self) -> bool:
+        if self.sample_every <= 0:
+            return False
+        return random.randrange(self.sample_every) == 0  # noqa: S311
+
+    def _requested_mode(self, environ: Dict[str, Any]) -> Optional[str]:
+        mode = environ.get("HTTP_" + PROFILE_HEADER.upper().replace("-", "_"))
+        if mode is None:
+            query = parse_qs(environ.get("QUERY_STRING", ""))
+            mode = query.get(PROFILE_QUERY_FLAG, [None])[0]
+        if mode not in MODES:
+            return None
+
+        token = environ.get("HTTP_" + ADMIN_TOKEN_HEADER.upper().replace("-", "_"))
+        return mode if admin_token_valid(token, self.token) else None
+
+    def _profile(
+        self,
+        mode: str,
+        environ: Dict[str, Any],
+        start_response: StartResponse,
+    ) -> Iterable[bytes]:
+        captured: List[Tuple[str, List[Tuple[str, str]], Any]] = []
+
+        def capture(
+            status: str,
+            headers: List[Tuple[str, str]],
+            exc_info: Any = None,
+        ) -> Callable[[bytes], None]:
+            captured.append((status, headers, exc_info))
+            return lambda data: None
+
+        def run() -> List[bytes]:
+            result = self.app(environ, capture)
+            try:
+                return list(result)
+            finally:
+                close = getattr(result, "close", None)
+                if close is not None:
+                    close()
+
+        started_at = time.perf_counter()
+        if mode == SAMPLE:
+            with StackSampler(threading.get_ident()) as sampler:
+                body = run()
+            artifact = self._save(environ, "collapsed", sampler.collapsed().encode())
+        else:
+            profile = cProfile.Profile()
+            body = profile.runcall(run)
+            if mode == SUMMARY:
+                return self._summary(
+                    profile,
+                    captured[0][0],
+                    time.perf_counter() - started_at,
+                    start_response,
+                )
+            # What Profile.dump_stats writes, which only takes a path
+            profile.create_stats()
+            stats = marshal.dumps(profile.stats)  # type: ignore[attr-defined]
+            artifact = self._save(environ, "prof", stats)
+
+        status, headers, exc_info = captured[0]
+        start_response(status, [*headers, (ARTIFACT_HEADER, artifact)], exc_info)
+        return body
+
+    def _summary(
+        self,
+        profile: cProfile.Profile,
+        status: str,
+        seconds: float,
+        start_response: StartResponse,
+    ) -> List[bytes]:
+        text = io.StringIO()
+        text.write(f"Response status: {status}\nWall time: {seconds * 1e3:.1f} ms\n")
+        stats = pstats.Stats(profile, stream=text)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_TOP)
+        body = text.getvalue().encode()
+        start_response(
+            "200 OK",
+            [
+                ("Content-Type", "text/plain; charset=utf-8"),
+                ("Content-Length", str(len(body))),
+            ],
+        )
+        return [body]
+
+    def _save(self, environ: Dict[str, Any], suffix: str, data: bytes) -> str:
+        path = re.sub(r"[^A-Za-z0-9]+", "-", environ.get("PATH_INFO", "")).strip("-")
+        name = "-".join(
+            [
+                time.strftime("%Y%m%dT%H%M%S"),
+                environ.get("REQUEST_METHOD", "GET"),
+                path or "root",
+                f"{os.getpid()}",
+                uuid.uuid4().hex[:8],
+            ],
+        )
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        artifact = self.output_dir / f"{name}.{suffix}"
+        artifact.write_bytes(data)
+        return str(artifact)
@@ -0,0 +1,363 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Hashable, Iterator, List, Optional, Tuple
+
+from songs_api.config import CacheBackendType, Settings
+from songs_api.utils.cache import CacheStats, register_store
+
+MAGIC = b"SONGSC01"
+# magic, slot count, slot size
+_HEADER = struct.Struct("<8sII")
+# Namespace generation counters live right after the header; clearing a
+# namespace bumps its counter, which orphans every entry written before.
+GENERATIONS = 256
+_GENERATION = struct.Struct("<Q")
+_GENERATIONS_OFFSET = 64
+_SLOTS_OFFSET = _GENERATIONS_OFFSET + GENERATIONS * _GENERATION.size
+# seq, namespace id, key digest, generation, expires_at, payload length, crc32
+_SLOT = struct.Struct("<QQ16sQdII")
+# Slots per bucket; a key can live in any slot of its bucket
+WAYS = 4
+# Attempts at a consistent lock-free read before reporting a miss
+READ_RETRIES = 3
+_EMPTY_KEY = bytes(16)
+
+
+def _namespace_id(namespace: str) -> int:
+    digest = hashlib.blake2b(namespace.encode("utf-8"), digest_size=8).digest()
+    # 0 marks an empty slot
+    return int.from_bytes(digest, "little") or 1
+
+
+def _key_digest(namespace: str, key: Hashable) -> bytes:
+    # repr, unlike hash(), is stable across processes
+    raw = f"{namespace}\x1f{key!r}".encode()
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+class SharedMemoryCache:
+    """
+    Cache store shared by every process of a host through an mmap'd file.
+
+    The file holds a fixed number of fixed-size slots grouped in buckets of
+    `WAYS`. Readers never lock: each slot carries a sequence number that is
+    odd while a write is in progress (a seqlock) plus a CRC of its payload,
+    so a torn read is detected and retried. Writers lock only the bucket they
+    write to, with a thread lock stripe plus an fcntl record lock, so writes
+    to different buckets proceed in parallel across processes.
+
+    Entries are versioned by a per-namespace generation counter: clearing a
+    namespace bumps the counter and every process stops seeing its old
+    entries at once, without touching them.
+
+    The file is `<path>.<slots>x<slot_size>`: processes configured with
+    another geometry use another file, so a file in use is never resized.
+
+    Raises:
+      ValueError: if the file exists but isn't a cache of this geometry.
+    """
+
+    def __init__(self, path: str, slots: int = 4096, slot_size: int = 32768) -> None:
+        self.slot_size = slot_size
+        self.buckets = max(slots // WAYS, 1)
+        self.slots = self.buckets * WAYS
+        self.path = f"{path}.{self.slots}x{slot_size}"
+        self._size = _SLOTS_OFFSET + self.slots * slot_size
+        self._stripes = [threading.Lock() for _ in range(64)]
+        self._header_lock = threading.Lock()
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                self._initialize(fd)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._mm = mmap.mmap(fd, self._size, mmap.MAP_SHARED)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    @staticmethod
+    def default_path(config: Settings) -> str:
+        """CACHE_SHARED_PATH, or a file in /dev/shm (the temp dir without it)."""
+        if config.CACHE_SHARED_PATH:
+            return config.CACHE_SHARED_PATH
+        shm = Path("/dev/shm")  # noqa: S108
+        base = shm if shm.is_dir() else Path(tempfile.gettempdir())
+        return str(base / "songs-api-cache")
+
+    @classmethod
+    def from_settings(cls, config: Settings) -> "SharedMemoryCache":
+        """Open the store configured by the CACHE_SHARED_* settings."""
+        return cls(
+            cls.default_path(config),
+            config.CACHE_SHARED_SLOTS,
+            config.CACHE_SHARED_SLOT_SIZE,
+        )
+
+    def namespace(self, namespace: str, maxsize: int = 0) -> "SharedNamespace":
+        """Return the cache backend of one namespace (a CacheFactory)."""
+        return SharedNamespace(self, namespace)
+
+    def get(self, namespace: str, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) without taking any lock."""
+        ns_id = _namespace_id(namespace)
+        digest = _key_digest(namespace, key)
+        generation = self._generation(ns_id)
+        now = time.time()
+
+        for offset in self._bucket_offsets(digest):
+            found, value = self._read_slot(offset, ns_id, digest, generation, now)
+            if found:
+                return True, value
+        return False, None
+
+    def set(self, namespace: str, key: Hashable, value: Any, ttl: float) -> bool:
+        """
+        Store a value for `ttl` seconds.
+
+        Returns:
+          False if the value cannot be pickled, does not fit in a slot, or
+          another live entry had to be evicted to make room; True otherwise.
+        """
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        if _SLOT.size + len(payload) > self.slot_size:
+            return False
+
+        ns_id = _namespace_id(namespace)
+        digest = _key_digest(namespace, key)
+        generation = self._generation(ns_id)
+        now = time.time()
+
+        with self._bucket_locked(digest):
+            offset, evicted = self._pick_slot(digest, ns_id, now)
+            self._write_slot(
+                offset,
+                _SLOT.pack(
+                    0,
+                    ns_id,
+                    digest,
+                    generation,
+                    now + ttl,
+                    len(payload),
+                    zlib.crc32(payload),
+                )[_GENERATION.size :]
+                + payload,
+            )
+        return not evicted
+
+    def delete(self, namespace: str, key: Hashable) -> None:
+        """Drop one entry, in every process."""
+        ns_id = _namespace_id(namespace)
+        digest = _key_digest(namespace, key)
+        with self._bucket_locked(digest):
+            for offset in self._bucket_offsets(digest):
+                _, slot_ns, slot_key, *_ = _SLOT.unpack_from(self._mm, offset)
+                if slot_ns == ns_id and slot_key == digest:
+                    self._write_slot(offset, bytes(_SLOT.size - _GENERATION.size))
+
+    def clear(self, namespace: str) -> None:
+        """Drop every entry of a namespace, in every process."""
+        offset = self._generation_offset(_namespace_id(namespace))
+        with self._locked(self._header_lock, offset, _GENERATION.size):
+            (generation,) = _GENERATION.unpack_from(self._mm, offset)
+            _GENERATION.pack_into(self._mm, offset, generation + 1)
+
+    def count(self, namespace: str) -> int:
+        """Number of live entries of a namespace (scans every slot)."""
+        ns_id = _namespace_id(namespace)
+        generation = self._generation(ns_id)
+        now = time.time()
+        live = 0
+        for index in range(self.slots):
+            offset = _SLOTS_OFFSET + index * self.slot_size
+            _, slot_ns, _, slot_gen, expires_at, *_ = _SLOT.unpack_from(
+                self._mm,
+                offset,
+            )
+            if slot_ns == ns_id and slot_gen == generation and expires_at > now:
+                live += 1
+        return live
+
+    def close(self) -> None:
+        """Unmap the file; entries stay available to other processes."""
+        self._mm.close()
+        os.close(self._fd)
+
+    def _initialize(self, fd: int) -> None:
+        """Lay out the file if it was just created, else check its layout."""
+        expected = _HEADER.pack(MAGIC, self.slots, self.slot_size)
+        size = os.fstat(fd).st_size
+        if size == 0:
+            os.ftruncate(fd, self._size)
+            os.pwrite(fd, expected, 0)
+            return
+        # Other processes may have it mapped: never rewrite it
+        if os.pread(fd, _HEADER.size, 0) != expected or size != self._size:
+            raise ValueError(f"{self.path} is not a shared cache of this layout")
+
+    def _after_fork(self) -> None:
+        # Locks held by parent threads at fork time would never be released
+        self._stripes = [threading.Lock() for _ in range(64)]
+        self._header_lock = threading.Lock()
+
+    def _generation_offset(self, ns_id: int) -> int:
+        return _GENERATIONS_OFFSET + (ns_id % GENERATIONS) * _GENERATION.size
+
+    def _generation(self, ns_id: int) -> int:
+        offset = self._generation_offset(ns_id)
+        generation: int = _GENERATION.unpack_from(self._mm, offset)[0]
+        return generation
+
+    def _bucket_offsets(self, digest: bytes) -> List[int]:
+        bucket = int.from_bytes(digest[:8], "little") % self.buckets
+        first = _SLOTS_OFFSET + bucket * WAYS * self.slot_size
+        return [first + way * self.slot_size for way in range(WAYS)]
+
+    def _read_slot(
+        self,
+        offset: int,
+        ns_id: int,
+        digest: bytes,
+        generation: int,
+        now: float,
+    ) -> Tuple[bool, Any]:
+        for _ in range(READ_RETRIES):
+            seq, slot_ns, slot_key, slot_gen, expires_at, length, crc = (
+                _SLOT.unpack_from(self._mm, offset)
+            )
+            if seq % 2:
+                continue  # being written
+            if (
+                slot_ns != ns_id
+                or slot_key != digest
+                or slot_gen != generation
+                or expires_at <= now
+            ):
+                return False, None
+
+            start = offset + _SLOT.size
+            payload = self._mm[start : start + length]
+            if _GENERATION.unpack_from(self._mm, offset)[0] != seq:
+                continue  # overwritten while we were copying
+            if zlib.crc32(payload) != crc:
+                continue
+            # Only this host's workers can write the 0600 file we unpickle
+            return True, pickle.loads(payload)  # noqa: S301
+        return False, None
+
+    def _pick_slot(self, digest: bytes, ns_id: int, now: float) -> Tuple[int, bool]:
+        """Choose where to write `digest`; the bucket lock must be held."""
+        victim, victim_expiry = 0, float("inf")
+        for offset in self._bucket_offsets(digest):
+            _, slot_ns, slot_key, slot_gen, expires_at, *_ = _SLOT.unpack_from(
+                self._mm,
+                offset,
+            )
+            if slot_ns == ns_id and slot_key == digest:
+                return offset, False
+            if (
+                slot_key == _EMPTY_KEY
+                or expires_at <= now
+                or slot_gen != self._generation(slot_ns)
+            ):
+                return offset, False
+            if expires_at < victim_expiry:
+                victim, victim_expiry = offset, expires_at
+        return victim, True
+
+    def _write_slot(self, offset: int, body: bytes) -> None:
+        """Seqlock write of everything after the sequence number."""
+        (seq,) = _GENERATION.unpack_from(self._mm, offset)
+        _GENERATION.pack_into(self._mm, offset, seq + 1)
+        start = offset + _GENERATION.size
+        self._mm[start : start + len(body)] = body
+        _GENERATION.pack_into(self._mm, offset, seq + 2)
+
+    @contextmanager
+    def _bucket_locked(self, digest: bytes) -> Iterator[None]:
+        offsets = self._bucket_offsets(digest)
+        bucket = (offsets[0] - _SLOTS_OFFSET) // (WAYS * self.slot_size)
+        stripe = self._stripes[bucket % len(self._stripes)]
+        with self._locked(stripe, offsets[0], WAYS * self.slot_size):
+            yield
+
+    @contextmanager
+    def _locked(
+        self,
+        thread_lock: threading.Lock,
+        offset: int,
+        length: int,
+    ) -> Iterator[None]:
+        # fcntl record locks are per process, so threads need their own lock
+        with thread_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, offset)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, offset)
+
+
+class SharedNamespace:
+    """CacheBackend view of one namespace of a SharedMemoryCache."""
+
+    def __init__(self, store: SharedMemoryCache, namespace: str) -> None:
+        self.store = store
+        self.namespace = namespace
+        # Counted per process; entries themselves are shared
+        self.stats = CacheStats()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) from the shared store."""
+        found, value = self.store.get(self.namespace, key)
+        if found:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return found, value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store a value; values too large for a slot are simply not kept."""
+        if not self.store.set(self.namespace, key, value, ttl):
+            self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Drop one entry, in every process."""
+        self.store.delete(self.namespace, key)
+        self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry of the namespace, in every process."""
+        self.store.clear(self.namespace)
+        self.stats.invalidations += 1
+
+    def __len__(self) -> int:
+        return self.store.count(self.namespace)
+
+
+def open_shared_cache(config: Settings) -> Optional[SharedMemoryCache]:
+    """
+    Open the shared store when CACHE_BACKEND is "shared", and register it so
+    `invalidate` reaches it from this process.
+    """
+    if config.CACHE_BACKEND is not CacheBackendType.SHARED:
+        return None
+    store = SharedMemoryCache.from_settings(config)
+    register_store(store)
+    return store
@@ -0,0 +1,108 @@
+import asyncio
+import functools
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class _Call:
+    """One in-flight computation and what it produced."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the
+    computation, callers arriving while it runs wait for it and share its
+    result, or its exception. A key is forgotten as soon as its computation
+    ends, so a failure is only seen by the callers that waited on it.
+
+    Threads use `do` and coroutines `do_async`; they don't coalesce with
+    each other.
+    """
+
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run `fn` unless a call with `key` is already in flight.
+
+        Returns:
+            (result, whether it was shared from another caller's call)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    async def do_async(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, bool]:
+        """
+        Like `do`, for coroutines of one event loop.
+
+        The computation runs in a task of its own, which every caller awaits
+        through a shield: cancelling any caller, the first one included,
+        neither cancels the computation nor fails the others.
+        """
+        task = self._futures.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._futures[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task), shared
+
+    def _finished(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        if self._futures.get(key) is task:
+            del self._futures[key]
+        if not task.cancelled():
+            # Retrieved here, in case every caller was cancelled meanwhile
+            task.exception()
+
+    def forget(self, key: Optional[Hashable] = None) -> None:
+        """
+        Let the next call of `key` (of every key if None) start afresh
+        instead of joining a call in flight, e.g. once its data changed.
+        Callers already waiting still get the in-flight result.
+        """
+        with self._lock:
+            if key is None:
+                self._calls.clear()
+                self._futures.clear()
+            else:
+                self._calls.pop(key, None)
+                self._futures.pop(key, None)
@@ -0,0 +1,238 @@
+import functools
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, cast
+
+from flask import Flask, Response, request
+from flask_pydantic import validate
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Span categories, in Server-Timing order: request parsing by flask_pydantic,
+# the view body, services, repositories (MongoDB round trips and document
+# hydration), document-to-entity mapping and response serialization
+VALIDATE = "validate"
+VIEW = "view"
+SERVICE = "service"
+DB = "db"
+MAP = "map"
+SERIALIZE = "serialize"
+CATEGORIES = (VALIDATE, VIEW, SERVICE, DB, MAP, SERIALIZE)
+
+
+@dataclass
+class Span:
+    category: str
+    name: str
+    start: float
+    end: Optional[float] = None
+    # Index of the enclosing span in Trace.spans
+    parent: Optional[int] = None
+
+
+@dataclass
+class Trace:
+    """Spans of one request, in the order they were opened."""
+
+    started_at: float = field(default_factory=time.perf_counter)
+    spans: List[Span] = field(default_factory=list)
+    # Indexes of the spans still open, innermost last
+    stack: List[int] = field(default_factory=list)
+
+    def open(self, category: str, name: str) -> None:
+        """Open a span nested in the innermost open one."""
+        parent = self.stack[-1] if self.stack else None
+        self.stack.append(len(self.spans))
+        self.spans.append(Span(category, name, time.perf_counter(), parent=parent))
+
+    def close(self, depth: int = -1) -> None:
+        """Close the innermost span, or every span above `depth` open ones."""
+        depth = len(self.stack) - 1 if depth < 0 else depth
+        now = time.perf_counter()
+        while len(self.stack) > depth:
+            self.spans[self.stack.pop()].end = now
+
+    def self_times(self) -> Dict[str, float]:
+        """Seconds spent per category, excluding time in nested spans."""
+        durations = [(span.end or span.start) - span.start for span in self.spans]
+        times = dict.fromkeys(CATEGORIES, 0.0)
+        for span, duration in zip(self.spans, durations):
+            times[span.category] = times.get(span.category, 0.0) + duration
+            if span.parent is not None:
+                parent = self.spans[span.parent].category
+                times[parent] = times.get(parent, 0.0) - duration
+        return times
+
+    def to_record(self) -> Dict[str, Any]:
+        """Serializable spans, timed in milliseconds from the request start."""
+        return {
+            "spans": [
+                {
+                    "category": span.category,
+                    "name": span.name,
+                    "start_ms": round((span.start - self.started_at) * 1e3, 3),
+                    "duration_ms": round(
+                        ((span.end or span.start) - span.start) * 1e3,
+                        3,
+                    ),
+                    "parent": span.parent,
+                }
+                for span in self.spans
+            ],
+        }
+
+
+_current: ContextVar[Optional[Trace]] = ContextVar("songs_api_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    """Return the trace of the request being served, if tracing is on."""
+    return _current.get()
+
+
+@contextmanager
+def span(category: str, name: Optional[str] = None) -> Iterator[None]:
+    """Time the enclosed block as a span of the current trace, if any."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+
+    depth = len(trace.stack)
+    trace.open(category, name or category)
+    try:
+        yield
+    finally:
+        trace.close(depth)
+
+
+def traced(category: str) -> Callable[[F], F]:
+    """Time every call of a function as a span named after it."""
+
+    def decorate(func: F) -> F:
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            trace = _current.get()
+            if trace is None:
+                return func(*args, **kwargs)
+
+            depth = len(trace.stack)
+            trace.open(category, name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                trace.close(depth)
+
+        return cast(F, wrapper)
+
+    return decorate
+
+
+def traced_validate(
+    *args: Any,
+    **kwargs: Any,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    `flask_pydantic.validate`, splitting its time into spans: request
+    validation until the view runs, the view itself, then serialization of
+    the returned model.
+    """
+
+    def decorate(view: Callable[..., Any]) -> Callable[..., Any]:
+        name = view.__qualname__
+
+        @functools.wraps(view)
+        def inner(*a: Any, **kw: Any) -> Any:
+            trace = _current.get()
+            if trace is None:
+                return view(*a, **kw)
+
+            trace.close()
+            trace.open(VIEW, name)
+            try:
+                result = view(*a, **kw)
+            finally:
+                trace.close()
+            trace.open(SERIALIZE, name)
+            return result
+
+        validated = validate(*args, **kwargs)(inner)
+
+        @functools.wraps(view)
+        def outer(*a: Any, **kw: Any) -> Any:
+            trace = _current.get()
+            if trace is None:
+                return validated(*a, **kw)
+
+            depth = len(trace.stack)
+            trace.open(VALIDATE, name)
+            try:
+                return validated(*a, **kw)
+            finally:
+                trace.close(depth)
+
+        return outer
+
+    return decorate
+
+
+def server_timing(trace: Trace) -> str:
+    """Render a trace as a Server-Timing header value, in milliseconds."""
+    total = time.perf_counter() - trace.started_at
+    entries = [
+        f"{category};dur={seconds * 1e3:.3f}"
+        for category, seconds in trace.self_times().items()
+        if seconds > 0
+    ]
+    return ", ".join([*entries, f"total;dur={total * 1e3:.3f}"])
+
+
+def init_tracing(app: Flask, export_path: str = "") -> None:
+    """
+    Trace every request of the app: answer with a Server-Timing header and,
+    when `export_path` is set, append the spans to it as JSON lines.
+    """
+    exporter: Optional[logging.Logger] = None
+    if export_path:
+        exporter = logging.getLogger(f"{__name__}.{id(app)}")
+        exporter.propagate = False
+        exporter.setLevel(logging.INFO)
+        handler = logging.FileHandler(export_path)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        exporter.addHandler(handler)
+
+    @app.before_request
+    def start_trace() -> None:
+        _current.set(Trace())
+
+    @app.after_request
+    def add_server_timing(response: Response) -> Response:
+        trace = _current.get()
+        if trace is None:
+            return response
+
+        trace.close(0)
+        response.headers["Server-Timing"] = server_timing(trace)
+        if exporter is not None:
+            rule = request.url_rule
+            record = {
+                "ts": datetime.now(timezone.utc).isoformat(),
+                "method": request.method,
+                "route": rule.rule if rule is not None else "unmatched",
+                "status": response.status_code,
+                "duration_ms": round((time.perf_counter() - trace.started_at) * 1e3, 3),
+                **trace.to_record(),
+            }
+            exporter.info(json.dumps(record))
+        return response
+
+    @app.teardown_request
+    def end_trace(exc: Optional[BaseException]) -> None:
+        _current.set(None)
@@ -0,0 +1,219 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from typing import List, Protocol
+
+from songs_api.config import CacheBackendType, Settings
+from songs_api.utils.shared_cache import SharedMemoryCache
+
+MAGIC = b"SONGSV01"
+# magic, epoch, stripe count
+_HEADER = struct.Struct("<8s16sI")
+_COUNTER = struct.Struct("<Q")
+_COUNTERS_OFFSET = 64
+DEFAULT_STRIPES = 65536
+
+
+def _stripe(key: str, stripes: int) -> int:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % stripes
+
+
+class VersionStore(Protocol):
+    """
+    Version stamps of data scopes, e.g. the songs collection or one song's
+    ratings. Writers bump a scope after changing it; readers use the stamp to
+    tell whether anything changed since a client last saw it.
+
+    Scopes are hashed onto a fixed number of counters, so bumping one scope
+    may also bump a few unrelated ones; that only costs them a revalidation.
+    """
+
+    epoch: str
+
+    def get(self, scope: str) -> int:
+        """Return the current version of a scope."""
+        ...
+
+    def bump(self, scope: str) -> None:
+        """Mark a scope as changed."""
+        ...
+
+    def bump_all(self) -> None:
+        """Mark every scope as changed, e.g. after a bulk reload."""
+        ...
+
+
+class LocalVersions:
+    """
+    Version counters of this process only.
+
+    Only correct when a single process serves and writes the data; with
+    several workers, use SharedVersions.
+    """
+
+    def __init__(self, stripes: int = DEFAULT_STRIPES) -> None:
+        # Versions restart at 0 with the process; the epoch tells them apart
+        self.epoch = os.urandom(8).hex()
+        self._counters: List[int] = [0] * stripes
+        self._lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def get(self, scope: str) -> int:
+        """Return the current version of a scope."""
+        return self._counters[_stripe(scope, len(self._counters))]
+
+    def bump(self, scope: str) -> None:
+        """Mark a scope as changed."""
+        with self._lock:
+            self._counters[_stripe(scope, len(self._counters))] += 1
+
+    def bump_all(self) -> None:
+        """Mark every scope as changed."""
+        with self._lock:
+            self._counters = [version + 1 for version in self._counters]
+
+    def _after_fork(self) -> None:
+        # Workers forked from one parent count apart from here on, so they
+        # must not share an epoch
+        self.epoch = os.urandom(8).hex()
+        self._lock = threading.Lock()
+
+
+class SharedVersions:
+    """
+    Version counters shared by every process of a host through an mmap'd file,
+    so a write in one worker, or an import run, is seen by all workers.
+
+    The file is `<path>.<stripes>`, so processes counting with another
+    number of stripes never resize a file in use.
+
+    Raises:
+      ValueError: if the file exists but doesn't hold counters of this layout.
+    """
+
+    def __init__(self, path: str, stripes: int = DEFAULT_STRIPES) -> None:
+        self.path = f"{path}.{stripes}"
+        self.stripes = stripes
+        self._size = _COUNTERS_OFFSET + stripes * _COUNTER.size
+        self._lock = threading.Lock()
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                self.epoch = self._initialize(fd)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._mm = mmap.mmap(fd, self._size, mmap.MAP_SHARED)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    @classmethod
+    def from_settings(cls, config: Settings) -> "SharedVersions":
+        """Open the counters next to the shared cache file."""
+        return cls(SharedMemoryCache.default_path(config) + ".versions")
+
+    def get(self, scope: str) -> int:
+        """Return the current version of a scope."""
+        offset = _COUNTERS_OFFSET + _stripe(scope, self.stripes) * _COUNTER.size
+        version: int = _COUNTER.unpack_from(self._mm, offset)[0]
+        return version
+
+    def bump(self, scope: str) -> None:
+        """Mark a scope as changed, in every process."""
+        offset = _COUNTERS_OFFSET + _stripe(scope, self.stripes) * _COUNTER.size
+        # fcntl record locks are per process, so threads need their own lock
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, _COUNTER.size, offset)
+            try:
+                (version,) = _COUNTER.unpack_from(self._mm, offset)
+                _COUNTER.pack_into(self._mm, offset, version + 1)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, _COUNTER.size, offset)
+
+    def bump_all(self) -> None:
+        """Mark every scope as changed, in every process."""
+        length = self.stripes * _COUNTER.size
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, _COUNTERS_OFFSET)
+            try:
+                for offset in range(_COUNTERS_OFFSET, self._size, _COUNTER.size):
+                    (version,) = _COUNTER.unpack_from(self._mm, offset)
+                    _COUNTER.pack_into(self._mm, offset, version + 1)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, _COUNTERS_OFFSET)
+
+    def close(self) -> None:
+        """Unmap the file; counters stay available to other processes."""
+        self._mm.close()
+        os.close(self._fd)
+
+    def _initialize(self, fd: int) -> str:
+        """Lay out the file if it was just created; return its epoch."""
+        size = os.fstat(fd).st_size
+        if size == 0:
+            epoch = os.urandom(16)
+            os.ftruncate(fd, self._size)
+            os.pwrite(fd, _HEADER.pack(MAGIC, epoch, self.stripes), 0)
+            return epoch.hex()
+
+        # Other processes may have it mapped: never rewrite it
+        magic, epoch, stripes = _HEADER.unpack(
+            os.pread(fd, _HEADER.size, 0).ljust(_HEADER.size, b"\0"),
+        )
+        if magic != MAGIC or stripes != self.stripes or size != self._size:
+            raise ValueError(f"{self.path} doesn't hold version counters")
+        return epoch.hex()
+
+    def _after_fork(self) -> None:
+        # A lock held by a parent thread at fork time would never be released
+        self._lock = threading.Lock()
+
+
+# Scope of the songs collection; ratings are versioned per song
+SONGS_SCOPE = "songs"
+
+
+def ratings_scope(song_id: str) -> str:
+    """Version scope of one song's ratings."""
+    return f"ratings:{song_id}"
+
+
+versions: VersionStore = LocalVersions()
+
+
+def configure_versions(config: Settings) -> VersionStore:
+    """
+    Share version counters across processes when CACHE_BACKEND is "shared"
+    or ETAGS_ENABLED is set: a client may revalidate an ETag with any
+    worker, after writes by any other one or by the importer.
+    """
+    global versions  # noqa: PLW0603
+
+    shared = config.CACHE_BACKEND is CacheBackendType.SHARED or config.ETAGS_ENABLED
+    if shared and not isinstance(versions, SharedVersions):
+        versions = SharedVersions.from_settings(config)
+    return versions
+
+
+def bump(*scopes: str) -> None:
+    """Mark scopes as changed."""
+    for scope in scopes:
+        versions.bump(scope)
+
+
+def bump_all() -> None:
+    """Mark every scope as changed."""
+    versions.bump_all()
+
+
+def current(scope: str) -> str:
+    """Return an opaque stamp that changes whenever `scope` does."""
+    return f"{versions.epoch}-{versions.get(scope)}"
@@ -0,0 +1,108 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+pytest.importorskip("quart")
+
+from songs_api.aio.client import use_async_db
+from songs_api.aio.main import create_async_app
+from songs_api.db.client import get_collection
+from songs_api.db.models.song import Song
+
+
+class ThreadedCursor:
+    """AsyncCursor stand-in running a sync pymongo (or mongomock) cursor."""
+
+    def __init__(self, cursor: Any) -> None:
+        self._cursor = cursor
+
+    def sort(self, *args: Any) -> "ThreadedCursor":
+        """Sort the results."""
+        self._cursor = self._cursor.sort(*args)
+        return self
+
+    def skip(self, skip: int) -> "ThreadedCursor":
+        """Skip results."""
+        self._cursor = self._cursor.skip(skip)
+        return self
+
+    def limit(self, limit: int) -> "ThreadedCursor":
+        """Limit results."""
+        self._cursor = self._cursor.limit(limit)
+        return self
+
+    async def to_list(self, length: Any = None) -> Any:
+        """Return every result."""
+        return await asyncio.to_thread(list, self._cursor)
+
+    def __aiter__(self) -> "ThreadedCursor":
+        return self
+
+    async def __anext__(self) -> Any:
+        row = await asyncio.to_thread(next, self._cursor, None)
+        if row is None:
+            raise StopAsyncIteration
+        return row
+
+    async def close(self) -> None:
+        """Close the cursor."""
+        self._cursor.close()
+
+
+class ThreadedCollection:
+    """AsyncCollection stand-in running sync pymongo calls in a thread."""
+
+    def __init__(self, collection: Any) -> None:
+        self._collection = collection
+
+    def find(self, *args: Any, **kwargs: Any) -> ThreadedCursor:
+        """Return a cursor over matching documents."""
+        kwargs.pop("batch_size", None)
+        return ThreadedCursor(self._collection.find(*args, **kwargs))
+
+    async def aggregate(self, pipeline: Any) -> ThreadedCursor:
+        """Run an aggregation pipeline."""
+        return ThreadedCursor(
+            await asyncio.to_thread(self._collection.aggregate, pipeline),
+        )
+
+    def with_options(self, **kwargs: Any) -> "ThreadedCollection":
+        """Return the collection with other options, e.g. a read preference."""
+        return ThreadedCollection(self._collection.with_options(**kwargs))
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        method = getattr(self._collection, name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        return call
+
+
+class ThreadedDatabase:
+    """AsyncDatabase stand-in over the database the sync tests use."""
+
+    def __init__(self, database: Any) -> None:
+        self._database = database
+
+    def __getitem__(self, name: str) -> ThreadedCollection:
+        return ThreadedCollection(self._database[name])
+
+    async def command(self, *args: Any, **kwargs: Any) -> Any:
+        """Run a database command."""
+        return await asyncio.to_thread(self._database.command, *args, **kwargs)
+
+
+@pytest.fixture
+def async_app(app, test_settings):
+    """Async app served from the sync tests' database through a stand-in."""
+    use_async_db(ThreadedDatabase(get_collection(Song).database))
+    yield create_async_app(config=test_settings)
+    use_async_db(None)
+
+
+@pytest.fixture
+def async_client(async_app):
+    """Test client of the async app."""
+    return async_app.test_client()
@@ -0,0 +1,207 @@
+import asyncio
+import json
+from typing import Any, Tuple
+
+from songs_api.aio import client as aio_client
+from songs_api.aio.main import create_async_app
+from songs_api.config import Settings, settings
+from songs_api.db.client import get_collection
+from songs_api.db.models.rating_summary import RatingSummary
+from songs_api.db.models.song import Song
+
+
+def test_get_songs_matches_sync_app(client, async_client, create_songs) -> None:
+    """Test the async app lists the same songs as the sync app."""
+
+    async def fetch() -> Tuple[int, Any]:
+        response = await async_client.get("/songs?size=2")
+        return response.status_code, await response.get_json()
+
+    # Arrange
+    expected = json.loads(client.get("/songs?size=2").data)
+
+    # Act
+    status, data = asyncio.run(fetch())
+
+    # Assert
+    assert status == 200
+    assert data == expected
+    assert data["next_cursor"]
+
+
+def test_get_songs_invalid_query(async_client) -> None:
+    """Test invalid query parameters get a 400 with validation errors."""
+
+    async def fetch() -> Tuple[int, Any]:
+        response = await async_client.get("/songs?page=0")
+        return response.status_code, await response.get_json()
+
+    # Act
+    status, data = asyncio.run(fetch())
+
+    # Assert
+    assert status == 400
+    assert data["validation_error"]["query_params"][0]["loc"] == ["page"]
+
+
+def test_get_songs_by_ids_matches_sync_app(
+    client,
+    async_client,
+    create_songs,
+) -> None:
+    """Test the async app fetches songs by id like the sync app."""
+    ids = ",".join([str(create_songs[1].id), "missing", str(create_songs[0].id)])
+
+    async def fetch() -> Tuple[int, Any]:
+        response = await async_client.get(f"/songs?ids={ids}")
+        return response.status_code, await response.get_json()
+
+    # Arrange
+    expected = json.loads(client.get(f"/songs?ids={ids}").data)
+
+    # Act
+    status, data = asyncio.run(fetch())
+
+    # Assert
+    assert status == 200
+    assert data == expected
+    assert [item["id"] for item in data["items"]] == [
+        str(create_songs[1].id),
+        str(create_songs[0].id),
+    ]
+    assert data["missing"] == ["missing"]
+
+
+def test_get_song(async_client, create_song) -> None:
+    """Test GET /songs/<id> on the async app, and a 404 for unknown ids."""
+    song_id = str(create_song.id)
+
+    async def fetch() -> Tuple[Any, int]:
+        found = await async_client.get(f"/songs/{song_id}")
+        missing = await async_client.get("/songs/not-an-id")
+        return await found.get_json(), missing.status_code
+
+    # Act
+    song, missing_status = asyncio.run(fetch())
+
+    # Assert
+    assert song["id"] == song_id
+    assert song["title"] == create_song.title
+    assert missing_status == 404
+
+
+def test_get_average_difficulty(async_client, create_songs) -> None:
+    """Test GET /songs/difficulty on the async app."""
+
+    async def fetch() -> Any:
+        response = await async_client.get("/songs/difficulty?level=5")
+        return await response.get_json()
+
+    # Act
+    data = asyncio.run(fetch())
+
+    # Assert
+    assert data == {"average_difficulty": 5.0}
+
+
+def test_export_songs(async_client, create_songs) -> None:
+    """Test GET /songs/export streams NDJSON on the async app."""
+
+    async def fetch() -> Tuple[str, bytes]:
+        response = await async_client.get("/songs/export?level=10")
+        return response.mimetype, await response.get_data()
+
+    # Act
+    mimetype, body = asyncio.run(fetch())
+
+    # Assert
+    assert mimetype == "application/x-ndjson"
+    assert [json.loads(line)["level"] for line in body.splitlines()] == [10]
+
+
+def test_create_rating_and_stats(async_client, create_song) -> None:
+    """Test a rating added on the async app shows up in its stats."""
+    song_id = str(create_song.id)
+
+    async def rate_and_fetch() -> Tuple[int, Any]:
+        await async_client.get(f"/ratings/{song_id}/stats")
+        created = await async_client.post(
+            "/ratings",
+            json={"song_id": song_id, "rating": 4},
+        )
+        stats = await async_client.get(f"/ratings/{song_id}/stats")
+        return created.status_code, await stats.get_json()
+
+    # Act
+    status, stats = asyncio.run(rate_and_fetch())
+
+    # Assert
+    assert status == 200
+    assert stats == {"average": 4.0, "lowest": 4, "highest": 4}
+
+
+def test_create_rating_invalid_song(async_client) -> None:
+    """Test an invalid song id gets a 404."""
+
+    async def post() -> int:
+        response = await async_client.post(
+            "/ratings",
+            json={"song_id": "not-an-id", "rating": 4},
+        )
+        return response.status_code
+
+    # Act & Assert
+    assert asyncio.run(post()) == 404
+
+
+def test_health(async_client) -> None:
+    """Test the async health check pings the database."""
+
+    async def fetch() -> int:
+        return (await async_client.get("/health")).status_code
+
+    # Act & Assert
+    assert asyncio.run(fetch()) == 200
+
+
+def test_async_client_uses_app_settings() -> None:
+    """Test the async client connects with the settings given to the app."""
+    # Arrange
+    config = Settings(
+        MONGO_URI="mongodb://db.example:27017/other_songs_db",
+        MONGO_MAX_POOL_SIZE=7,
+        METRICS_ENABLED=False,
+    )
+    create_async_app(config=config)
+    aio_client.use_async_db(None)
+
+    # Act
+    try:
+        db = aio_client.get_async_db()
+    finally:
+        asyncio.run(aio_client.close_async_db())
+        aio_client.configure_async_db(settings)
+
+    # Assert
+    assert db.name == "other_songs_db"
+    assert db.client.options.pool_options.max_pool_size == 7
+
+
+def test_startup_creates_indexes(async_app) -> None:
+    """Test serving starts by building the indexes of every collection."""
+
+    async def serve() -> None:
+        await async_app.startup()
+        await async_app.shutdown()
+
+    # Act
+    asyncio.run(serve())
+
+    # Assert
+    summaries = get_collection(RatingSummary).index_information()
+    assert any(
+        index.get("unique") and index["key"] == [("song_id", 1)]
+        for index in summaries.values()
+    )
+    songs = get_collection(Song).index_information()
+    assert any("text" in dict(index["key"]).values() for index in songs.values())
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from songs_api.db.slow_queries import SlowQueryLog
+from tests.db.test_slow_queries import run_command
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def admin_app(app, tmp_path):
+    """Enable the admin endpoints with a token and a fresh slow-query log."""
+    path = str(tmp_path / "slow.jsonl")
+    saved = {key: app.config[key] for key in ("ADMIN_TOKEN", "SLOW_QUERY_LOG_PATH")}
+    app.config.update({"ADMIN_TOKEN": TOKEN, "SLOW_QUERY_LOG_PATH": path})
+    yield path
+    app.config.update(saved)
+
+
+def test_slow_queries_hidden_without_admin_token(client) -> None:
+    """Test admin endpoints don't exist until ADMIN_TOKEN is set."""
+    # Act
+    response = client.get("/admin/slow-queries")
+
+    # Assert
+    assert response.status_code == 404
+
+
+def test_slow_queries_wrong_token(client, admin_app) -> None:
+    """Test a wrong admin token is rejected."""
+    # Act
+    response = client.get("/admin/slow-queries", headers={"X-Admin-Token": "nope"})
+
+    # Assert
+    assert response.status_code == 401
+
+
+def test_slow_queries_top_shapes(client, admin_app) -> None:
+    """Test the slowest query shapes are listed."""
+    # Arrange
+    log = SlowQueryLog(admin_app, threshold_ms=0, explain_rate=0)
+    run_command(log, 1, {"find": "song", "filter": {"level": 1}}, millis=30)
+    run_command(log, 2, {"aggregate": "song", "pipeline": []}, millis=90)
+    log.close()
+
+    # Act
+    response = client.get(
+        "/admin/slow-queries?limit=1",
+        headers={"X-Admin-Token": TOKEN},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    shapes = json.loads(response.data)["shapes"]
+    assert len(shapes) == 1
+    assert shapes[0]["command"] == "aggregate"
+    assert shapes[0]["max_ms"] == 90.0
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from prometheus_client import REGISTRY
+from pymongo.monitoring import CommandStartedEvent, CommandSucceededEvent
+
+from songs_api.utils.metrics import CommandTimer
+
+
+def test_metrics_count_requests(client, create_songs) -> None:
+    """Test /metrics reports requests per blueprint route."""
+    # Arrange
+    labels = {"blueprint": "songs", "route": "/songs", "method": "GET"}
+    before = (
+        REGISTRY.get_sample_value(
+            "songs_api_http_requests_total",
+            {**labels, "status": "200"},
+        )
+        or 0
+    )
+
+    # Act
+    client.get("/songs")
+    response = client.get("/metrics")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert b"songs_api_http_request_duration_seconds_bucket" in response.data
+    assert b"songs_api_http_response_size_bytes_bucket" in response.data
+    assert (
+        REGISTRY.get_sample_value(
+            "songs_api_http_requests_total",
+            {**labels, "status": "200"},
+        )
+        == before + 1
+    )
+    assert (
+        REGISTRY.get_sample_value(
+            "songs_api_http_requests_in_flight",
+            {"blueprint": "songs", "route": "/songs"},
+        )
+        == 0
+    )
+
+
+def test_command_timer_labels_collection() -> None:
+    """Test MongoDB commands are timed per collection and command name."""
+    # Arrange
+    timer = CommandTimer()
+    labels = {"collection": "tests_song", "command": "find"}
+    before = (
+        REGISTRY.get_sample_value(
+            "songs_api_mongo_command_duration_seconds_count",
+            labels,
+        )
+        or 0
+    )
+
+    # Act
+    timer.started(
+        CommandStartedEvent({"find": "tests_song"}, "songs", 7, ("db", 27017), 7),
+    )
+    timer.succeeded(
+        CommandSucceededEvent(
+            timedelta(milliseconds=3),
+            {"ok": 1},
+            "find",
+            7,
+            ("db", 27017),
+            7,
+        ),
+    )
+
+    # Assert
+    assert (
+        REGISTRY.get_sample_value(
+            "songs_api_mongo_command_duration_seconds_count",
+            labels,
+        )
+        == before + 1
+    )
+    assert (
+        REGISTRY.get_sample_value(
+            "songs_api_mongo_command_duration_seconds_sum",
+            labels,
+        )
+        >= 0.003
+    )
@@ -0,0 +1,108 @@
+import json
+
+from songs_api.db.models.rating import Rating
+
+
+def test_create_ratings_batch(client, create_song) -> None:
+    """Test POST /ratings/batch with a JSON array."""
+    # Arrange
+    song_id = str(create_song.id)
+    body = [
+        {"song_id": song_id, "rating": 5},
+        {"song_id": song_id, "rating": 9},
+        {"song_id": "not-a-valid-id", "rating": 3},
+        {"song_id": song_id, "rating": 1},
+    ]
+
+    # Act
+    response = client.post("/ratings/batch", json=body)
+    data = json.loads(response.data)
+
+    # Assert
+    assert response.status_code == 200
+    assert data["inserted"] == 2
+    assert data["failed"] == [1, 2]
+    assert [item["index"] for item in data["results"]] == [0, 1, 2, 3]
+    assert data["results"][0]["id"]
+    assert "rating" in data["results"][1]["error"]
+    assert "Invalid song_id" in data["results"][2]["error"]
+    assert Rating.objects.count() == 2
+
+    stats = json.loads(client.get(f"/ratings/{song_id}/stats").data)
+    assert stats == {"average": 3.0, "lowest": 1, "highest": 5}
+
+
+def test_create_ratings_batch_ndjson(client, create_song) -> None:
+    """Test POST /ratings/batch with an NDJSON body."""
+    # Arrange
+    song_id = str(create_song.id)
+    body = "\n".join(
+        [
+            json.dumps({"song_id": song_id, "rating": 4}),
+            "{not json",
+            "",
+            json.dumps({"song_id": song_id, "rating": 2}),
+        ],
+    )
+
+    # Act
+    response = client.post(
+        "/ratings/batch",
+        data=body,
+        content_type="application/x-ndjson",
+    )
+    data = json.loads(response.data)
+
+    # Assert
+    assert response.status_code == 200
+    assert data["inserted"] == 2
+    assert data["failed"] == [1]
+    assert data["results"][1]["error"] == "Invalid JSON"
+
+
+def test_create_ratings_batch_not_a_list(client) -> None:
+    """Test POST /ratings/batch rejects a body that is not an array."""
+    # Act
+    response = client.post("/ratings/batch", json={"song_id": "x", "rating": 1})
+    data = json.loads(response.data)
+
+    # Assert
+    assert response.status_code == 400
+    assert data["error"] == "Bad Request"
+
+
+def test_create_ratings_batch_too_large(client, valid_object_id) -> None:
+    """Test POST /ratings/batch rejects batches over the configured maximum."""
+    # Arrange
+    body = [{"song_id": valid_object_id, "rating": 3}] * 1001
+
+    # Act
+    response = client.post("/ratings/batch", json=body)
+
+    # Assert
+    assert response.status_code == 400
+    assert Rating.objects.count() == 0
+
+
+def test_get_rating_stats_conditional(app, client, create_song, monkeypatch) -> None:
+    """Test a song's stats ETag changes only when that song gets a rating."""
+    # Arrange
+    monkeypatch.setitem(app.config, "ETAGS_ENABLED", True)
+    song_id = str(create_song.id)
+    etag = client.get(f"/ratings/{song_id}/stats").headers["ETag"]
+
+    # Act
+    not_modified = client.get(
+        f"/ratings/{song_id}/stats",
+        headers={"If-None-Match": etag},
+    )
+    client.post("/ratings", json={"song_id": song_id, "rating": 4})
+    changed = client.get(
+        f"/ratings/{song_id}/stats",
+        headers={"If-None-Match": etag},
+    )
+
+    # Assert
+    assert not_modified.status_code == 304
+    assert changed.status_code == 200
+    assert json.loads(changed.data)["average"] == 4
@@ -1,5 +1,7 @@
 import json
 
+from songs_api.services.song_service import invalidate_catalog, song_service
+
 
 def test_get_songs(client, create_songs) -> None:
     """Test GET /songs endpoint."""
@@ -31,6 +33,56 @@ def test_get_songs_pagination(client, create_songs) -> None:
     assert data["size"] == 1
 
 
+def test_get_songs_cursor_pagination(client, create_songs) -> None:
+    """Test walking GET /songs with next_cursor tokens."""
+    # Act - first page
+    response = client.get("/songs?size=2")
+    data = json.loads(response.data)
+
+    # Assert
+    assert response.status_code == 200
+    assert len(data["items"]) == 2
+    assert data["next_cursor"]
+
+    # Act - follow the cursor
+    response = client.get(f"/songs?size=2&cursor={data['next_cursor']}")
+    next_data = json.loads(response.data)
+
+    # Assert
+    assert response.status_code == 200
+    assert len(next_data["items"]) == 1
+    assert next_data["next_cursor"] is None
+    assert next_data["total"] == len(create_songs)
+    seen = {item["id"] for item in data["items"] + next_data["items"]}
+    assert seen == {str(song.id) for song in create_songs}
+
+
+def test_get_songs_invalid_cursor(client) -> None:
+    """Test GET /songs with an invalid cursor."""
+    # Act
+    response = client.get("/songs?cursor=not-a-cursor")
+    data = json.loads(response.data)
+
+    # Assert
+    assert response.status_code == 400
+    assert data["error"] == "Bad Request"
+
+
+def test_get_songs_raw_reads(client, create_songs, monkeypatch) -> None:
+    """Test the raw read path renders the same response as the default one."""
+    # Arrange
+    expected = json.loads(client.get("/songs").data)
+    invalidate_catalog()
+    monkeypatch.setattr(song_service, "raw_reads", True)
+
+    # Act
+    response = client.get("/songs")
+
+    # Assert
+    assert response.status_code == 200
+    assert json.loads(response.data) == expected
+
+
 def test_get_average_difficulty(client, create_songs) -> None:
     """Test GET /songs/difficulty endpoint."""
     # Act
@@ -89,3 +141,120 @@ def test_search_songs_missing_message(client) -> None:
     # Assert
     assert response.status_code == 400
     assert "validation_error" in data
+
+
+def test_get_songs_conditional(app, client, create_songs, monkeypatch) -> None:
+    """Test If-None-Match gets a 304 until the catalog changes."""
+    # Arrange
+    monkeypatch.setitem(app.config, "ETAGS_ENABLED", True)
+    first = client.get("/songs?size=2")
+    etag = first.headers["ETag"]
+
+    # Act - unchanged catalog; the service must not be reached
+    with monkeypatch.context() as m:
+        m.setattr(song_service, "list_songs", None)
+        not_modified = client.get("/songs?size=2", headers={"If-None-Match": etag})
+    other_page = client.get("/songs?size=1", headers={"If-None-Match": etag})
+    invalidate_catalog()
+    changed = client.get("/songs?size=2", headers={"If-None-Match": etag})
+
+    # Assert
+    assert first.status_code == 200
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+    assert not_modified.data == b""
+    assert other_page.status_code == 200
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_export_songs(client, create_songs) -> None:
+    """Test GET /songs/export streams one JSON song per line."""
+    # Act
+    response = client.get("/songs/export")
+    lines = response.data.decode().splitlines()
+
+    # Assert
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    songs = [json.loads(line) for line in lines]
+    assert sorted(song["id"] for song in songs) == sorted(
+        str(song.id) for song in create_songs
+    )
+    assert set(songs[0]) == {"id", "artist", "title", "difficulty", "level", "released"}
+
+
+def test_export_songs_filtered(client, create_songs) -> None:
+    """Test GET /songs/export pushes level and release filters down."""
+    # Arrange
+    released = create_songs[1].released.isoformat()
+
+    # Act
+    by_level = client.get("/songs/export?level=5")
+    by_date = client.get(
+        f"/songs/export?released_from={released}&released_to={released}",
+    )
+    invalid = client.get("/songs/export?released_from=yesterday")
+
+    # Assert
+    assert [json.loads(line)["level"] for line in by_level.data.splitlines()] == [5]
+    assert [json.loads(line)["released"] for line in by_date.data.splitlines()] == [
+        released,
+    ]
+    assert invalid.status_code == 400
+
+
+def test_get_song(client, create_songs) -> None:
+    """Test GET /songs/<song_id> returns one song."""
+    # Arrange
+    song = create_songs[0]
+
+    # Act
+    response = client.get(f"/songs/{song.id}")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json is not None
+    assert response.json["id"] == str(song.id)
+    assert response.json["title"] == song.title
+
+
+def test_get_song_not_found(client, valid_object_id) -> None:
+    """Test GET /songs/<song_id> answers 404 for unknown and invalid ids."""
+    # Act
+    unknown = client.get(f"/songs/{valid_object_id}")
+    invalid = client.get("/songs/not-an-id")
+
+    # Assert
+    assert unknown.status_code == 404
+    assert invalid.status_code == 404
+
+
+def test_get_songs_by_ids(client, create_songs, valid_object_id) -> None:
+    """Test GET /songs?ids= keeps request order and reports missing ids."""
+    # Arrange
+    first, _, last = (str(song.id) for song in create_songs)
+    ids = ",".join([last, valid_object_id, first, "nope", last])
+
+    # Act
+    response = client.get(f"/songs?ids={ids}")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json is not None
+    assert [item["id"] for item in response.json["items"]] == [last, first]
+    assert response.json["missing"] == [valid_object_id, "nope"]
+
+
+def test_get_songs_by_ids_limits(client, monkeypatch) -> None:
+    """Test GET /songs?ids= rejects empty and oversized id lists."""
+    # Arrange
+    monkeypatch.setattr("songs_api.api.songs.settings.SONGS_MULTI_GET_MAX_IDS", 2)
+
+    # Act
+    empty = client.get("/songs?ids=")
+    too_many = client.get("/songs?ids=a,b,c")
+
+    # Assert
+    assert empty.status_code == 400
+    assert too_many.status_code == 400
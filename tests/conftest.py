@@ -8,8 +8,11 @@ from mongoengine import connect, disconnect
 
 from songs_api.config import Settings
 from songs_api.db.models.rating import Rating
+from songs_api.db.models.rating_summary import RatingSummary
 from songs_api.db.models.song import Song
+from songs_api.db.repositories.rating_repository import RatingRepository
 from songs_api.main import create_app
+from songs_api.utils.cache import clear_all
 
 
 @pytest.fixture(scope="session")
@@ -47,10 +50,13 @@ def db(test_settings):
     # Set the test db as default for the models
     mongoengine.context_managers.switch_db(Song, "testdb")
     mongoengine.context_managers.switch_db(Rating, "testdb")
+    mongoengine.context_managers.switch_db(RatingSummary, "testdb")
 
     # Clear any existing data
     Song.drop_collection()
     Rating.drop_collection()
+    RatingSummary.drop_collection()
+    clear_all()
 
     # Create test data
     yield
@@ -120,13 +126,9 @@ def create_songs(songs_data) -> List[Song]:
 
 @pytest.fixture
 def create_ratings(create_song) -> List[Rating]:
-    """Create test ratings for a song."""
-    ratings = []
-    for i in range(1, 6):
-        rating = Rating(song_id=str(create_song.id), rating=i)
-        rating.save()
-        ratings.append(rating)
-    return ratings
+    """Create test ratings (and their summary) for a song."""
+    repo = RatingRepository()
+    return [repo.add_rating(str(create_song.id), i) for i in range(1, 6)]
 
 
 @pytest.fixture
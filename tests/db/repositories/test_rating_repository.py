@@ -1,5 +1,13 @@
+from unittest.mock import patch
+
 import pytest
+from bson import ObjectId
+from pymongo.errors import OperationFailure
 
+from songs_api.config import Settings
+from songs_api.db.client import get_collection
+from songs_api.db.models.rating import Rating
+from songs_api.db.models.rating_summary import RatingSummary
 from songs_api.db.repositories.rating_repository import RatingRepository
 
 
@@ -60,6 +68,34 @@ def test_get_rating_stats_no_ratings(create_song) -> None:
     assert highest == 0
 
 
+def test_get_rating_stats_many(create_song, create_ratings) -> None:
+    """Test reading the stats of several songs, rated or not, at once."""
+    # Arrange
+    repo = RatingRepository()
+    song_id, unrated_id = str(create_song.id), str(ObjectId())
+
+    # Act
+    stats = repo.get_rating_stats_many([song_id, unrated_id])
+
+    # Assert
+    assert stats == {song_id: (3.0, 1, 5), unrated_id: (0.0, 0, 0)}
+
+
+def test_get_rating_stats_batched(create_song, create_ratings) -> None:
+    """Test stats read through the batch loader match single reads."""
+    # Arrange
+    repo = RatingRepository()
+    repo.enable_stats_batching(Settings(RATINGS_STATS_BATCH_WINDOW_MS=1))
+
+    # Act
+    stats = repo.get_rating_stats(str(create_song.id))
+
+    # Assert
+    assert stats == (3.0, 1, 5)
+    assert repo.stats_loader is not None
+    assert repo.stats_loader.stats.batches == 1
+
+
 def test_get_rating_stats_invalid_song_id() -> None:
     """Test getting stats with an invalid song ID."""
     # Arrange
@@ -69,3 +105,135 @@ def test_get_rating_stats_invalid_song_id() -> None:
     # Act & Assert
     with pytest.raises(ValueError, match=f"Invalid song_id: {invalid_id}"):
         repo.get_rating_stats(invalid_id)
+
+
+def test_add_rating_updates_summary(create_song) -> None:
+    """Test adding ratings keeps the song's summary up to date."""
+    # Arrange
+    repo = RatingRepository()
+    song_id = str(create_song.id)
+
+    # Act
+    repo.add_rating(song_id, 2)
+    repo.add_rating(song_id, 5)
+
+    # Assert
+    summary = RatingSummary.objects.get(song_id=song_id)
+    assert summary.count == 2
+    assert summary.rating_sum == 7
+    assert summary.lowest == 2
+    assert summary.highest == 5
+
+
+def test_rebuild_summaries(create_song, create_ratings) -> None:
+    """Test rebuilding summaries from raw ratings."""
+    # Arrange
+    repo = RatingRepository()
+    song_id = str(create_song.id)
+    orphan_id = str(ObjectId())
+    RatingSummary.objects(song_id=song_id).delete()
+    RatingSummary(
+        song_id=orphan_id,
+        count=1,
+        rating_sum=3,
+        lowest=3,
+        highest=3,
+    ).save()
+    Rating(song_id=song_id, rating=5).save()  # bypasses the summary
+
+    # Act
+    written = repo.rebuild_summaries()
+
+    # Assert
+    assert written == 1
+    assert repo.get_rating_stats(song_id) == (3.3333333333333335, 1, 5)
+    assert repo.get_rating_stats(orphan_id) == (0.0, 0, 0)
+    assert repo.check_summaries() == []
+
+
+def test_check_summaries(create_song, create_ratings) -> None:
+    """Test the consistency checker reports drifted summaries."""
+    # Arrange
+    repo = RatingRepository()
+    song_id = str(create_song.id)
+    assert repo.check_summaries() == []
+    Rating(song_id=song_id, rating=5).save()  # bypasses the summary
+
+    # Act
+    mismatches = repo.check_summaries(song_id)
+
+    # Assert
+    assert len(mismatches) == 1
+    assert mismatches[0].song_id == song_id
+    assert mismatches[0].expected == {
+        "song_id": song_id,
+        "count": 6,
+        "sum": 20,
+        "min": 1,
+        "max": 5,
+    }
+    assert mismatches[0].actual["count"] == 5
+
+
+def test_insert_ratings(create_song) -> None:
+    """Test inserting a batch of ratings and their summary in bulk."""
+    # Arrange
+    repo = RatingRepository()
+    song_id = str(create_song.id)
+    other_id = str(ObjectId())
+    ratings = [
+        repo.build_rating(song_id, 4),
+        repo.build_rating(other_id, 1),
+        repo.build_rating(song_id, 2),
+    ]
+
+    # Act
+    failed = repo.insert_ratings(ratings)
+
+    # Assert
+    assert failed == []
+    assert Rating.objects.count() == 3
+    assert Rating.objects.get(id=ratings[0].id).rating == 4
+    assert repo.get_rating_stats(song_id) == (3.0, 2, 4)
+    assert repo.get_rating_stats(other_id) == (1.0, 1, 1)
+
+
+def test_insert_ratings_again_is_idempotent(create_song) -> None:
+    """Test already inserted ratings count as written and aren't refolded."""
+    # Arrange
+    repo = RatingRepository()
+    song_id = str(create_song.id)
+    existing = repo.build_rating(song_id, 5)
+    existing.save()
+    RatingSummary.drop_collection()
+
+    # Act
+    failed = repo.insert_ratings([repo.build_rating(song_id, 1), existing])
+
+    # Assert
+    assert failed == []
+    assert repo.get_rating_stats(song_id) == (3.0, 1, 5)
+    assert repo.check_summaries() == []
+
+
+def test_insert_ratings_retry_after_summary_write_failed(create_song) -> None:
+    """Test a batch retried after its summaries failed to update still counts."""
+    # Arrange
+    repo = RatingRepository()
+    song_id = str(create_song.id)
+    ratings = [repo.build_rating(song_id, 4), repo.build_rating(song_id, 2)]
+    summaries = get_collection(RatingSummary)
+    with patch.object(
+        type(summaries),
+        "bulk_write",
+        side_effect=OperationFailure("boom"),
+    ), pytest.raises(OperationFailure):
+        repo.insert_ratings(ratings)
+
+    # Act
+    failed = repo.insert_ratings(ratings)
+
+    # Assert
+    assert failed == []
+    assert Rating.objects.count() == 2
+    assert repo.get_rating_stats(song_id) == (3.0, 2, 4)
@@ -1,5 +1,10 @@
+from datetime import date, timedelta
+
 import pytest
+from bson import ObjectId
 
+from songs_api.config import CountStrategy, Settings
+from songs_api.db.models.song import Song
 from songs_api.db.repositories.song_repository import SongRepository
 
 
@@ -130,3 +135,132 @@ def test_get_song_by_id_invalid() -> None:
     # Act & Assert
     with pytest.raises(ValueError, match=f"Invalid song_id: {invalid_id}"):
         repo.get_song_by_id(invalid_id)
+
+
+def test_get_song_by_id_not_found() -> None:
+    """Test getting a song that doesn't exist."""
+    # Arrange
+    repo = SongRepository()
+    song_id = str(ObjectId())
+
+    # Act & Assert
+    with pytest.raises(ValueError, match=f"Song not found: {song_id}"):
+        repo.get_song_by_id(song_id)
+
+
+def test_get_song_rows(create_songs) -> None:
+    """Test fetching many songs' rows with one query, skipping unknown ids."""
+    # Arrange
+    repo = SongRepository()
+    ids = [create_songs[0].id, create_songs[2].id, ObjectId()]
+
+    # Act
+    rows = repo.get_song_rows(ids)
+
+    # Assert
+    assert {row["_id"] for row in rows} == set(ids[:2])
+    assert set(rows[0]) == {"_id", "artist", "title", "difficulty", "level", "released"}
+
+
+def test_list_songs_after(create_songs) -> None:
+    """Test keyset pagination walks songs in _id order."""
+    # Arrange
+    repo = SongRepository()
+    ordered_ids = sorted(song.id for song in create_songs)
+
+    # Act - first page
+    songs, total = repo.list_songs_after(size=2)
+
+    # Assert
+    assert [song.id for song in songs] == ordered_ids[:2]
+    assert total == len(create_songs)
+
+    # Act - page after the last seen id
+    songs, total = repo.list_songs_after(after=songs[-1].id, size=2)
+
+    # Assert
+    assert [song.id for song in songs] == ordered_ids[2:]
+    assert total == len(create_songs)
+
+
+def test_count_songs_estimated(create_songs) -> None:
+    """Test the estimated count strategy."""
+    # Arrange
+    settings = Settings(SONGS_COUNT_STRATEGY=CountStrategy.ESTIMATED)
+    repo = SongRepository(settings=settings)
+
+    # Act
+    total = repo.count_songs()
+
+    # Assert
+    assert total == len(create_songs)
+
+
+def test_count_songs_cached(create_songs, song_data) -> None:
+    """Test the cached count strategy reuses the count until the TTL expires."""
+    # Arrange
+    settings = Settings(
+        SONGS_COUNT_STRATEGY=CountStrategy.CACHED,
+        SONGS_COUNT_CACHE_TTL=60,
+    )
+    repo = SongRepository(settings=settings)
+    assert repo.count_songs() == len(create_songs)
+    Song(**song_data).save()
+
+    # Act & Assert - still cached
+    assert repo.count_songs() == len(create_songs)
+
+
+def test_count_songs_cached_expired(create_songs, song_data) -> None:
+    """Test the cached count strategy recounts once the TTL has expired."""
+    # Arrange
+    settings = Settings(
+        SONGS_COUNT_STRATEGY=CountStrategy.CACHED,
+        SONGS_COUNT_CACHE_TTL=0,
+    )
+    repo = SongRepository(settings=settings)
+    assert repo.count_songs() == len(create_songs)
+    Song(**song_data).save()
+
+    # Act & Assert
+    assert repo.count_songs() == len(create_songs) + 1
+
+
+def test_list_song_rows(create_songs) -> None:
+    """Test raw rows match the documents, projected to the entity fields."""
+    # Arrange
+    repo = SongRepository()
+    ordered = sorted(create_songs, key=lambda song: song.id)
+
+    # Act
+    rows, total = repo.list_song_rows(page=1, size=2)
+    next_rows, _ = repo.list_song_rows_after(after=rows[-1]["_id"], size=2)
+
+    # Assert
+    assert total == len(create_songs)
+    assert [row["_id"] for row in rows + next_rows] == [song.id for song in ordered]
+    assert set(rows[0]) == {"_id", "artist", "title", "difficulty", "level", "released"}
+    assert rows[0]["artist"] == ordered[0].artist
+    assert rows[0]["released"].date() == ordered[0].released
+
+
+def test_iter_song_rows_filters(create_songs) -> None:
+    """Test exported rows honour the level and release range filters."""
+    # Arrange
+    repo = SongRepository()
+    today = date.today()
+
+    # Act
+    everything = list(repo.iter_song_rows(batch_size=1))
+    by_level = list(repo.iter_song_rows(level=10))
+    by_range = list(
+        repo.iter_song_rows(
+            released_from=today - timedelta(days=60),
+            released_to=today - timedelta(days=25),
+        ),
+    )
+
+    # Assert
+    assert len(everything) == len(create_songs)
+    assert [row["level"] for row in by_level] == [10]
+    assert sorted(row["level"] for row in by_range) == [7, 10]
@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from songs_api.db.batch_loader import BatchLoader
+
+
+def test_concurrent_lookups_share_one_load() -> None:
+    """Test lookups joining a batch are resolved by a single load call."""
+    # Arrange
+    loads = []
+
+    def load(keys) -> dict:
+        loads.append(keys)
+        return {key: key * 10 for key in keys}
+
+    loader = BatchLoader(load=load, window=60, max_batch=3)
+
+    # Act
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(loader.load, [1, 2, 3]))
+
+    # Assert
+    assert results == [10, 20, 30]
+    assert [sorted(keys) for keys in loads] == [[1, 2, 3]]
+    assert loader.snapshot()["max_batch_size"] == 3
+
+
+def test_lone_lookup_loads_after_window() -> None:
+    """Test a batch that never fills is loaded once the window has passed."""
+    # Arrange
+    loads = []
+
+    def load(keys) -> dict:
+        loads.append(keys)
+        return dict.fromkeys(keys, "value")
+
+    loader = BatchLoader(load=load, window=0.01, max_batch=100)
+
+    # Act
+    first = loader.load("a")
+    second = loader.load("b")
+
+    # Assert
+    assert (first, second) == ("value", "value")
+    assert loads == [["a"], ["b"]]
+    assert loader.stats.batches == 2
+
+
+def test_failed_load_reaches_batch_only() -> None:
+    """Test a load error is raised to its batch, and the next batch loads."""
+    # Arrange
+    calls = []
+
+    def load(keys) -> dict:
+        calls.append(keys)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return dict.fromkeys(keys, "value")
+
+    loader = BatchLoader(load=load, window=0.001)
+
+    # Act & Assert
+    with pytest.raises(RuntimeError, match="boom"):
+        loader.load("a")
+    assert loader.load("a") == "value"
@@ -0,0 +1,72 @@
+from mongoengine import connection
+from pymongo.monitoring import (
+    ConnectionCheckedInEvent,
+    ConnectionCheckedOutEvent,
+    ConnectionCheckOutFailedEvent,
+    ConnectionCheckOutFailedReason,
+)
+
+from songs_api.config import Settings
+from songs_api.db.client import ConnectionManager, client_options, get_db
+from songs_api.db.pool import PoolMonitor
+
+ADDRESS = ("localhost", 27017)
+
+
+def test_pool_monitor_snapshot() -> None:
+    """Test checkout waits, timeouts and utilization are reported."""
+    # Arrange
+    monitor = PoolMonitor(max_pool_size=4)
+
+    # Act
+    monitor.connection_checked_out(ConnectionCheckedOutEvent(ADDRESS, 1, 0.01))
+    monitor.connection_checked_out(ConnectionCheckedOutEvent(ADDRESS, 2, 0.03))
+    monitor.connection_checked_in(ConnectionCheckedInEvent(ADDRESS, 1))
+    monitor.connection_check_out_failed(
+        ConnectionCheckOutFailedEvent(
+            ADDRESS,
+            ConnectionCheckOutFailedReason.TIMEOUT,
+            0.2,
+        ),
+    )
+    stats = monitor.snapshot()
+
+    # Assert
+    assert stats["checkouts"] == 2
+    assert stats["checkout_timeouts"] == 1
+    assert stats["in_use"] == 1
+    assert stats["in_use_max"] == 2
+    assert stats["utilization"] == 0.25
+    assert stats["wait_seconds_max"] == 0.2
+    assert round(stats["wait_seconds_avg"], 2) == 0.08
+
+
+def test_client_options() -> None:
+    """Test only configured timeouts and compressors are passed to the client."""
+    # Arrange
+    config = Settings(MONGO_MAX_POOL_SIZE=20, MONGO_WAIT_QUEUE_TIMEOUT_MS=500)
+
+    # Act
+    options = client_options(config)
+
+    # Assert
+    assert options["maxPoolSize"] == 20
+    assert options["waitQueueTimeoutMS"] == 500
+    assert "socketTimeoutMS" not in options
+    assert "compressors" not in options
+
+
+def test_connection_manager_reset_drops_client(test_settings) -> None:
+    """Test a client opened before a fork is replaced, not reused."""
+    # Arrange
+    manager = ConnectionManager()
+    manager.connect(alias="pool-test", config=test_settings)
+    client = get_db("pool-test").client
+
+    # Act
+    manager.reset()
+
+    # Assert
+    assert "pool-test" not in connection._connections  # noqa: SLF001
+    assert get_db("pool-test").client is not client
+    manager.disconnect("pool-test")
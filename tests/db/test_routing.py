@@ -0,0 +1,81 @@
+import logging
+
+import pytest
+from pydantic import ValidationError
+from pymongo.read_preferences import SecondaryPreferred
+
+from songs_api.config import ReadPreferenceMode, Settings
+from songs_api.db.repositories.song_repository import SongRepository
+from songs_api.db.routing import read_preference, routing_stats
+
+
+def test_read_preference_unlisted_operation() -> None:
+    """Test reads without a configured preference are left to the client."""
+    # Arrange
+    config = Settings(READ_PREFERENCES={})
+
+    # Act & Assert
+    assert read_preference("tests.unlisted", config) is None
+    assert routing_stats()["tests.unlisted"]["default"] >= 1
+
+
+def test_read_preference_with_max_staleness(caplog) -> None:
+    """Test a configured mode is built with the max staleness and logged."""
+    # Arrange
+    config = Settings(
+        READ_PREFERENCES={"tests.search": ReadPreferenceMode.SECONDARY_PREFERRED},
+        READ_MAX_STALENESS_SECONDS=120,
+    )
+
+    # Act
+    with caplog.at_level(logging.INFO, logger="songs_api.db.routing"):
+        preference = read_preference("tests.search", config)
+
+    # Assert
+    assert preference == SecondaryPreferred(max_staleness=120)
+    assert "Routing tests.search reads to secondaryPreferred" in caplog.text
+
+
+def test_read_preference_built_once() -> None:
+    """Test every read of an operation shares one read preference object."""
+    # Arrange
+    config = Settings(
+        READ_PREFERENCES={"tests.cached": ReadPreferenceMode.NEAREST},
+        READ_MAX_STALENESS_SECONDS=90,
+    )
+
+    # Act
+    first = read_preference("tests.cached", config)
+    second = read_preference("tests.cached", config)
+
+    # Assert
+    assert first is second
+
+
+@pytest.mark.parametrize("seconds", [0, 1, 89, -2])
+def test_max_staleness_rejected_below_minimum(seconds: int) -> None:
+    """Test a max staleness MongoDB would refuse fails at startup."""
+    # Act & Assert
+    with pytest.raises(ValidationError, match="READ_MAX_STALENESS_SECONDS"):
+        Settings(READ_MAX_STALENESS_SECONDS=seconds)
+
+
+def test_routed_repository_reads(create_songs) -> None:
+    """Test repository reads still return data when routed to a secondary."""
+    # Arrange
+    repo = SongRepository(
+        settings=Settings(
+            READ_PREFERENCES={
+                "songs.list": ReadPreferenceMode.NEAREST,
+                "songs.count": ReadPreferenceMode.NEAREST,
+            },
+        ),
+    )
+    before = routing_stats().get("songs.list", {}).get("nearest", 0)
+
+    # Act
+    rows, total = repo.list_song_rows(page=1, size=10)
+
+    # Assert
+    assert len(rows) == total == 3
+    assert routing_stats()["songs.list"]["nearest"] == before + 1
@@ -0,0 +1,182 @@
+import os
+import time
+from datetime import timedelta
+
+from pymongo.monitoring import CommandStartedEvent, CommandSucceededEvent
+
+from songs_api.db.slow_queries import (
+    SlowQueryLog,
+    command_shape,
+    summarize_explain,
+    top_shapes,
+)
+
+CONNECTION = ("db", 27017)
+EXPLAIN = {
+    "queryPlanner": {
+        "winningPlan": {
+            "stage": "FETCH",
+            "inputStage": {"stage": "IXSCAN", "indexName": "level_1"},
+        },
+        "rejectedPlans": [{"stage": "COLLSCAN"}],
+    },
+    "executionStats": {
+        "nReturned": 3,
+        "totalDocsExamined": 3,
+        "totalKeysExamined": 3,
+        "executionTimeMillis": 1,
+    },
+}
+
+
+class ExplainingClient:
+    """Client stand-in answering every command with EXPLAIN."""
+
+    def __init__(self) -> None:
+        self.commands = []
+
+    def __getitem__(self, name: str) -> "ExplainingClient":
+        return self
+
+    def command(self, command):
+        """Record the command and return the canned explain."""
+        self.commands.append(command)
+        return EXPLAIN
+
+
+def run_command(log: SlowQueryLog, request_id: int, command, millis: int) -> None:
+    """Feed the log the events of a command that took `millis`."""
+    log.started(CommandStartedEvent(command, "songs", request_id, CONNECTION, 1))
+    log.succeeded(
+        CommandSucceededEvent(
+            timedelta(milliseconds=millis),
+            {"ok": 1},
+            next(iter(command)),
+            request_id,
+            CONNECTION,
+            1,
+        ),
+    )
+
+
+def test_command_shape_hides_values() -> None:
+    """Test queries differing only in values share a shape."""
+    # Arrange
+    first = {"find": "song", "filter": {"level": {"$in": [1, 2]}}, "lsid": {}}
+    second = {"find": "song", "filter": {"level": {"$in": [7]}}, "$db": "songs"}
+
+    # Act & Assert
+    assert command_shape("find", first) == command_shape("find", second)
+    assert command_shape("find", first) == {
+        "find": "song",
+        "filter": {"level": {"$in": ["?"]}},
+    }
+
+
+def test_command_shape_keeps_field_references() -> None:
+    """Test aggregation field paths survive normalization."""
+    # Arrange
+    command = {
+        "aggregate": "song",
+        "pipeline": [
+            {"$match": {"level": 5}},
+            {"$group": {"_id": None, "avg": {"$avg": "$difficulty"}}},
+        ],
+    }
+
+    # Act
+    shape = command_shape("aggregate", command)
+
+    # Assert
+    assert shape["pipeline"] == [
+        {"$match": {"level": "?"}},
+        {"$group": {"_id": "?", "avg": {"$avg": "$difficulty"}}},
+    ]
+
+
+def test_summarize_explain() -> None:
+    """Test the winning plan's indexes and execution stats are picked."""
+    # Act
+    summary = summarize_explain(EXPLAIN)
+
+    # Assert
+    assert summary == {
+        "n_returned": 3,
+        "docs_examined": 3,
+        "keys_examined": 3,
+        "execution_ms": 1,
+        "indexes": ["level_1"],
+        "collection_scan": False,
+    }
+
+
+def test_slow_commands_logged_and_ranked(tmp_path) -> None:
+    """Test only commands over the threshold are logged, grouped by shape."""
+    # Arrange
+    path = str(tmp_path / "slow.jsonl")
+    log = SlowQueryLog(path, threshold_ms=50, explain_rate=0)
+
+    # Act
+    run_command(log, 1, {"find": "song", "filter": {"level": 1}}, millis=80)
+    run_command(log, 2, {"find": "song", "filter": {"level": 2}}, millis=120)
+    run_command(log, 3, {"find": "song", "filter": {"level": 3}}, millis=10)
+    run_command(log, 4, {"count": "song", "query": {}}, millis=60)
+    shapes = top_shapes(path, limit=5)
+    log.close()
+
+    # Assert
+    assert [(s["command"], s["count"], s["max_ms"]) for s in shapes] == [
+        ("find", 2, 120.0),
+        ("count", 1, 60.0),
+    ]
+    assert shapes[0]["avg_ms"] == 100.0
+    assert shapes[0]["explain"] is None
+
+
+def test_slow_reads_explained(tmp_path) -> None:
+    """Test sampled slow reads get an explain summary in the background."""
+    # Arrange
+    path = str(tmp_path / "slow.jsonl")
+    client = ExplainingClient()
+    log = SlowQueryLog(path, threshold_ms=0, explain_rate=1, client=lambda: client)
+
+    # Act
+    run_command(log, 1, {"find": "song", "filter": {"level": 1}, "lsid": {}}, 5)
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and not top_shapes(path)[0]["explain"]:
+        time.sleep(0.01)
+    shapes = top_shapes(path)
+    log.close()
+
+    # Assert
+    assert client.commands == [
+        {
+            "explain": {"find": "song", "filter": {"level": 1}},
+            "verbosity": "executionStats",
+        },
+    ]
+    assert shapes[0]["explain"]["indexes"] == ["level_1"]
+
+
+def test_each_process_logs_to_its_own_file(tmp_path) -> None:
+    """Test a forked worker writes its own file, which top_shapes also reads."""
+    # Arrange
+    path = str(tmp_path / "slow.jsonl")
+    log = SlowQueryLog(path, threshold_ms=0, explain_rate=0)
+    run_command(log, 1, {"find": "song", "filter": {"level": 1}}, millis=10)
+
+    # Act
+    pid = os.fork()
+    if pid == 0:
+        run_command(log, 2, {"find": "song", "filter": {"level": 2}}, millis=30)
+        log.close()
+        os._exit(0)
+    _, status = os.waitpid(pid, 0)
+    shapes = top_shapes(path)
+    log.close()
+
+    # Assert
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert (tmp_path / f"slow.jsonl.{os.getpid()}").exists()
+    assert (tmp_path / f"slow.jsonl.{pid}").exists()
+    assert [(s["count"], s["max_ms"]) for s in shapes] == [(2, 30.0)]
@@ -0,0 +1,213 @@
+import threading
+
+import pytest
+from prometheus_client import REGISTRY
+
+from songs_api.db.write_buffer import BufferFullError, WriteBehindBuffer
+
+
+def test_flush_when_batch_size_reached() -> None:
+    """Test a full batch is flushed without waiting for the interval."""
+    # Arrange
+    flushed = []
+    done = threading.Event()
+
+    def flush(batch) -> int:
+        flushed.append(list(batch))
+        done.set()
+        return 0
+
+    buffer = WriteBehindBuffer(flush=flush, batch_size=3, flush_interval=60)
+
+    # Act
+    for item in range(3):
+        buffer.put(item)
+
+    # Assert
+    assert done.wait(timeout=5)
+    assert flushed == [[0, 1, 2]]
+    buffer.close()
+
+
+def test_flush_after_interval() -> None:
+    """Test a partial batch is flushed once the interval has passed."""
+    # Arrange
+    done = threading.Event()
+    buffer = WriteBehindBuffer(
+        flush=lambda batch: done.set() or 0,
+        batch_size=100,
+        flush_interval=0.01,
+    )
+
+    # Act
+    buffer.put("item")
+
+    # Assert
+    assert done.wait(timeout=5)
+    buffer.close()
+    assert buffer.stats.flushes == 1
+    assert buffer.stats.items_flushed == 1
+    assert buffer.stats.last_batch_size == 1
+
+
+def test_put_raises_when_full() -> None:
+    """Test backpressure once the buffer stays full."""
+    # Arrange
+    release = threading.Event()
+
+    def flush(batch) -> int:
+        release.wait(timeout=5)
+        return 0
+
+    buffer = WriteBehindBuffer(
+        flush=flush,
+        max_size=1,
+        batch_size=1,
+        flush_interval=0.01,
+        put_timeout=0.01,
+    )
+    buffer.put("taken by the flusher")
+
+    # Act & Assert
+    with pytest.raises(BufferFullError):
+        for item in range(3):
+            buffer.put(item)
+
+    assert buffer.stats.items_rejected == 1
+    release.set()
+    buffer.close()
+
+
+def test_close_flushes_pending_items() -> None:
+    """Test closing the buffer writes whatever is still queued."""
+    # Arrange
+    flushed = []
+    buffer = WriteBehindBuffer(
+        flush=lambda batch: flushed.extend(batch) or 0,
+        batch_size=100,
+        flush_interval=60,
+    )
+    for item in range(5):
+        buffer.put(item)
+
+    # Act
+    buffer.close()
+
+    # Assert
+    assert sorted(flushed) == [0, 1, 2, 3, 4]
+    assert buffer.pending() == 0
+
+
+def test_failed_flush_is_retried() -> None:
+    """Test a raising flush callable is retried with the same batch."""
+    # Arrange
+    batches = []
+
+    def flush(batch) -> int:
+        batches.append(list(batch))
+        if len(batches) < 3:
+            raise RuntimeError("db down")
+        return 0
+
+    buffer = WriteBehindBuffer(
+        flush=flush,
+        batch_size=100,
+        flush_interval=60,
+        retry_backoff=0.001,
+    )
+    buffer.put("item")
+
+    # Act
+    buffer.close()
+
+    # Assert
+    assert batches == [["item"]] * 3
+    assert buffer.stats.retries == 2
+    assert buffer.stats.items_flushed == 1
+    assert buffer.stats.items_dropped == 0
+
+
+def test_batch_dropped_after_retries() -> None:
+    """Test a batch still failing after every retry is dropped and counted."""
+
+    # Arrange
+    def flush(batch) -> int:
+        raise RuntimeError("db down")
+
+    buffer = WriteBehindBuffer(
+        flush=flush,
+        batch_size=100,
+        flush_interval=60,
+        max_retries=2,
+        retry_backoff=0.001,
+    )
+    buffer.put("item")
+
+    # Act
+    buffer.close()
+
+    # Assert
+    assert buffer.stats.retries == 2
+    assert buffer.stats.items_dropped == 1
+    assert buffer.snapshot()["items_flushed"] == 0
+
+
+def test_flushes_are_exported_as_metrics() -> None:
+    """Test batch sizes, flush times and dropped items reach Prometheus."""
+    # Arrange
+    labels = {"buffer": "test-metrics"}
+
+    def flush(batch) -> int:
+        if len(batch) == 1:
+            raise RuntimeError("db down")
+        return 1
+
+    buffer = WriteBehindBuffer(
+        flush=flush,
+        batch_size=3,
+        flush_interval=60,
+        max_retries=0,
+        name=labels["buffer"],
+    )
+
+    # Act
+    for item in range(4):
+        buffer.put(item)
+    buffer.close()
+
+    # Assert
+    assert (
+        REGISTRY.get_sample_value(
+            "songs_api_write_buffer_batch_size_count",
+            labels,
+        )
+        == 2
+    )
+    assert (
+        REGISTRY.get_sample_value(
+            "songs_api_write_buffer_batch_size_sum",
+            labels,
+        )
+        == 4
+    )
+    assert (
+        REGISTRY.get_sample_value(
+            "songs_api_write_buffer_flush_duration_seconds_count",
+            labels,
+        )
+        == 2
+    )
+    assert (
+        REGISTRY.get_sample_value(
+            "songs_api_write_buffer_items_lost_total",
+            {**labels, "reason": "failed"},
+        )
+        == 1
+    )
+    assert (
+        REGISTRY.get_sample_value(
+            "songs_api_write_buffer_items_lost_total",
+            {**labels, "reason": "dropped"},
+        )
+        == 1
+    )
@@ -0,0 +1,169 @@
+import json
+import random
+from collections import Counter
+from datetime import date
+from statistics import mean
+
+from scripts.generate_dataset import (
+    DatasetConfig,
+    generate,
+    load_dataset,
+    rating_chunk,
+    song_chunk,
+    song_chunks,
+    write_dataset,
+    zipf_rank,
+)
+from scripts.import_songs import load_songs, parse_chunk
+from songs_api.db.models.rating import Rating
+from songs_api.db.models.rating_summary import RatingSummary
+from songs_api.db.models.song import Song
+from songs_api.services.rating_service import stats_version
+from songs_api.utils.catalog import natural_key
+
+CONFIG = DatasetConfig(
+    songs=500,
+    ratings=3000,
+    seed=7,
+    artists=50,
+    vocabulary=200,
+    chunk_size=200,
+)
+
+
+def _rows(config: DatasetConfig, make_chunk, total: int) -> list:
+    """Generate every row of one kind inline."""
+    return [row for rows in generate(config, make_chunk, total) for row in rows]
+
+
+def test_generation_is_deterministic() -> None:
+    """Test a seed always yields the same rows and another seed different ones."""
+    # Act
+    first = _rows(CONFIG, song_chunk, CONFIG.songs)
+    again = _rows(CONFIG, song_chunk, CONFIG.songs)
+    other = _rows(DatasetConfig(songs=500, seed=8), song_chunk, 500)
+
+    # Assert
+    assert len(first) == CONFIG.songs
+    assert first == again
+    assert first != other
+    assert len({row["id"] for row in first}) == CONFIG.songs
+
+
+def test_natural_keys_are_unique() -> None:
+    """Test songs drawn with the same artist, title and date are renamed."""
+    # Arrange
+    config = DatasetConfig(
+        songs=20_000,
+        seed=3,
+        artists=20,
+        vocabulary=30,
+        title_words=(1, 2),
+        chunk_size=5000,
+    )
+
+    def keys(rows: list) -> list:
+        return [
+            natural_key(
+                row["artist"],
+                row["title"],
+                date.fromisoformat(row["released"]),
+            )
+            for row in rows
+        ]
+
+    drawn = keys(_rows(config, song_chunk, config.songs))
+
+    # Act
+    songs = [row for rows in song_chunks(config) for row in rows]
+
+    # Assert
+    assert len(set(drawn)) < config.songs
+    assert len(set(keys(songs))) == config.songs
+    assert [row["id"] for row in songs] == [
+        row["id"] for row in _rows(config, song_chunk, config.songs)
+    ]
+
+
+def test_zipf_rank_is_skewed() -> None:
+    """Test low ranks are drawn far more often than high ones."""
+    # Arrange
+    rng = random.Random(0)  # noqa: S311
+
+    # Act
+    counts = Counter(zipf_rank(rng, 1000, 1.2) for _ in range(20_000))
+
+    # Assert
+    assert min(counts) >= 0
+    assert max(counts) < 1000
+    assert counts[0] > 10 * counts.get(50, 1)
+
+
+def test_difficulty_follows_level() -> None:
+    """Test harder levels get harder songs on average."""
+    # Arrange
+    rows = _rows(CONFIG, song_chunk, CONFIG.songs)
+
+    # Act
+    easy = mean(row["difficulty"] for row in rows if row["level"] <= 3)
+    hard = mean(row["difficulty"] for row in rows if row["level"] >= 12)
+
+    # Assert
+    assert hard > easy + 5
+
+
+def test_ratings_favor_popular_songs() -> None:
+    """Test ratings refer to generated songs and concentrate on a few."""
+    # Arrange
+    song_ids = {row["id"] for row in _rows(CONFIG, song_chunk, CONFIG.songs)}
+
+    # Act
+    ratings = _rows(CONFIG, rating_chunk, CONFIG.ratings)
+
+    # Assert
+    per_song = Counter(row["song_id"] for row in ratings)
+    assert set(per_song) <= song_ids
+    assert {row["rating"] for row in ratings} <= {1, 2, 3, 4, 5}
+    assert per_song.most_common(1)[0][1] > 10 * CONFIG.ratings / CONFIG.songs
+
+
+def test_written_songs_import_with_their_ids(tmp_path) -> None:
+    """Test the songs file loads through the importer, keeping rated ids."""
+    # Arrange
+    write_dataset(CONFIG, tmp_path)
+    path = tmp_path / "songs.ndjson"
+
+    # Act
+    docs, errors = parse_chunk(path.read_text().splitlines())
+    stats = load_songs(path, workers=0)
+
+    # Assert
+    assert errors == []
+    assert len(docs) == CONFIG.songs
+    assert stats.inserted == CONFIG.songs
+    rated = json.loads((tmp_path / "ratings.ndjson").read_text().splitlines()[0])
+    assert Song.objects(id=rated["song_id"]).count() == 1
+
+
+def test_load_dataset() -> None:
+    """Test bulk loading inserts everything and builds rating summaries."""
+    # Act
+    load_dataset(CONFIG)
+
+    # Assert
+    assert Song.objects.count() == CONFIG.songs
+    assert Rating.objects.count() == CONFIG.ratings
+    assert sum(summary.count for summary in RatingSummary.objects) == CONFIG.ratings
+
+
+def test_load_dataset_changes_rating_stamps() -> None:
+    """Test reloading ratings changes the stats stamps of the songs."""
+    # Arrange
+    rated = _rows(CONFIG, rating_chunk, 1)[0]["song_id"]
+    before = stats_version(rated)
+
+    # Act
+    load_dataset(CONFIG)
+
+    # Assert
+    assert stats_version(rated) != before
@@ -0,0 +1,171 @@
+import json
+from datetime import date
+
+from scripts.import_songs import load_songs, parse_chunk, read_chunks, sync_songs
+from songs_api.db.client import collection_name, get_db
+from songs_api.db.models.song import NATURAL_KEY_INDEX, Song
+
+
+def _song_line(**overrides: object) -> str:
+    song = {
+        "artist": "The Yousicians",
+        "title": "Lycanthropic Metamorphosis",
+        "difficulty": 14.6,
+        "level": 13,
+        "released": "2016-10-26",
+    }
+    song.update(overrides)
+    return json.dumps(song) + "\n"
+
+
+def test_read_chunks(tmp_path) -> None:
+    """Test lines are streamed in chunks, skipping blank lines."""
+    # Arrange
+    path = tmp_path / "songs.json"
+    path.write_text(_song_line() * 3 + "\n" + _song_line() * 2)
+
+    # Act
+    chunks = list(read_chunks(path, chunk_size=2))
+
+    # Assert
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+
+def test_parse_chunk() -> None:
+    """Test rows are converted to documents and invalid rows reported."""
+    # Act
+    docs, errors = parse_chunk(
+        [
+            _song_line(),
+            _song_line(released="26/10/2016"),
+            _song_line(level=0),
+            "{not json\n",
+        ],
+    )
+
+    # Assert
+    assert len(docs) == 1
+    assert docs[0]["artist"] == "The Yousicians"
+    assert docs[0]["natural_key"]
+    assert docs[0]["content_hash"]
+    assert docs[0]["released"].date() == date(2016, 10, 26)
+    assert len(errors) == 3
+
+
+def test_load_songs(tmp_path) -> None:
+    """Test songs are bulk loaded in chunks and indexes built afterwards."""
+    # Arrange
+    path = tmp_path / "songs.json"
+    path.write_text(
+        "".join(_song_line(title=f"Song {i}") for i in range(5))
+        + _song_line(difficulty=-1),
+    )
+
+    # Act
+    stats = load_songs(path, chunk_size=2, workers=0)
+
+    # Assert
+    assert stats.read == 6
+    assert stats.inserted == 5
+    assert stats.invalid == 1
+    assert Song.objects.count() == 5
+    assert Song.objects(title="Song 3").first().released == date(2016, 10, 26)
+
+
+def test_sync_songs(tmp_path) -> None:
+    """Test syncing only writes the diff and keeps song ids stable."""
+    # Arrange
+    path = tmp_path / "songs.json"
+    path.write_text(_song_line(title="Kept") + _song_line(title="Changed"))
+    load_songs(path, workers=0)
+    kept_id = Song.objects.get(title="Kept").id
+    changed_id = Song.objects.get(title="Changed").id
+    path.write_text(
+        _song_line(title="Kept")
+        + _song_line(title="Changed", difficulty=2.5)
+        + _song_line(title="Added"),
+    )
+
+    # Act
+    stats = sync_songs(path, workers=0)
+
+    # Assert
+    assert (stats.added, stats.updated, stats.unchanged) == (1, 1, 1)
+    assert Song.objects.count() == 3
+    assert Song.objects.get(title="Kept").id == kept_id
+    changed = Song.objects.get(title="Changed")
+    assert changed.id == changed_id
+    assert changed.difficulty == 2.5
+
+
+def test_sync_songs_prune(tmp_path) -> None:
+    """Test pruning deletes songs missing from the source."""
+    # Arrange
+    path = tmp_path / "songs.json"
+    path.write_text(_song_line(title="Kept") + _song_line(title="Removed"))
+    load_songs(path, workers=0)
+    path.write_text(_song_line(title="Kept"))
+
+    # Act
+    stats = sync_songs(path, prune=True, workers=0)
+
+    # Assert
+    assert stats.deleted == 1
+    assert [song.title for song in Song.objects] == ["Kept"]
+
+
+def test_sync_songs_backfills_legacy_songs(tmp_path, song_data) -> None:
+    """Test songs loaded without natural keys are matched, not duplicated."""
+    # Arrange
+    legacy = Song(**song_data)
+    legacy.save()
+    path = tmp_path / "songs.json"
+    path.write_text(
+        _song_line(
+            artist=song_data["artist"].upper(),
+            title=song_data["title"],
+            difficulty=song_data["difficulty"],
+            level=song_data["level"],
+            released=song_data["released"].isoformat(),
+        ),
+    )
+
+    # Act
+    stats = sync_songs(path, workers=0)
+
+    # Assert
+    assert stats.backfilled == 1
+    assert stats.updated == 1
+    assert Song.objects.count() == 1
+    assert Song.objects.get().id == legacy.id
+    assert Song.objects.get().artist == song_data["artist"].upper()
+
+
+def test_natural_key_index_replaces_non_unique_one() -> None:
+    """Test a natural_key index from before it was unique is rebuilt unique."""
+    # Arrange
+    Song.drop_collection()
+    collection = get_db()[collection_name(Song)]
+    collection.insert_many([{"natural_key": "a"}, {"natural_key": "b"}, {}, {}])
+    collection.create_index("natural_key", name=NATURAL_KEY_INDEX)
+
+    # Act
+    Song.ensure_indexes()
+
+    # Assert
+    assert collection.index_information()[NATURAL_KEY_INDEX]["unique"]
+
+
+def test_natural_key_index_reports_duplicates(caplog) -> None:
+    """Test songs sharing a natural key are reported instead of failing."""
+    # Arrange
+    Song.drop_collection()
+    collection = get_db()[collection_name(Song)]
+    collection.insert_many([{"natural_key": "dup"}, {"natural_key": "dup"}])
+
+    # Act
+    Song.ensure_indexes()
+
+    # Assert
+    assert "dup" in caplog.text
+    assert not collection.index_information()[NATURAL_KEY_INDEX].get("unique")
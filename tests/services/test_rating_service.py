@@ -1,9 +1,12 @@
 from unittest.mock import MagicMock
 
 import pytest
+from bson import ObjectId
 
+from songs_api.db.models.rating import Rating
 from songs_api.db.repositories.rating_repository import RatingRepository
-from songs_api.exceptions.custom import NotFoundError
+from songs_api.db.write_buffer import BufferFullError, WriteBehindBuffer
+from songs_api.exceptions.custom import NotFoundError, ServiceUnavailableError
 from songs_api.services.rating_service import RatingService
 
 
@@ -83,3 +86,80 @@ def test_get_stats_not_found(service, mock_repo) -> None:
     # Act & Assert
     with pytest.raises(NotFoundError, match=f"Invalid song_id: {invalid_id}"):
         service.get_stats(invalid_id)
+
+
+def test_add_rating_write_behind(mock_repo, valid_object_id) -> None:
+    """Test write-behind mode queues the rating instead of saving it."""
+    # Arrange
+    service = RatingService(repo=mock_repo)
+    service.buffer = MagicMock(spec=WriteBehindBuffer)
+    rating_doc = Rating(id=ObjectId(), song_id=valid_object_id, rating=3)
+    mock_repo.build_rating.return_value = rating_doc
+
+    # Act
+    result = service.add_rating(valid_object_id, 3)
+
+    # Assert
+    mock_repo.add_rating.assert_not_called()
+    service.buffer.put.assert_called_once_with(rating_doc)
+    assert result.id == str(rating_doc.id)
+    assert result.rating == 3
+
+
+def test_add_rating_write_behind_full(mock_repo, valid_object_id) -> None:
+    """Test a full write-behind buffer surfaces as ServiceUnavailableError."""
+    # Arrange
+    service = RatingService(repo=mock_repo)
+    service.buffer = MagicMock(spec=WriteBehindBuffer)
+    service.buffer.put.side_effect = BufferFullError("Write buffer is full")
+
+    # Act & Assert
+    with pytest.raises(ServiceUnavailableError, match="Write buffer is full"):
+        service.add_rating(valid_object_id, 3)
+
+
+def test_add_ratings(service, mock_repo, valid_object_id) -> None:
+    """Test adding a batch reports per-item results in input order."""
+    # Arrange
+    stored = Rating(id=ObjectId(), song_id=valid_object_id, rating=4)
+    rejected = Rating(id=ObjectId(), song_id=valid_object_id, rating=2)
+    mock_repo.build_rating.side_effect = [
+        stored,
+        ValueError("Invalid song_id: bad"),
+        rejected,
+    ]
+    mock_repo.insert_ratings.return_value = [1]
+
+    # Act
+    results = service.add_ratings(
+        [(valid_object_id, 4), ("bad", 5), (valid_object_id, 2)],
+    )
+
+    # Assert
+    mock_repo.insert_ratings.assert_called_once_with([stored, rejected])
+    assert [result.index for result in results] == [0, 1, 2]
+    assert results[0].rating.id == str(stored.id)
+    assert results[1].error == "Invalid song_id: bad"
+    assert results[2].rating is None
+    assert results[2].error == "Rating could not be stored"
+
+
+def test_add_rating_invalidates_stats(service, mock_repo, valid_object_id) -> None:
+    """Test adding a rating drops the song's cached stats."""
+    # Arrange
+    mock_repo.get_rating_stats.return_value = (4.0, 4, 4)
+    mock_repo.add_rating.return_value = Rating(
+        id=ObjectId(),
+        song_id=valid_object_id,
+        rating=2,
+    )
+    service.get_stats(valid_object_id)
+    service.get_stats(valid_object_id)
+    assert mock_repo.get_rating_stats.call_count == 1
+
+    # Act
+    service.add_rating(valid_object_id, 2)
+    service.get_stats(valid_object_id)
+
+    # Assert
+    assert mock_repo.get_rating_stats.call_count == 2
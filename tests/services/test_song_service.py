@@ -1,11 +1,14 @@
-from datetime import date
+from datetime import date, datetime
 from unittest.mock import MagicMock
 
 import pytest
+from bson import ObjectId
 
 from songs_api.db.repositories.song_repository import SongRepository
-from songs_api.exceptions.custom import NotFoundError
-from songs_api.services.song_service import SongService
+from songs_api.exceptions.custom import BadRequestError, NotFoundError
+from songs_api.services.song_service import SongService, invalidate_catalog
+from songs_api.utils.pagination import encode_cursor
+from songs_api.utils.shared_cache import SharedMemoryCache
 
 
 @pytest.fixture
@@ -124,3 +127,194 @@ def test_get_song_not_found(service, mock_repo) -> None:
     # Act & Assert
     with pytest.raises(NotFoundError, match=error_msg):
         service.get_song(invalid_id)
+
+
+def test_list_songs_with_cursor(service, mock_repo) -> None:
+    """Test listing songs after a cursor returns the next cursor."""
+    # Arrange
+    after = ObjectId()
+    mock_songs = [MagicMock() for _ in range(2)]
+    for i, song in enumerate(mock_songs):
+        song.id = ObjectId()
+        song.artist = f"Artist {i}"
+        song.title = f"Song {i}"
+        song.difficulty = float(i + 5)
+        song.level = i + 5
+        song.released = date.today()
+
+    mock_repo.list_songs_after.return_value = (mock_songs, 10)
+    mock_repo.page_size.return_value = 2
+
+    # Act
+    result = service.list_songs(size=2, cursor=encode_cursor(after))
+
+    # Assert
+    mock_repo.list_songs_after.assert_called_once_with(after=after, size=2)
+    mock_repo.list_songs.assert_not_called()
+    assert len(result.items) == 2
+    assert result.total == 10
+    assert result.next_cursor == encode_cursor(mock_songs[-1].id)
+
+
+def test_list_songs_invalid_cursor(service, mock_repo) -> None:
+    """Test listing songs with an undecodable cursor."""
+    # Act & Assert
+    with pytest.raises(BadRequestError, match="Invalid cursor"):
+        service.list_songs(cursor="not-a-cursor")
+
+    mock_repo.list_songs_after.assert_not_called()
+
+
+def test_search_songs_is_cached(service, mock_repo) -> None:
+    """Test equivalent searches hit the repository once until invalidated."""
+    # Arrange
+    mock_repo.search_songs.return_value = []
+
+    # Act
+    service.search_songs("Test  Query")
+    service.search_songs("test query")
+
+    # Assert
+    mock_repo.search_songs.assert_called_once_with("Test  Query")
+
+    # Act - catalog changed
+    invalidate_catalog()
+    service.search_songs("test query")
+
+    # Assert
+    assert mock_repo.search_songs.call_count == 2
+
+
+def test_list_songs_shared_cache(mock_repo, tmp_path) -> None:
+    """Test pages are served from a shared cache by another service instance."""
+    # Arrange
+    store = SharedMemoryCache(str(tmp_path / "cache"), slots=16, slot_size=4096)
+    mock_songs = [MagicMock()]
+    mock_songs[0].id = ObjectId()
+    mock_songs[0].artist = "Artist"
+    mock_songs[0].title = "Song"
+    mock_songs[0].difficulty = 5.0
+    mock_songs[0].level = 5
+    mock_songs[0].released = date.today()
+    mock_repo.list_songs.return_value = (mock_songs, 1)
+    mock_repo.page_size.return_value = 10
+    first = SongService(repo=mock_repo, cache_factory=store.namespace)
+    second = SongService(repo=mock_repo, cache_factory=store.namespace)
+
+    # Act
+    expected = first.list_songs(page=1, size=10)
+    result = second.list_songs(page=1, size=10)
+
+    # Assert
+    mock_repo.list_songs.assert_called_once_with(page=1, size=10)
+    assert result == expected
+    store.close()
+
+
+def test_list_songs_raw_reads(mock_repo) -> None:
+    """Test raw rows are mapped to entities without MongoEngine documents."""
+    # Arrange
+    service = SongService(repo=mock_repo, raw_reads=True)
+    row = {
+        "_id": ObjectId(),
+        "artist": "Artist",
+        "title": "Song",
+        "difficulty": 5,
+        "level": 5,
+        "released": datetime(2020, 1, 2),
+    }
+    mock_repo.list_song_rows.return_value = ([row], 3)
+    mock_repo.page_size.return_value = 1
+
+    # Act
+    result = service.list_songs(page=1, size=1)
+
+    # Assert
+    mock_repo.list_songs.assert_not_called()
+    assert result.items[0].id == str(row["_id"])
+    assert result.items[0].difficulty == 5.0
+    assert result.items[0].released == date(2020, 1, 2)
+    assert result.next_cursor == encode_cursor(row["_id"])
+
+
+def test_get_songs_reads_through_cache(mock_repo) -> None:
+    """Test multi-get reads only uncached songs, in one repository call."""
+    # Arrange
+    service = SongService(repo=mock_repo)
+    rows = [
+        {
+            "_id": ObjectId(),
+            "artist": f"Artist {i}",
+            "title": f"Song {i}",
+            "difficulty": 5,
+            "level": 5,
+            "released": datetime(2020, 1, 2),
+        }
+        for i in range(2)
+    ]
+    first, second = (str(row["_id"]) for row in rows)
+    mock_repo.get_song_rows.side_effect = lambda ids: [
+        row for row in rows if row["_id"] in ids
+    ]
+    service.get_songs([first])
+
+    # Act
+    songs, missing = service.get_songs([second, "bad-id", first])
+
+    # Assert
+    assert [song.id for song in songs] == [second, first]
+    assert missing == ["bad-id"]
+    assert mock_repo.get_song_rows.call_args_list[1].args == ([ObjectId(second)],)
+
+
+def test_get_songs_dedupes_ids_spelled_differently(mock_repo) -> None:
+    """Test an id given in lower and upper case returns its song once."""
+    # Arrange
+    service = SongService(repo=mock_repo)
+    row = {
+        "_id": ObjectId(),
+        "artist": "Artist",
+        "title": "Song",
+        "difficulty": 5,
+        "level": 5,
+        "released": datetime(2020, 1, 2),
+    }
+    song_id = str(row["_id"])
+    mock_repo.get_song_rows.return_value = [row]
+
+    # Act
+    songs, missing = service.get_songs([song_id, song_id.upper()])
+
+    # Assert
+    assert [song.id for song in songs] == [song_id]
+    assert missing == []
+    mock_repo.get_song_rows.assert_called_once_with([row["_id"]])
+
+
+def test_get_song_shares_cache_with_multi_get(mock_repo) -> None:
+    """Test a song read by get_songs is served to get_song from the cache."""
+    # Arrange
+    service = SongService(repo=mock_repo)
+    row = {
+        "_id": ObjectId(),
+        "artist": "Artist",
+        "title": "Song",
+        "difficulty": 5,
+        "level": 5,
+        "released": datetime(2020, 1, 2),
+    }
+    mock_repo.get_song_rows.return_value = [row]
+    service.get_songs([str(row["_id"])])
+
+    # Act
+    song = service.get_song(str(row["_id"]))
+
+    # Assert
+    assert song.title == "Song"
+    mock_repo.get_song_by_id.assert_not_called()
+
+    # Act & Assert - the importer drops cached songs
+    invalidate_catalog()
+    mock_repo.get_song_by_id.side_effect = ValueError("Song not found")
+    with pytest.raises(NotFoundError):
+        service.get_song(str(row["_id"]))
@@ -0,0 +1,104 @@
+import threading
+
+from werkzeug.test import Client
+
+from songs_api.utils.admission import (
+    QUEUE_FULL,
+    TIMEOUT,
+    AdmissionController,
+    AdmissionMiddleware,
+)
+
+
+def test_route_limit_sheds_after_max_wait() -> None:
+    """Test requests over a route's limit give up after waiting max_wait."""
+    # Arrange
+    controller = AdmissionController(route_limits={"/songs/search": 1}, max_wait=0.01)
+    controller.acquire("/songs/search")
+
+    # Act
+    shed = controller.acquire("/songs/search")
+    other_route = controller.acquire("/songs")
+
+    # Assert
+    assert shed == TIMEOUT
+    assert other_route is None
+    assert controller.in_flight == 2
+
+
+def test_full_queue_sheds_at_once() -> None:
+    """Test requests are shed without waiting once the queue is full."""
+    # Arrange
+    controller = AdmissionController(max_in_flight=1, max_wait=10, max_queue=0)
+    controller.acquire("/songs")
+
+    # Act
+    reason = controller.acquire("/songs")
+
+    # Assert
+    assert reason == QUEUE_FULL
+
+
+def test_write_reserve_keeps_writes_flowing() -> None:
+    """Test reads can't take the slots reserved for writes."""
+    # Arrange
+    controller = AdmissionController(max_in_flight=2, write_reserve=1, max_wait=0.01)
+    controller.acquire("/songs")
+
+    # Act
+    read = controller.acquire("/songs")
+    write = controller.acquire("/ratings", write=True)
+
+    # Assert
+    assert read == TIMEOUT
+    assert write is None
+
+
+def test_waiting_request_gets_released_slot() -> None:
+    """Test a queued request is admitted as soon as a slot frees up."""
+    # Arrange
+    controller = AdmissionController(max_in_flight=1, max_wait=5)
+    controller.acquire("/songs")
+    timer = threading.Timer(0.02, controller.release, args=("/songs",))
+    timer.start()
+
+    # Act
+    reason = controller.acquire("/songs")
+
+    # Assert
+    timer.join()
+    assert reason is None
+    assert controller.waiting == 0
+    assert controller.in_flight == 1
+
+
+def test_middleware_answers_503_when_overloaded(app) -> None:
+    """Test shed requests get a 503 with Retry-After, exempt paths don't."""
+    # Arrange
+    controller = AdmissionController(max_in_flight=1, max_wait=0.01)
+    client = Client(
+        AdmissionMiddleware(
+            app.wsgi_app,
+            controller,
+            app.url_map,
+            exempt=["/health"],
+            retry_after=3,
+        ),
+    )
+    controller.acquire("/songs")
+
+    # Act
+    shed = client.get("/songs")
+    health = client.get("/health")
+    controller.release("/songs")
+    served = client.get("/songs")
+    served.close()
+
+    # Assert
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "3"
+    assert shed.json is not None
+    assert shed.json["error"] == "Service Unavailable"
+    assert health.status_code == 200
+    assert served.status_code == 200
+    assert controller.in_flight == 0
@@ -0,0 +1,188 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List
+
+from songs_api.utils.cache import LRUCache, cache_stats, invalidate, memoize
+
+# Version stamp of the data Counter.echo_versioned reads
+VERSION = {"stamp": 0}
+
+
+@dataclass
+class Counter:
+    calls: List[str] = field(default_factory=list)
+    release: threading.Event = field(default_factory=threading.Event)
+
+    @memoize("tests.echo", ttl=60, key=lambda text: text.lower())
+    def echo(self, text: str) -> str:
+        """Record the call and return the lowercased text."""
+        self.calls.append(text)
+        return text.lower()
+
+    @memoize("tests.echo_blocking", ttl=60)
+    def echo_blocking(self, text: str) -> str:
+        """Record the call and return the text once released."""
+        self.calls.append(text)
+        self.release.wait()
+        return text
+
+    @memoize("tests.echo_versioned", ttl=60, version=lambda text: VERSION["stamp"])
+    def echo_versioned(self, text: str) -> str:
+        """Record the call and return the text."""
+        self.calls.append(text)
+        return text
+
+    @memoize("tests.echo_async", ttl=60, key=lambda text: text.lower())
+    async def echo_async(self, text: str) -> str:
+        """Record the call and return the lowercased text, asynchronously."""
+        self.calls.append(text)
+        return text.lower()
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    """Test the LRU cache keeps at most maxsize entries."""
+    # Arrange
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+
+    # Act
+    cache.set("c", 3, ttl=60)
+
+    # Assert
+    assert cache.get("a") == (True, 1)
+    assert cache.get("b") == (False, None)
+    assert cache.stats.evictions == 1
+
+
+def test_lru_cache_expires_entries() -> None:
+    """Test entries are misses once their TTL has passed."""
+    # Arrange
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1, ttl=0)
+
+    # Act & Assert
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+
+
+def test_memoize_uses_normalized_key() -> None:
+    """Test equivalent arguments share one cached result."""
+    # Arrange
+    counter = Counter()
+
+    # Act
+    results = [counter.echo("Hello"), counter.echo("HELLO"), counter.echo("hi")]
+
+    # Assert
+    assert results == ["hello", "hello", "hi"]
+    assert counter.calls == ["Hello", "hi"]
+    assert cache_stats()["tests.echo"]["hits"] >= 1
+
+
+def test_memoize_is_per_instance() -> None:
+    """Test instances don't share cached results."""
+    # Arrange
+    first, second = Counter(), Counter()
+
+    # Act
+    first.echo("a")
+    second.echo("a")
+
+    # Assert
+    assert first.calls == ["a"]
+    assert second.calls == ["a"]
+
+
+def test_memoize_coroutine_method() -> None:
+    """Test coroutine methods cache their awaited result, not the coroutine."""
+    # Arrange
+    counter = Counter()
+
+    async def echo_twice() -> List[str]:
+        return [await counter.echo_async("Hey"), await counter.echo_async("HEY")]
+
+    # Act
+    results = asyncio.run(echo_twice())
+
+    # Assert
+    assert results == ["hey", "hey"]
+    assert counter.calls == ["Hey"]
+
+
+def test_memoize_coalesces_concurrent_misses() -> None:
+    """Test concurrent misses of one key run the method once."""
+    # Arrange
+    counter = Counter()
+
+    # Act
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(counter.echo_blocking, "a") for _ in range(4)]
+        while cache_stats()["tests.echo_blocking"]["coalesced"] < 3:
+            threading.Event().wait(0.001)
+        counter.release.set()
+        results = [future.result() for future in futures]
+
+    # Assert
+    assert results == ["a"] * 4
+    assert counter.calls == ["a"]
+    assert counter.echo_blocking("a") == "a"
+    assert counter.calls == ["a"]
+
+
+def test_invalidate_drops_value_read_before_it() -> None:
+    """Test a miss in flight during an invalidation doesn't cache its result."""
+    # Arrange
+    counter = Counter()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        stale = pool.submit(counter.echo_blocking, "a")
+        while counter.calls != ["a"]:
+            threading.Event().wait(0.001)
+
+        # Act
+        invalidate("tests.echo_blocking", "a")
+        counter.release.set()
+        stale.result()
+    counter.echo_blocking("a")
+
+    # Assert
+    assert counter.calls == ["a", "a"]
+
+
+def test_memoize_recomputes_results_of_older_version() -> None:
+    """Test a result is only reused while its version stamp is unchanged."""
+    # Arrange
+    counter = Counter()
+    counter.echo_versioned("a")
+    counter.echo_versioned("a")
+
+    # Act
+    VERSION["stamp"] += 1
+    counter.echo_versioned("a")
+    counter.echo_versioned("a")
+
+    # Assert
+    assert counter.calls == ["a", "a"]
+
+
+def test_invalidate() -> None:
+    """Test invalidating one key, then the whole namespace."""
+    # Arrange
+    counter = Counter()
+    counter.echo("a")
+    counter.echo("b")
+
+    # Act & Assert - one key, through the key function
+    invalidate("tests.echo", "A")
+    counter.echo("a")
+    counter.echo("b")
+    assert counter.calls == ["a", "b", "a"]
+
+    # Act & Assert - whole namespace
+    invalidate("tests.echo")
+    counter.echo("b")
+    assert counter.calls == ["a", "b", "a", "b"]
@@ -0,0 +1,82 @@
+import json
+from datetime import date
+
+import pytest
+from bson import ObjectId
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+from songs_api.config import JSONProviderType, Settings
+from songs_api.schemas.api.song import SongListResponse, SongResponse
+from songs_api.utils.json_provider import (
+    OrjsonJSONProvider,
+    PydanticJSONProvider,
+    configure_json,
+)
+
+
+def make_app(provider: JSONProviderType) -> Flask:
+    """Return a bare app using the given JSON provider."""
+    app = Flask(__name__)
+    configure_json(app, Settings(JSON_PROVIDER=provider))
+    return app
+
+
+def test_configure_json_default() -> None:
+    """Test Flask's own provider stays the default."""
+    # Act
+    app = make_app(Settings.model_fields["JSON_PROVIDER"].default)
+
+    # Assert
+    assert type(app.json) is DefaultJSONProvider
+
+
+@pytest.mark.parametrize(
+    "provider",
+    [JSONProviderType.PYDANTIC, JSONProviderType.ORJSON],
+)
+def test_fast_providers_render_json(provider) -> None:
+    """Test fast providers render models, ISO dates and ObjectIds."""
+    # Arrange
+    app = make_app(provider)
+    song_id = ObjectId()
+    model = SongListResponse(
+        songs=[
+            SongResponse(
+                id=str(song_id),
+                artist="Artist",
+                title="Song",
+                difficulty=1.5,
+                level=3,
+                released=date(2020, 1, 2),
+            ),
+        ],
+    )
+
+    # Act
+    with app.app_context():
+        model_response = jsonify(model)
+        dict_response = jsonify({"id": song_id, "released": date(2020, 1, 2)})
+
+    # Assert
+    assert isinstance(app.json, PydanticJSONProvider)
+    assert model_response.mimetype == "application/json"
+    assert json.loads(model_response.data) == json.loads(model.model_dump_json())
+    assert json.loads(model_response.data)["songs"][0]["released"] == "2020-01-02"
+    assert json.loads(dict_response.data) == {
+        "id": str(song_id),
+        "released": "2020-01-02",
+    }
+    assert app.json.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+def test_orjson_provider_selected() -> None:
+    """Test the orjson provider is used when orjson is installed."""
+    # Arrange
+    pytest.importorskip("orjson")
+
+    # Act
+    app = make_app(JSONProviderType.ORJSON)
+
+    # Assert
+    assert type(app.json) is OrjsonJSONProvider
@@ -0,0 +1,95 @@
+import pstats
+from pathlib import Path
+
+import pytest
+from werkzeug.test import Client
+
+from songs_api.utils.profiling import ProfilerMiddleware
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def profiled(app, tmp_path):
+    """Serve the app through a profiler writing to a temp directory."""
+    return Client(ProfilerMiddleware(app.wsgi_app, TOKEN, str(tmp_path)))
+
+
+def test_profile_summary(profiled, create_songs) -> None:
+    """Test the summary mode replaces the body with the top functions."""
+    # Act
+    response = profiled.get(
+        "/songs",
+        headers={"X-Profile": "summary", "X-Admin-Token": TOKEN},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    assert text.startswith("Response status: 200 OK")
+    assert "cumulative" in text
+
+
+def test_profile_pstats_artifact(profiled, tmp_path, create_songs) -> None:
+    """Test the pstats mode keeps the response and saves a loadable profile."""
+    # Act
+    response = profiled.get(
+        "/songs?_profile=pstats",
+        headers={"X-Admin-Token": TOKEN},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json is not None
+    assert len(response.json["items"]) == len(create_songs)
+    artifact = Path(response.headers["X-Profile-Artifact"])
+    assert artifact.parent == tmp_path
+    assert pstats.Stats(str(artifact)).total_calls > 0
+
+
+def test_profile_sample_collapsed_stacks(profiled, create_songs) -> None:
+    """Test the sample mode saves collapsed stacks."""
+    # Act
+    response = profiled.get(
+        "/songs",
+        headers={"X-Profile": "sample", "X-Admin-Token": TOKEN},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    artifact = Path(response.headers["X-Profile-Artifact"])
+    assert artifact.suffix == ".collapsed"
+    for line in artifact.read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack
+        assert int(count) > 0
+
+
+def test_profile_requires_admin_token(profiled, tmp_path) -> None:
+    """Test requests without the right token are served unprofiled."""
+    # Act
+    response = profiled.get(
+        "/songs",
+        headers={"X-Profile": "summary", "X-Admin-Token": "nope"},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert "X-Profile-Artifact" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profile_sampled_requests(app, tmp_path) -> None:
+    """Test sampling profiles requests without any header to disk."""
+    # Arrange
+    client = Client(ProfilerMiddleware(app.wsgi_app, "", str(tmp_path), 1))
+
+    # Act
+    response = client.get("/songs")
+
+    # Assert
+    assert response.status_code == 200
+    assert "X-Profile-Artifact" in response.headers
+    assert len(list(tmp_path.glob("*-GET-songs-*.prof"))) == 1
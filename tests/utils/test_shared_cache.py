@@ -0,0 +1,169 @@
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pytest
+
+from songs_api.utils.cache import CacheFactory, _stores, invalidate, memoize
+from songs_api.utils.shared_cache import SharedMemoryCache
+
+
+@dataclass
+class Doubler:
+    cache_factory: Optional[CacheFactory] = None
+    calls: List[int] = field(default_factory=list)
+
+    @memoize("tests.double", ttl=60)
+    def double(self, value: int) -> int:
+        """Record the call and return twice the value."""
+        self.calls.append(value)
+        return value * 2
+
+
+@pytest.fixture
+def cache_path(tmp_path: Path) -> str:
+    """Path of a fresh shared cache file."""
+    return str(tmp_path / "cache")
+
+
+@pytest.fixture
+def store(cache_path: str) -> Iterator[SharedMemoryCache]:
+    """A small shared cache store registered for invalidation."""
+    cache = SharedMemoryCache(cache_path, slots=64, slot_size=512)
+    _stores.append(cache)
+    yield cache
+    _stores.remove(cache)
+    cache.close()
+
+
+def test_entries_are_visible_to_other_instances(
+    store: SharedMemoryCache,
+    cache_path: str,
+) -> None:
+    """Test two stores on the same file share their entries."""
+    # Arrange
+    other = SharedMemoryCache(cache_path, slots=64, slot_size=512)
+
+    # Act
+    store.set("ns", ("a", 1), {"value": 1}, ttl=60)
+
+    # Assert
+    assert other.get("ns", ("a", 1)) == (True, {"value": 1})
+    assert other.get("other", ("a", 1)) == (False, None)
+    other.close()
+
+
+def test_clear_bumps_generation(store: SharedMemoryCache) -> None:
+    """Test clearing a namespace hides its entries but not other namespaces'."""
+    # Arrange
+    store.set("ns", "a", 1, ttl=60)
+    store.set("kept", "a", 2, ttl=60)
+
+    # Act
+    store.clear("ns")
+
+    # Assert
+    assert store.get("ns", "a") == (False, None)
+    assert store.get("kept", "a") == (True, 2)
+    assert store.count("ns") == 0
+
+
+def test_delete_and_expiry(store: SharedMemoryCache) -> None:
+    """Test deleted and expired entries are misses."""
+    # Arrange
+    store.set("ns", "deleted", 1, ttl=60)
+    store.set("ns", "expired", 2, ttl=0)
+
+    # Act
+    store.delete("ns", "deleted")
+
+    # Assert
+    assert store.get("ns", "deleted") == (False, None)
+    assert store.get("ns", "expired") == (False, None)
+
+
+def test_oversize_values_are_not_kept(store: SharedMemoryCache) -> None:
+    """Test values larger than a slot are skipped and counted as evictions."""
+    # Arrange
+    backend = store.namespace("ns")
+
+    # Act
+    backend.set("big", "x" * 1024, ttl=60)
+
+    # Assert
+    assert backend.get("big") == (False, None)
+    assert backend.stats.evictions == 1
+
+
+def test_memoize_with_shared_backend(store: SharedMemoryCache) -> None:
+    """Test memoized results are shared by instances and invalidated by key."""
+    # Arrange
+    first = Doubler(cache_factory=store.namespace)
+    second = Doubler(cache_factory=store.namespace)
+    first.double(2)
+
+    # Act
+    cached = second.double(2)
+    invalidate("tests.double", 2)
+    second.double(2)
+
+    # Assert
+    assert cached == 4
+    assert first.calls == [2]
+    assert second.calls == [2]
+
+
+def test_writes_from_another_process_are_visible(
+    store: SharedMemoryCache,
+    cache_path: str,
+) -> None:
+    """Test a forked process reads and invalidates the parent's entries."""
+    # Arrange
+    store.set("ns", "parent", 1, ttl=60)
+
+    # Act
+    pid = os.fork()
+    if pid == 0:
+        child = SharedMemoryCache(cache_path, slots=64, slot_size=512)
+        ok = child.get("ns", "parent") == (True, 1)
+        child.set("ns", "child", 2, ttl=60)
+        child.delete("ns", "parent")
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+
+    # Assert
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert store.get("ns", "child") == (True, 2)
+    assert store.get("ns", "parent") == (False, None)
+
+
+def test_other_geometry_uses_another_file(
+    store: SharedMemoryCache,
+    cache_path: str,
+) -> None:
+    """Test a store of another geometry neither resizes nor sees a file in use."""
+    # Arrange
+    store.set("ns", "a", 1, ttl=60)
+
+    # Act
+    other = SharedMemoryCache(cache_path, slots=128, slot_size=512)
+
+    # Assert
+    assert other.path != store.path
+    assert other.get("ns", "a") == (False, None)
+    assert store.get("ns", "a") == (True, 1)
+    assert Path(store.path).stat().st_size > 0
+    other.close()
+
+
+def test_foreign_file_is_refused(cache_path: str) -> None:
+    """Test a file of the right name but another layout is refused, not reset."""
+    # Arrange
+    path = Path(f"{cache_path}.64x512")
+    path.write_bytes(b"not a cache")
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="not a shared cache"):
+        SharedMemoryCache(cache_path, slots=64, slot_size=512)
+    assert path.read_bytes() == b"not a cache"
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from songs_api.utils.singleflight import SingleFlight
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    """Poll until `condition()` holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_computation() -> None:
+    """Test callers of a key in flight wait for it and share its result."""
+    # Arrange
+    flight = SingleFlight()
+    release = threading.Event()
+    calls: List[int] = []
+
+    def compute() -> str:
+        calls.append(1)
+        release.wait()
+        return "result"
+
+    # Act
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(flight.do, "key", compute) for _ in range(5)]
+        _wait_for(lambda: flight.coalesced == 4)
+        release.set()
+        results = [future.result() for future in futures]
+
+    # Assert
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert {value for value, _ in results} == {"result"}
+
+
+def test_failure_reaches_waiters_only() -> None:
+    """Test an error is raised to the callers that waited, not to later ones."""
+    # Arrange
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail() -> None:
+        release.wait()
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(flight.do, "key", fail) for _ in range(2)]
+        _wait_for(lambda: flight.coalesced == 1)
+        release.set()
+
+        # Act
+        errors = [future.exception() for future in futures]
+    later = flight.do("key", lambda: "recovered")
+
+    # Assert
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert later == ("recovered", False)
+
+
+def test_forget_starts_a_fresh_call() -> None:
+    """Test a forgotten key in flight isn't joined by later callers."""
+    # Arrange
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def stale() -> str:
+        started.set()
+        release.wait()
+        return "stale"
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(flight.do, "key", stale)
+        started.wait()
+
+        # Act
+        flight.forget("key")
+        fresh = flight.do("key", lambda: "fresh")
+        release.set()
+
+    # Assert
+    assert first.result() == ("stale", False)
+    assert fresh == ("fresh", False)
+
+
+def test_do_async_shares_one_computation() -> None:
+    """Test coroutines of one key share one awaited computation."""
+    # Arrange
+    flight = SingleFlight()
+    calls: List[int] = []
+
+    async def compute() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def gather() -> list:
+        return await asyncio.gather(
+            *(flight.do_async("key", compute) for _ in range(3)),
+        )
+
+    # Act
+    results = asyncio.run(gather())
+
+    # Assert
+    assert len(calls) == 1
+    assert results == [("result", False), ("result", True), ("result", True)]
+
+
+def test_do_async_failure_is_not_kept() -> None:
+    """Test a failed coroutine is retried by the next caller."""
+    # Arrange
+    flight = SingleFlight()
+
+    async def fail() -> None:
+        raise RuntimeError("boom")
+
+    async def recover() -> str:
+        return "recovered"
+
+    # Act
+    with pytest.raises(RuntimeError):
+        asyncio.run(flight.do_async("key", fail))
+    result = asyncio.run(flight.do_async("key", recover))
+
+    # Assert
+    assert result == ("recovered", False)
+
+
+def test_do_async_survives_cancelled_leader() -> None:
+    """Test cancelling the first caller doesn't fail the callers sharing its call."""
+    # Arrange
+    flight = SingleFlight()
+    calls: List[int] = []
+
+    async def compute() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def cancel_leader() -> tuple:
+        leader = asyncio.ensure_future(flight.do_async("key", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(flight.do_async("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await waiter, leader.cancelled()
+
+    # Act
+    (value, shared), leader_cancelled = asyncio.run(cancel_leader())
+
+    # Assert
+    assert leader_cancelled
+    assert (value, shared) == ("result", True)
+    assert len(calls) == 1
@@ -0,0 +1,80 @@
+import json
+
+from flask import Flask
+
+from songs_api.utils.tracing import (
+    DB,
+    MAP,
+    SERVICE,
+    Span,
+    Trace,
+    init_tracing,
+    span,
+    traced,
+)
+
+
+def test_self_times_exclude_nested_spans() -> None:
+    """Test each category is charged only for time outside nested spans."""
+    # Arrange
+    trace = Trace(
+        spans=[
+            Span(SERVICE, "list", start=0.0, end=1.0),
+            Span(DB, "find", start=0.1, end=0.7, parent=0),
+            Span(DB, "count", start=0.2, end=0.3, parent=1),
+            Span(MAP, "map", start=0.7, end=0.9, parent=0),
+        ],
+    )
+
+    # Act
+    times = trace.self_times()
+
+    # Assert
+    assert round(times[SERVICE], 6) == 0.2
+    assert round(times[DB], 6) == 0.6
+    assert round(times[MAP], 6) == 0.2
+
+
+def test_server_timing_header(client, create_songs) -> None:
+    """Test responses break their time down by layer."""
+    # Act
+    response = client.get("/songs")
+
+    # Assert
+    assert response.status_code == 200
+    timing = response.headers["Server-Timing"]
+    names = [entry.split(";")[0] for entry in timing.split(", ")]
+    assert {"validate", "service", "db", "serialize", "total"} <= set(names)
+    assert names[-1] == "total"
+
+
+def test_spans_exported_as_json_lines(tmp_path) -> None:
+    """Test every request's spans are appended to the export file."""
+    # Arrange
+    path = tmp_path / "spans.jsonl"
+    app = Flask(__name__)
+    init_tracing(app, str(path))
+
+    @traced(SERVICE)
+    def load() -> str:
+        """Stand in for a service read."""
+        with span(DB, "find"):
+            return "ok"
+
+    @app.route("/ping")
+    def ping() -> str:
+        """Serve one traced read."""
+        return load()
+
+    # Act
+    app.test_client().get("/ping")
+    app.test_client().get("/ping")
+
+    # Assert
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 2
+    assert records[0]["route"] == "/ping"
+    outer, inner = records[0]["spans"]
+    assert outer["category"] == SERVICE
+    assert outer["name"].endswith("load")
+    assert inner == {**inner, "category": DB, "name": "find", "parent": 0}
@@ -0,0 +1,142 @@
+import os
+
+import pytest
+
+from songs_api.config import CacheBackendType, Settings
+from songs_api.utils import versions
+from songs_api.utils.versions import (
+    LocalVersions,
+    SharedVersions,
+    configure_versions,
+)
+
+
+def test_local_versions_bump() -> None:
+    """Test bumping a scope changes its version only."""
+    # Arrange
+    store = LocalVersions()
+    before = store.get("other")
+
+    # Act
+    store.bump("songs")
+
+    # Assert
+    assert store.get("songs") == 1
+    assert store.get("other") == before
+
+
+def test_local_versions_new_epoch_after_fork() -> None:
+    """Test forked workers don't share the epoch of their parent's counters."""
+    # Arrange
+    store = LocalVersions()
+    parent_epoch = store.epoch
+
+    # Act
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if store.epoch != parent_epoch else 1)
+    _, status = os.waitpid(pid, 0)
+
+    # Assert
+    assert os.waitstatus_to_exitcode(status) == 0
+
+
+def test_shared_versions_across_processes(tmp_path) -> None:
+    """Test a bump in a forked process is seen by the parent."""
+    # Arrange
+    path = str(tmp_path / "versions")
+    store = SharedVersions(path, stripes=64)
+    store.bump("songs")
+
+    # Act
+    pid = os.fork()
+    if pid == 0:
+        child = SharedVersions(path, stripes=64)
+        ok = child.epoch == store.epoch and child.get("songs") == 1
+        child.bump("songs")
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+
+    # Assert
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert store.get("songs") == 2
+    store.close()
+
+
+def test_shared_versions_new_file_per_layout(tmp_path) -> None:
+    """Test counters of another layout get their own file and epoch."""
+    # Arrange
+    path = str(tmp_path / "versions")
+    old = SharedVersions(path, stripes=64)
+    old.bump("songs")
+    old.close()
+
+    # Act
+    store = SharedVersions(path, stripes=128)
+
+    # Assert
+    assert store.epoch != old.epoch
+    assert store.get("songs") == 0
+    store.close()
+
+
+def test_shared_versions_refuse_foreign_file(tmp_path) -> None:
+    """Test a file of the right name but wrong content is refused, not reset."""
+    # Arrange
+    (tmp_path / "versions.64").write_bytes(b"not counters")
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="version counters"):
+        SharedVersions(str(tmp_path / "versions"), stripes=64)
+    assert (tmp_path / "versions.64").read_bytes() == b"not counters"
+
+
+def test_shared_versions_bump_all(tmp_path) -> None:
+    """Test bumping every scope is seen by other processes' counters."""
+    # Arrange
+    path = str(tmp_path / "versions")
+    store = SharedVersions(path, stripes=64)
+    other = SharedVersions(path, stripes=64)
+    store.bump("songs")
+
+    # Act
+    other.bump_all()
+
+    # Assert
+    assert store.get("songs") == 2
+    assert store.get("ratings:1") == store.get("ratings:2") == 1
+    store.close()
+    other.close()
+
+
+@pytest.mark.parametrize(
+    ("backend", "etags", "shared"),
+    [
+        (CacheBackendType.LOCAL, False, False),
+        (CacheBackendType.LOCAL, True, True),
+        (CacheBackendType.SHARED, False, True),
+    ],
+)
+def test_configure_versions_shares_stamps_of_etags(
+    monkeypatch,
+    tmp_path,
+    backend,
+    etags,
+    shared,
+) -> None:
+    """Test ETags get stamps shared by every process, whatever the cache backend."""
+    # Arrange
+    monkeypatch.setattr(versions, "versions", LocalVersions(stripes=64))
+    config = Settings(
+        CACHE_BACKEND=backend,
+        CACHE_SHARED_PATH=str(tmp_path / "cache"),
+        ETAGS_ENABLED=etags,
+    )
+
+    # Act
+    store = configure_versions(config)
+
+    # Assert
+    assert isinstance(store, SharedVersions) is shared
+    if shared:
+        store.close()